@@ -0,0 +1,64 @@
+"""
+bench_align.py
+
+Times the automatic aligner on full-length input:
+
+- the whole work with chapter anchors (what `python -m src.transform.align` does)
+- the whole work as one unanchored span (all Latin paragraphs against all
+  English sentences), repeated 1x, 10x and 50x to stand in for longer works,
+  with the default band and with a band twice as wide
+
+Usage:
+        python -m benchmarks.bench_align --scales 1 10 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.artifacts import read_text
+from src.config import ENGLISH_RAW_FILE, LATIN_RAW_FILE
+from src.transform.align import BAND_WIDTH, _sentences, align_lengths, align_texts, segment_english, segment_latin
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    latin_text = read_text(LATIN_RAW_FILE)
+    english_text = read_text(ENGLISH_RAW_FILE)
+
+    rows, seconds = timed(lambda: align_texts(latin_text, english_text))
+    total = sum(len(book_rows) for book_rows in rows.values())
+    print(f"anchored, whole work: {total} rows in {seconds:.3f}s ({total / seconds:,.0f} rows/s)\n")
+
+    latin = [unit for book in segment_latin(latin_text) for unit in book.units]
+    english = [unit for book in segment_english(english_text) for unit in book.units]
+    sentences, starts, numbers = _sentences(english)
+    la = np.array([len(unit.text) for unit in latin])
+    en = np.array([len(sentence) for sentence in sentences])
+    starts = np.array(starts, dtype=bool)
+    numbers = np.array(numbers)
+    la_numbers = np.array([unit.number if unit.kind == "paragraph" and unit.number else 0 for unit in latin])
+
+    print(f"{'scale':>5} {'latin':>8} {'english':>8} {'band':>5} {'seconds':>8} {'rows/s':>9}")
+    for scale in args.scales:
+        inputs = [np.tile(a, scale) for a in (la, en, starts, la_numbers, numbers)]
+        for band in (BAND_WIDTH, 2 * BAND_WIDTH):
+            _, seconds = timed(lambda: align_lengths(
+                inputs[0], inputs[1], inputs[2], inputs[3], inputs[4], band_width=band
+            ))
+            print(f"{scale:>5} {len(inputs[0]):>8,} {len(inputs[1]):>8,} {band:>5} {seconds:>8.3f} "
+                  f"{len(inputs[0]) / seconds:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
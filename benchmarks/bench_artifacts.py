@@ -0,0 +1,96 @@
+"""
+bench_artifacts.py
+
+Disk size, write time, read time and peak read memory of the raw Latin text
+stored as a plain file (the old save_to_file + f.read().split("\\n\\n")) against
+the artifact store (compressed write, streamed iter_paragraphs), at several
+multiples of the Kempis size. Also reads the plain file through the store
+(memory-mapped) and writes the same content a second time (deduplicated).
+
+Peak memory is the tracemalloc peak of counting the paragraphs; time is
+measured in a separate run without tracing.
+
+Usage:
+        python -m benchmarks.bench_artifacts --scales 1 10 100
+"""
+
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.artifacts import ArtifactStore, iter_paragraphs
+from src.config import LATIN_RAW_FILE
+
+
+def measure(func) -> tuple[float, float, object]:
+    """(seconds, peak MB, result) of one call; the peak comes from a second, traced call."""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, result
+
+
+def write_plain(paragraphs: list[str], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for paragraph in paragraphs:
+            f.write(paragraph + "\n\n")
+
+
+def read_plain(path: Path) -> int:
+    with path.open("r", encoding="utf-8") as f:
+        contents = f.read()
+    return len([p.strip() for p in contents.split("\n\n") if p.strip()])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    latin = list(iter_paragraphs(LATIN_RAW_FILE))
+    print(f"{'scale':>5} {'mode':<22} {'disk MB':>8} {'write s':>8} {'read s':>7} {'peak MB':>8}")
+    for scale in args.scales:
+        paragraphs = latin * scale
+        workdir = Path(tempfile.mkdtemp())
+        try:
+            store = ArtifactStore(workdir / "artifacts")
+            plain, stored = workdir / "plain.txt", workdir / "stored.txt"
+
+            start = time.perf_counter()
+            write_plain(paragraphs, plain)
+            plain_write = time.perf_counter() - start
+            start = time.perf_counter()
+            artifact = store.write_paragraphs(stored, paragraphs)
+            stored_write = time.perf_counter() - start
+            start = time.perf_counter()
+            store.write_paragraphs(workdir / "again.txt", paragraphs)
+            dedup_write = time.perf_counter() - start
+
+            cases = [
+                ("plain, f.read()", plain.stat().st_size, plain_write, lambda: read_plain(plain)),
+                ("plain, mmap stream", plain.stat().st_size, None, lambda: sum(1 for _ in store.iter_paragraphs(plain))),
+                (f"store ({artifact.codec}) stream", artifact.stored_size, stored_write,
+                 lambda: sum(1 for _ in store.iter_paragraphs(stored))),
+            ]
+            for mode, size, write_seconds, read in cases:
+                seconds, peak, count = measure(read)
+                assert count == len(paragraphs), (mode, count)
+                write = f"{write_seconds:>8.3f}" if write_seconds is not None else f"{'':>8}"
+                print(f"{scale:>5} {mode:<22} {size / 1e6:>8.2f} {write} {seconds:>7.3f} {peak:>8.2f}")
+            print(f"{scale:>5} {'store, same content':<22} {0:>8.2f} {dedup_write:>8.3f}   (deduplicated)")
+        finally:
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+bench_boilerplate.py
+
+Scaling of the MinHash/LSH boilerplate detection (src/transform/boilerplate.py)
+with the size of the corpus.
+
+Every source is one synthetic work (see synthetic_corpus.py, one seed per
+work: its English paragraphs) plus a Gutenberg-style header and licence block
+that mention the work's title. The run times signatures and clustering for an
+increasing number of sources; paragraphs/s staying flat means the cost is
+linear in the corpus size. Every header and licence must be removed and
+nothing else.
+
+Usage:
+        python -m benchmarks.bench_boilerplate --sources 4 16 64
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.synthetic_corpus import generate_books, load_profile
+from src.transform.boilerplate import cluster_paragraphs, minhash_signatures, remove_boilerplate
+
+HEADER = (
+    "The Project Gutenberg eBook of {title}. This eBook is for the use of anyone anywhere in the United States "
+    "and most other parts of the world at no cost and with almost no restrictions whatsoever."
+)
+LICENCE = (
+    "End of the Project Gutenberg eBook of {title}. Updated editions will replace the previous one and the old "
+    "editions will be renamed. Creating the works from print editions not protected by U.S. copyright law means "
+    "that no one owns a United States copyright in these works, so the Foundation can copy and distribute it."
+)
+
+
+def build_corpus(sources: int) -> dict[str, list[str]]:
+    profile = load_profile()
+    corpus = {}
+    for seed in range(sources):
+        title = f"Opera Omnia, volume {seed + 1}"
+        english = [english for book in generate_books(profile, 1, seed) for _, english in book.rows]
+        corpus[title] = [HEADER.format(title=title), *english, LICENCE.format(title=title)]
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of the boilerplate detection.")
+    parser.add_argument("--sources", type=int, nargs="+", default=[4, 16, 64])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'sources':>8} {'paragraphs':>11} {'signatures s':>13} {'clusters s':>11} "
+          f"{'total s':>8} {'paragraphs/s':>13} {'removed':>8}")
+    for sources in args.sources:
+        corpus = build_corpus(sources)
+        paragraphs = [p for document in corpus.values() for p in document]
+
+        start = time.perf_counter()
+        signatures = minhash_signatures(paragraphs)
+        signed = time.perf_counter()
+        cluster_paragraphs(signatures)
+        clustered = time.perf_counter()
+
+        start_total = time.perf_counter()
+        _, report = remove_boilerplate(corpus)
+        total = time.perf_counter() - start_total
+
+        print(f"{sources:>8} {len(paragraphs):>11,} {signed - start:>13.3f} {clustered - signed:>11.3f} "
+              f"{total:>8.3f} {len(paragraphs) / total:>13,.0f} {report.removed:>8}")
+        if report.removed != 2 * sources:
+            print(f"   expected {2 * sources} removed paragraphs (header + licence per source)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+bench_columnar.py
+
+Compares the TSV fact table with the partitioned Parquet dataset:
+
+- write time and size on disk
+- full read
+- pruned read: id, chapter_id and english_text of a single book
+
+The fact table is scaled by repeating its rows (ids renumbered) at 1x, 10x and 100x.
+Repeated text compresses far better than real text would, so Parquet sizes at
+10x/100x are optimistic; timings are representative.
+
+Usage:
+        python -m benchmarks.bench_columnar --scales 1 10 100
+"""
+
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.transform.columnar import read_parquet, write_parquet
+from src.transform.enrich_kempis import read_fact_table
+
+PRUNED_COLUMNS = ["id", "chapter_id", "english_text"]
+
+
+def scaled(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    big = pd.concat([df] * scale, ignore_index=True)
+    big["id"] = range(1, len(big) + 1)
+    return big
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) if path.is_dir() else path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    base = read_fact_table()
+    workdir = Path(tempfile.mkdtemp())
+    print(f"{'scale':>5} {'rows':>9} {'format':>8} {'MB':>7} {'write s':>8} {'read s':>8} {'pruned s':>9}")
+
+    try:
+        for scale in args.scales:
+            df = scaled(base, scale)
+            tsv, parquet = workdir / f"fact_{scale}.tsv", workdir / f"fact_{scale}_parquet"
+
+            _, tsv_write = timed(lambda: df.to_csv(tsv, sep="\t", index=False, encoding="utf-8"))
+            _, tsv_read = timed(lambda: read_fact_table(tsv))
+            _, tsv_pruned = timed(lambda: read_fact_table(tsv).query("book_id == 3")[PRUNED_COLUMNS])
+
+            _, pq_write = timed(lambda: write_parquet(df, parquet))
+            _, pq_read = timed(lambda: read_parquet(parquet))
+            pruned, pq_pruned = timed(lambda: read_parquet(parquet, columns=PRUNED_COLUMNS, book_ids=[3]))
+            assert len(pruned) == (df["book_id"] == 3).sum()
+
+            for name, size, write, read, pruned_read in [
+                ("tsv", dir_size(tsv), tsv_write, tsv_read, tsv_pruned),
+                ("parquet", dir_size(parquet), pq_write, pq_read, pq_pruned),
+            ]:
+                print(f"{scale:>5} {len(df):>9,} {name:>8} {size / 1e6:>7.1f} {write:>8.3f} {read:>8.3f} {pruned_read:>9.3f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+bench_html_extract.py
+
+Compares the "stream" (single-pass html.parser) and "bs4" (BeautifulSoup tree)
+backends of extract_text_from_html and parse_book_html.
+
+Test pages are rebuilt from the extracted raw texts in data/raw/, so they have
+the real paragraph count and length. Each page is measured at 1x and at a
+larger scale (default 100x) for throughput (MB/s) and peak Python memory (tracemalloc).
+
+Usage:
+        python -m benchmarks.bench_html_extract --scales 1 100
+"""
+
+import argparse
+import html as html_lib
+import logging
+import time
+import tracemalloc
+
+from src.artifacts import iter_paragraphs, read_text
+from src.config import ENGLISH_RAW_FILE, LATIN_RAW_FILE
+from src.extract.extract_english import extract_text_from_html
+from src.extract.extract_latin import parse_book_html
+
+
+def gutenberg_page(paragraphs: list[str], scale: int) -> str:
+    """Builds a Gutenberg-style HTML page with headers, paragraphs and license boilerplate."""
+    parts = ["<html><head><title>The Imitation of Christ</title></head><body>",
+             "<p>*** START OF THE PROJECT GUTENBERG EBOOK ***</p>"]
+    for _ in range(scale):
+        for text in paragraphs:
+            tag = "h2" if text.startswith(("CHAPTER", "THE ")) else "p"
+            parts.append(f"<{tag}>{html_lib.escape(text)}</{tag}>")
+    parts.append("<p>End of the Project Gutenberg EBook</p></body></html>")
+    return "\n".join(parts)
+
+
+def latin_library_page(paragraphs: list[str], scale: int) -> str:
+    """Builds a Latin Library-style book page with the site footer."""
+    parts = ["<html><head><title>Kempis</title></head><body>"]
+    for _ in range(scale):
+        parts.extend(f"<p>{html_lib.escape(text)}</p>" for text in paragraphs)
+    parts.append('<p class="pagehead"><a href="/">The Latin Library</a> THE LATIN LIBRARY</p></body></html>')
+    return "\n".join(parts)
+
+
+def measure(func, html: str, backend: str) -> tuple[float, int, int]:
+    """Returns (seconds, peak bytes, paragraphs) for one extraction.
+
+    Time and memory are taken from separate runs, since tracemalloc slows allocation down.
+    """
+    start = time.perf_counter()
+    paragraphs = func(html, backend=backend)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(html, backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    english = [line for line in read_text(ENGLISH_RAW_FILE).splitlines() if line.strip()]
+    latin = list(iter_paragraphs(LATIN_RAW_FILE))
+
+    cases = [
+        ("extract_text_from_html", extract_text_from_html, gutenberg_page, english),
+        ("parse_book_html", parse_book_html, latin_library_page, latin),
+    ]
+
+    print(f"{'function':<24} {'scale':>5} {'size MB':>8} {'backend':>7} {'paras':>8} {'MB/s':>7} {'peak MB':>8}")
+    for name, func, build_page, paragraphs in cases:
+        for scale in args.scales:
+            html = build_page(paragraphs, scale)
+            size_mb = len(html.encode("utf-8")) / 1e6
+            results = {}
+            for backend in ("bs4", "stream"):
+                elapsed, peak, count = measure(func, html, backend)
+                results[backend] = count
+                print(f"{name:<24} {scale:>5} {size_mb:>8.1f} {backend:>7} {count:>8} "
+                      f"{size_mb / elapsed:>7.1f} {peak / 1e6:>8.1f}")
+            assert results["bs4"] == results["stream"], "Backends disagree on paragraph count"
+
+
+if __name__ == "__main__":
+    main()
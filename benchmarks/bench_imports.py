@@ -0,0 +1,127 @@
+"""
+bench_imports.py
+
+Import time of the pipeline entry points, measured with `python -X importtime`
+in a fresh interpreter for every run.
+
+Scenarios:
+- run_pipeline: `import src.run_pipeline` (what --dry-run, --help and every stage pay)
+- clean_unchanged: the clean stage (run_pipeline._clean) on aligned files that did not change
+- clean_rebuild: run_pipeline + the clean stage rebuilding the fact table
+
+Each scenario has a budget (milliseconds of import time, best of --repeat runs)
+and modules it must not import: nothing heavy for the entry point, and no
+network/HTML libraries for the transform stage. With --check the run exits
+with status 1 when a scenario is over budget or imports a forbidden module.
+Budgets are generous for a laptop; pandas alone takes 0.3-0.6 s to import.
+
+Usage:
+        python -m benchmarks.bench_imports
+        python -m benchmarks.bench_imports --check --repeat 7
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.config import INPUT_DIR, PROJECT_ROOT
+
+MARKER = "--- bench_imports start ---"
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "requests", "bs4")
+NETWORK_MODULES = ("requests", "bs4")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    code: str
+    budget_ms: float
+    forbidden: tuple[str, ...]
+
+
+def scenarios(workdir: Path) -> list[Scenario]:
+    aligned, output, manifest = workdir / "aligned", workdir / "cleaned.tsv", workdir / "manifest.json"
+    # The clean stage itself (chapter table included), pointed at the scratch copy
+    clean_stage = (
+        "from pathlib import Path\n"
+        "import src.run_pipeline as run_pipeline\n"
+        f"run_pipeline.INPUT_DIR = Path({str(aligned)!r})\n"
+        f"run_pipeline.OUTPUT_PATH = Path({str(output)!r})\n"
+        f"run_pipeline.TRANSFORM_MANIFEST_PATH = Path({str(manifest)!r})\n"
+        f"run_pipeline.CHAPTERS_PATH = Path({str(workdir / 'chapters.tsv')!r})\n"
+        "run_pipeline._clean()\n"
+    )
+    rebuild = (
+        "from pathlib import Path\n"
+        "from src.transform.incremental import run_incremental\n"
+        f"run_incremental(Path({str(aligned)!r}), Path({str(output)!r}), Path({str(manifest)!r}), full=True)\n"
+    )
+    return [
+        Scenario("run_pipeline", "import src.run_pipeline\n", 100, HEAVY_MODULES),
+        Scenario("clean_unchanged", clean_stage, 150, HEAVY_MODULES),
+        Scenario("clean_rebuild", "import src.run_pipeline\n" + rebuild, 1500, NETWORK_MODULES),
+    ]
+
+
+def measure(code: str) -> tuple[float, set[str]]:
+    """Runs `code` in a new interpreter. Returns (import ms after the marker, top-level packages imported)."""
+    script = f"import sys\nsys.stderr.write({MARKER!r} + '\\n')\n{code}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=PROJECT_ROOT, env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True, text=True, check=True,
+    )
+    lines = result.stderr.split(MARKER, 1)[1].splitlines()
+    total_us, modules = 0, set()
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.add(name.strip().split(".")[0])
+            if not name.startswith("  "):          # top-level import: its cumulative time covers its children
+                total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on a budget or forbidden import")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    failures = []
+    try:
+        shutil.copytree(INPUT_DIR, workdir / "aligned")
+        # Run the stage once so clean_unchanged finds an up-to-date manifest and chapter table
+        measure(scenarios(workdir)[1].code)
+
+        print(f"{'scenario':<18} {'best ms':>9} {'budget':>8}  forbidden modules imported")
+        for scenario in scenarios(workdir):
+            runs = [measure(scenario.code) for _ in range(args.repeat)]
+            best = min(ms for ms, _ in runs)
+            leaked = sorted(set(scenario.forbidden) & set.union(*(modules for _, modules in runs)))
+            print(f"{scenario.name:<18} {best:>9.1f} {scenario.budget_ms:>8.0f}  {', '.join(leaked) or '–'}")
+            if best > scenario.budget_ms:
+                failures.append(f"{scenario.name}: {best:.1f} ms over the {scenario.budget_ms:.0f} ms budget")
+            if leaked:
+                failures.append(f"{scenario.name}: imports {', '.join(leaked)}")
+    finally:
+        shutil.rmtree(workdir)
+
+    if args.check:
+        for line in failures:
+            print(f"OVER BUDGET {line}")
+        if failures:
+            sys.exit(1)
+        print("All scenarios within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+bench_latin_fetch.py
+
+Benchmarks sequential vs concurrent fetching of Latin Library book subpages.
+
+A local stand-in for The Latin Library is started on 127.0.0.1. It serves an
+index page linking to N `kempis/kempis*.shtml` subpages and sleeps a fixed
+latency before every response, which mimics the round-trip cost of the real site.
+
+Usage:
+        python -m benchmarks.bench_latin_fetch --pages 40 --latency 0.2 --workers 1 4 8
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.extract.extract_latin import extract_all_paragraphs
+
+
+def build_site(pages: int, paragraphs_per_page: int) -> dict[str, bytes]:
+    """Builds the index page and subpages served by the stand-in server."""
+    links = "\n".join(
+        f'<a href="kempis/kempis{n}.shtml">Liber {n}</a>' for n in range(1, pages + 1)
+    )
+    site = {"/kempis.html": f"<html><body>{links}</body></html>".encode("utf-8")}
+
+    for n in range(1, pages + 1):
+        body = "\n".join(
+            f"<p>{i}. Liber {n}, paragraphus {i}: Qui sequitur me non ambulat in tenebris.</p>"
+            for i in range(1, paragraphs_per_page + 1)
+        )
+        html = f"<html><body>{body}<p>THE LATIN LIBRARY</p></body></html>"
+        site[f"/kempis/kempis{n}.shtml"] = html.encode("utf-8")
+    return site
+
+
+def start_server(site: dict[str, bytes], latency: float) -> ThreadingHTTPServer:
+    """Starts a threaded HTTP server on a free local port that injects `latency` seconds per request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled sessions can reuse sockets
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = site.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--paragraphs", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="Injected latency per request (seconds)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    site = build_site(args.pages, args.paragraphs)
+    server = start_server(site, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    index_html = site["/kempis.html"].decode("utf-8")
+
+    print(f"{args.pages} pages, {args.latency * 1000:.0f} ms injected latency per request")
+    print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+
+    baseline = None
+    expected = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        paragraphs = extract_all_paragraphs(index_html, base_url, max_workers=workers)
+        elapsed = time.perf_counter() - start
+
+        # Concurrency must never change the output or its order
+        expected = expected or paragraphs
+        assert paragraphs == expected, "Concurrent fetch changed the paragraph order"
+
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {args.pages / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+bench_search.py
+
+Query latency of the full-text index against the substring scan that sample
+query 3 does (latin_text ILIKE '%Christum%'), on the fact table scaled by
+repeating its rows.
+
+Index lookups are timed cold (first query after loading, posting lists still
+encoded) and warm (posting lists cached), as the median over repeated runs.
+
+Usage:
+        python -m benchmarks.bench_search --scales 1 10 100
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_columnar import scaled
+from src.search.full_text import FullTextIndex, build_index
+from src.transform.enrich_kempis import read_fact_table
+
+QUERIES = ["christum", "christ*", '"regnum dei"', "gratia dei"]
+REPEATS = 50
+
+
+def median_ms(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    base = read_fact_table()
+    workdir = Path(tempfile.mkdtemp())
+    print(f"{'scale':>5} {'rows':>9} {'query':>14} {'hits':>7} {'scan ms':>9} {'cold ms':>9} {'warm ms':>9}")
+
+    try:
+        for scale in args.scales:
+            df = scaled(base, scale)
+            path = workdir / f"index_{scale}.idx"
+            build_index(df, path)
+            latin = df["latin_text"]
+
+            for query in QUERIES:
+                index = FullTextIndex(path)
+                start = time.perf_counter()
+                hits = index.search(query, limit=10)
+                cold = (time.perf_counter() - start) * 1000
+                warm = median_ms(lambda: index.search(query, limit=10))
+                total = len(index.search(query, limit=None))
+
+                needle = query.strip('"*')
+                scan = median_ms(lambda: latin[latin.str.contains(needle, case=False, regex=False)], repeats=5)
+                assert hits
+                print(f"{scale:>5} {len(df):>9,} {query:>14} {total:>7,} {scan:>9.3f} {cold:>9.3f} {warm:>9.3f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_segment.py
+
+Run time of the run-together token segmentation (src/transform/segment.py) on
+synthetic Latin corpora of 1x/10x/100x the aligned Kempis files (see
+synthetic_corpus.py): building the lexicon and its tries, then splitting the
+tokens of every row.
+
+Run-together tokens are made by gluing two neighbouring words (3+ letters each,
+9+ together) in --glue-rate of the rows, as get_text(strip=True) does across
+tags. "found" is the share of those that the segmenter splits back; the rest
+are refused by the stem and compound checks or are not rare enough.
+
+With --check the run exits with status 1 when the segmentation of the largest
+scale is over --budget seconds. Building the lexicon is reported but not
+checked: it is mostly pandas/Arrow counting, and adding it made the gate swing
+around its budget (3.7-5.0 s at 100x on the same machine, against 1.9-2.1 s
+for the segmentation alone).
+
+Usage:
+        python -m benchmarks.bench_segment
+        python -m benchmarks.bench_segment --scales 1 10 100 --check
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_corpus import generate_books, load_profile
+from src.transform.segment import WORD_RE, Lexicon, Segmenter, segment_column
+
+
+def glue_words(texts: list[str], rate: float, seed: int = 0) -> tuple[list[str], set[str]]:
+    """texts with two neighbouring words joined in `rate` of them, and the glued tokens made."""
+    rng = np.random.default_rng(seed)
+    glued, made = [], set()
+    for text, draw in zip(texts, rng.random(len(texts))):
+        words = text.split(" ")
+        pairs = [
+            i for i in range(len(words) - 1)
+            if WORD_RE.fullmatch(words[i]) and WORD_RE.fullmatch(words[i + 1])
+            and min(len(words[i]), len(words[i + 1])) >= 3 and len(words[i]) + len(words[i + 1]) >= 9
+        ]
+        if draw < rate and pairs:
+            i = pairs[int(rng.integers(len(pairs)))]
+            words[i:i + 2] = [words[i] + words[i + 1]]
+            made.add(words[i].lower())
+        glued.append(" ".join(words))
+    return glued, made
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run time of the run-together token segmentation.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--glue-rate", type=float, default=0.02, help="Share of rows with a run-together token")
+    parser.add_argument("--budget", type=float, default=4.0,
+                        help="Seconds of segmentation (lexicon excluded) allowed at the largest scale")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when over budget")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    profile = load_profile()
+    print(f"{'scale':>6} {'tokens':>11} {'lexicon s':>10} {'segment s':>10} {'total s':>8} {'tokens/s':>12} "
+          f"{'glued':>7} {'found':>6} {'split':>7}")
+    segmentation = 0.0
+    for scale in args.scales:
+        texts = [latin for book in generate_books(profile, scale) for latin, _ in book.rows]
+        texts, made = glue_words(texts, args.glue_rate)
+        series = pd.Series(texts, dtype=object)
+
+        start = time.perf_counter()
+        lexicon = Lexicon.from_texts(texts)
+        built = time.perf_counter()
+        segmenter = Segmenter(lexicon)
+        segment_column(series, segmenter)
+        segmented = time.perf_counter()
+
+        total, segmentation = segmented - start, segmented - built
+        found = sum(1 for token in made if segmenter.split(token)) / max(len(made), 1)
+        print(f"{scale:>6} {lexicon.total:>11,} {built - start:>10.3f} {segmented - built:>10.3f} {total:>8.3f} "
+              f"{lexicon.total / total:>12,.0f} {len(made):>7,} {found:>6.0%} {sum(segmenter.applied.values()):>7,}")
+
+    if args.check:
+        if segmentation > args.budget:
+            print(f"OVER BUDGET: segmentation {segmentation:.3f} s at {args.scales[-1]}x (budget {args.budget:.1f} s)")
+            sys.exit(1)
+        print("Within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+bench_service.py
+
+Load test of the query service (src/search/service.py): latency percentiles
+and throughput under concurrent clients.
+
+The service runs in its own process (started here on a free port, or an
+already running one with --url). Every client is an asyncio task with one
+keep-alive connection that sends requests back to back for --duration
+seconds. Requests are drawn from a mix over the real corpus:
+
+- 50% /paragraphs/<random id>
+- 25% /chapters?from=<chapter>&to=<next chapter>
+- 25% /search?q=<one of bench_search's queries or a random Latin word>
+
+The random ids and words keep part of the traffic out of the LRU cache; run
+with --cache-size 0 to measure the uncached path alone.
+
+Usage:
+        python -m benchmarks.bench_service --clients 1 8 32 --duration 5
+        python -m benchmarks.bench_service --url http://127.0.0.1:8765
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+from urllib.request import urlopen
+
+from benchmarks.bench_search import QUERIES
+from src.config import OUTPUT_PATH, PROJECT_ROOT, SEARCH_INDEX_PATH, SERVICE_CACHE_SIZE
+from src.transform.enrich_kempis import read_fact_table
+
+
+def request_mix(seed: int = 0):
+    """An endless stream of request targets over the fact table."""
+    fact_table = read_fact_table(OUTPUT_PATH)
+    ids = fact_table["id"].tolist()
+    chapters = list(dict.fromkeys(fact_table["chapter_id"]))
+    words = [w for w in " ".join(fact_table["latin_text"].sample(200, random_state=seed)).split() if w.isalpha()]
+    rng = random.Random(seed)
+    while True:
+        draw = rng.random()
+        if draw < 0.5:
+            yield f"/paragraphs/{rng.choice(ids)}"
+        elif draw < 0.75:
+            start = rng.randrange(len(chapters) - 1)
+            yield f"/chapters?from={chapters[start]}&to={chapters[start + 1]}"
+        else:
+            yield f"/search?q={quote(rng.choice(QUERIES + words))}&limit=10"
+
+
+async def client(host: str, port: int, targets, deadline: float, latencies: list[float], errors: list[str]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            target = next(targets)
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            headers = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            length = int(headers.lower().split("content-length:")[1].split("\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not headers.startswith("HTTP/1.1 200"):
+                errors.append(f"{target}: {headers.splitlines()[0]}")
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, clients: int, duration: float, seed: int) -> dict:
+    targets = request_mix(seed)
+    latencies: list[float] = []
+    errors: list[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, targets, start + duration, latencies, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        "requests": len(ms),
+        "rps": len(ms) / elapsed,
+        "p50": statistics.median(ms),
+        "p99": ms[min(len(ms) - 1, int(len(ms) * 0.99))],
+        "max": ms[-1],
+        "errors": len(errors),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, cache_size: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.search.service", "--port", str(port), "--cache-size", str(cache_size)],
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(200):                   # wait up to 20 s for the fact table and index to load
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("The query service did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per client count")
+    parser.add_argument("--url", help="Test a running service instead of starting one")
+    parser.add_argument("--cache-size", type=int, default=SERVICE_CACHE_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    if not Path(SEARCH_INDEX_PATH).exists():
+        print(f"No full-text index at {SEARCH_INDEX_PATH}: run `python -m src.search.full_text build` first.")
+        sys.exit(1)
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        host, port = "127.0.0.1", free_port()
+        process = start_server(port, args.cache_size)
+
+    try:
+        print(f"{'clients':>8} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        for clients in args.clients:
+            result = asyncio.run(run_load(host, port, clients, args.duration, args.seed))
+            print(f"{clients:>8} {result['requests']:>9,} {result['rps']:>9,.0f} {result['p50']:>8.3f} "
+                  f"{result['p99']:>8.3f} {result['max']:>8.2f} {result['errors']:>7}")
+        with urlopen(f"http://{host}:{port}/health") as response:
+            cache = json.load(response)["cache"]
+        print(f"Response cache: {cache['hits']:,} hits, {cache['misses']:,} misses "
+              f"({cache['hits'] / max(1, cache['hits'] + cache['misses']):.0%} hit ratio, {cache['size']} entries)")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+bench_stages.py
+
+Throughput of the extract and transform functions on synthetic corpora
+(see synthetic_corpus.py) at several multiples of the Kempis size, compared
+with stored baseline results.
+
+Cases:
+- extract_text_from_html: the Gutenberg-style page (MB/s)
+- parse_book_html: the Latin Library-style book pages (MB/s)
+- clean_text_column: every Latin and English cell of the aligned rows (rows/s)
+- enrich_book_to_fact: each cleaned book (rows/s)
+- load_and_merge: read and merge the aligned TSVs from disk (rows/s)
+- build_fact_table: read, clean, enrich and merge the aligned TSVs (rows/s)
+
+Each case keeps the best of --repeat runs (more for cases under half a
+second). With --check the run exits with status 1 when a case is slower than
+its baseline (benchmarks/baseline.json) by more than --threshold (default 25%).
+Baselines depend on the machine: record your own with --save-baseline before
+relying on --check. 1000x needs several GB of memory.
+
+Usage:
+        python -m benchmarks.bench_stages                         # 1x, 10x, 100x
+        python -m benchmarks.bench_stages --scales 1 10 100 1000
+        python -m benchmarks.bench_stages --save-baseline
+        python -m benchmarks.bench_stages --check --threshold 0.3
+"""
+
+import argparse
+import json
+import logging
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic_corpus import (
+    generate_books,
+    gutenberg_html,
+    latin_library_pages,
+    load_profile,
+    write_aligned_tsvs,
+)
+from src.extract.extract_english import extract_text_from_html
+from src.extract.extract_latin import parse_book_html
+from src.transform.clean_kempis import clean_aligned_book, clean_text_column
+from src.transform.enrich_kempis import build_fact_table, enrich_book_to_fact
+from src.transform.transform import load_and_merge
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+MIN_CASE_SECONDS = 0.5          # small cases are repeated until this much time is measured
+
+
+def best_of(repeat: int, func, min_seconds: float = MIN_CASE_SECONDS) -> float:
+    """Shortest wall time of at least `repeat` calls, repeating fast cases until min_seconds have passed."""
+    timings = []
+    while len(timings) < repeat or sum(timings) < min_seconds:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_cases(scale: int, repeat: int, workdir: Path) -> dict[str, dict]:
+    """Runs every case at one scale. Returns {case@scale: {throughput, unit, size, seconds}}."""
+    books = generate_books(load_profile(), scale)
+    aligned_dir = workdir / f"aligned_{scale}x"
+    write_aligned_tsvs(books, aligned_dir)
+
+    english_page = gutenberg_html(books)
+    latin_pages = list(latin_library_pages(books).values())
+    cells = pd.Series([text for book in books for row in book.rows for text in row])
+    cleaned = {book.number: clean_aligned_book(book.number, aligned_dir) for book in books}
+    rows = sum(len(df) for df in cleaned.values())
+
+    def html_mb(*pages: str) -> float:
+        return sum(len(page.encode("utf-8")) for page in pages) / 1e6
+
+    cases = [
+        ("extract_text_from_html", html_mb(english_page), "MB/s",
+         lambda: extract_text_from_html(english_page)),
+        ("parse_book_html", html_mb(*latin_pages), "MB/s",
+         lambda: [parse_book_html(page) for page in latin_pages]),
+        ("clean_text_column", len(cells), "rows/s",
+         lambda: clean_text_column(cells)),
+        ("enrich_book_to_fact", rows, "rows/s",
+         lambda: [enrich_book_to_fact(df.copy(), number) for number, df in cleaned.items()]),
+        ("load_and_merge", rows, "rows/s",
+         lambda: load_and_merge(aligned_dir)),
+        ("build_fact_table", rows, "rows/s",
+         lambda: build_fact_table(aligned_dir)),
+    ]
+
+    results = {}
+    for name, size, unit, func in cases:
+        seconds = best_of(repeat, func)
+        results[f"{name}@{scale}x"] = {
+            "throughput": round(size / seconds, 2),
+            "unit": unit,
+            "size": round(size, 3),
+            "seconds": round(seconds, 4),
+        }
+    return results
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases whose throughput fell below (1 - threshold) x the baseline."""
+    failed = []
+    for case, result in results.items():
+        reference = baseline.get(case)
+        if reference and result["throughput"] < reference["throughput"] * (1 - threshold):
+            drop = 1 - result["throughput"] / reference["throughput"]
+            failed.append(f"{case}: {result['throughput']:,} {result['unit']} vs baseline "
+                          f"{reference['throughput']:,} ({drop:.0%} slower)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on a throughput regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed throughput drop before --check fails (0.25 = 25%%)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    workdir = Path(tempfile.mkdtemp())
+    results = {}
+    print(f"{'case':<32} {'size':>12} {'seconds':>9} {'throughput':>16} {'vs baseline':>12}")
+    try:
+        for scale in args.scales:
+            for case, result in run_cases(scale, args.repeat, workdir).items():
+                results[case] = result
+                reference = baseline.get(case)
+                change = f"{result['throughput'] / reference['throughput'] - 1:+.0%}" if reference else "–"
+                print(f"{case:<32} {result['size']:>12,} {result['seconds']:>9.4f} "
+                      f"{result['throughput']:>11,.0f} {result['unit']:<4} {change:>12}")
+    finally:
+        shutil.rmtree(workdir)
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                        "processor": platform.machine()},
+            "results": merged,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        failed = regressions(results, baseline, args.threshold)
+        for line in failed:
+            print(f"REGRESSION {line}")
+        if failed:
+            sys.exit(1)
+        print(f"No regression beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
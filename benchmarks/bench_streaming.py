@@ -0,0 +1,75 @@
+"""
+bench_streaming.py
+
+Peak memory and time of the in-memory fact table build (build_fact_table + to_csv)
+against the streaming build (stream_fact_table) at several chunk sizes, on a
+synthetic corpus (default 100x the Kempis size). Checks that every output is
+byte for byte identical.
+
+Peak memory is the tracemalloc peak; time is measured in a separate run
+without tracing. Arrow-backed string buffers (pandas' default string dtype) are
+allocated outside Python's allocator and not counted, for either mode.
+
+Usage:
+        python -m benchmarks.bench_streaming --scale 100 --chunk-rows 1000 10000 100000
+"""
+
+import argparse
+import filecmp
+import logging
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic_corpus import generate_books, load_profile, write_aligned_tsvs
+from src.transform.enrich_kempis import build_fact_table
+from src.transform.streaming import stream_fact_table
+
+
+def measure(func) -> tuple[float, float]:
+    """(seconds, peak MB) of one call; the peak comes from a second, traced call."""
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--chunk-rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        aligned = workdir / "aligned"
+        write_aligned_tsvs(generate_books(load_profile(), args.scale), aligned)
+        input_mb = sum(f.stat().st_size for f in aligned.iterdir()) / 1e6
+        print(f"{args.scale}x corpus: {input_mb:.0f} MB of aligned TSV")
+        print(f"{'mode':<24} {'seconds':>8} {'peak MB':>8} {'identical':>10}")
+
+        expected = workdir / "in_memory.tsv"
+        seconds, peak = measure(
+            lambda: build_fact_table(aligned).to_csv(expected, sep="\t", index=False, encoding="utf-8")
+        )
+        print(f"{'in memory':<24} {seconds:>8.2f} {peak:>8.0f} {'–':>10}")
+
+        for chunk_rows in args.chunk_rows:
+            output = workdir / f"streamed_{chunk_rows}.tsv"
+            seconds, peak = measure(lambda: stream_fact_table(aligned, output, chunk_rows))
+            same = filecmp.cmp(expected, output, shallow=False)
+            print(f"{f'stream ({chunk_rows:,} rows)':<24} {seconds:>8.2f} {peak:>8.0f} {str(same):>10}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_validate.py
+
+Run time of the alignment validation (src/transform/validate_alignment.py) on
+synthetic corpora of 1x/10x/100x the aligned Kempis files (see
+synthetic_corpus.py), split into reading the TSVs and running the checks.
+
+The validation gates every pipeline run, so the checks must stay well under a
+second at 100x. With --check the run exits with status 1 when the largest
+scale is over --budget seconds (read + checks + report).
+
+Usage:
+        python -m benchmarks.bench_validate
+        python -m benchmarks.bench_validate --scales 1 10 100 --check
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_corpus import generate_books, load_profile, write_aligned_tsvs
+from src.transform.validate_alignment import build_report, check_alignment, read_aligned_books
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run time of the alignment validation.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds allowed at the largest scale")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when over budget")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    profile = load_profile()
+    print(f"{'scale':>6} {'rows':>10} {'read s':>8} {'checks s':>9} {'report s':>9} {'total s':>8} {'rows/s':>12} {'issues':>7}")
+    total = 0.0
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_aligned_tsvs(generate_books(profile, scale), Path(tmp))
+
+            start = time.perf_counter()
+            rows = read_aligned_books(Path(tmp))
+            read = time.perf_counter()
+            checks = check_alignment(rows)
+            checked = time.perf_counter()
+            report = build_report(rows, checks)
+            reported = time.perf_counter()
+
+        total = reported - start
+        print(f"{scale:>6} {len(rows):>10,} {read - start:>8.3f} {checked - read:>9.3f} {reported - checked:>9.3f} "
+              f"{total:>8.3f} {len(rows) / total:>12,.0f} {len(report['issues']):>7}")
+
+    if args.check:
+        if total > args.budget:
+            print(f"OVER BUDGET: {total:.3f} s at {args.scales[-1]}x (budget {args.budget:.1f} s)")
+            sys.exit(1)
+        print("Within budget.")
+
+
+if __name__ == "__main__":
+    main()
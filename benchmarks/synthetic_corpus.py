@@ -0,0 +1,198 @@
+"""
+synthetic_corpus.py
+
+Generates synthetic corpora shaped like the Kempis data, at any multiple of its size:
+
+- Gutenberg-style HTML of the English text (extract_text_from_html input)
+- Latin Library-style pages, one per book (parse_book_html input)
+- aligned TSVs, book{n}_aligned.tsv (clean_aligned_book / build_fact_table input)
+
+The shape is measured from data/aligned/: number of books, chapters per book,
+paragraphs per chapter, words per paragraph and the word frequencies of each
+language. At scale N every book has N times as many chapters, so row counts
+grow linearly. Headings and numbering follow the real prefixes ("Liber Primus:",
+"THE FIRST BOOK:", "Cap. I.  ", "Cap. 2. ", "CHAPTER IV", "1.Qui", "2. His")
+so the cleaning regexes do the same work as on the real files.
+
+Text is random words drawn with the real frequencies: realistic length and
+character mix, but not meaningful sentences (so it is not fit for the aligner).
+Generation is seeded and deterministic.
+
+Usage:
+        python -m benchmarks.synthetic_corpus --scale 10 --output-dir /tmp/kempis_x10
+"""
+
+import argparse
+import csv
+import html as html_lib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import INPUT_DIR
+from src.transform.books import find_book_numbers, to_roman
+
+CHAPTER_RE = re.compile(r"^\s*(?:cap\.|c?hapter)", re.IGNORECASE)
+LATIN_BOOK_LABELS = ["Primus", "Secundus", "Tertius", "Quartus", "Quintus", "Sextus", "Septimus", "Octavus"]
+ENGLISH_BOOK_LABELS = ["FIRST", "SECOND", "THIRD", "FOURTH", "FIFTH", "SIXTH", "SEVENTH", "EIGHTH"]
+TITLE_WORDS = (3, 12)
+
+
+@dataclass
+class CorpusProfile:
+    """Shape of the real corpus, measured from the aligned files."""
+    chapters_per_book: list[int]
+    paragraphs_per_chapter: np.ndarray
+    latin_lengths: np.ndarray         # words per paragraph
+    english_lengths: np.ndarray
+    latin_words: np.ndarray           # vocabulary (object array) and its frequencies
+    latin_weights: np.ndarray
+    english_words: np.ndarray
+    english_weights: np.ndarray
+
+
+@dataclass
+class SyntheticBook:
+    number: int
+    rows: list[tuple[str, str]]       # aligned (latin, english) rows, headings included
+
+
+def load_profile(input_dir: Path = INPUT_DIR) -> CorpusProfile:
+    chapters_per_book, paragraphs_per_chapter = [], []
+    latin_lengths, english_lengths = [], []
+    latin_counts, english_counts = Counter(), Counter()
+
+    for number in find_book_numbers(input_dir):
+        df = pd.read_csv(Path(input_dir) / f"book{number}_aligned.tsv", sep="\t",
+                         names=["latin_text", "english_text"], dtype=str, keep_default_na=False)
+        is_heading = df["latin_text"].str.match(CHAPTER_RE)
+        chapters_per_book.append(int(is_heading.sum()))
+        chapter = is_heading.cumsum()
+        paragraphs_per_chapter.extend(chapter[~is_heading & (chapter > 0)].value_counts().tolist())
+
+        body = df[~is_heading].iloc[1:]             # the first row is the book heading
+        for column, lengths, counts in [("latin_text", latin_lengths, latin_counts),
+                                        ("english_text", english_lengths, english_counts)]:
+            words = body[column].str.split()
+            lengths.extend(words.str.len().tolist())
+            for paragraph in words:
+                counts.update(word for word in paragraph if not word[0].isdigit())
+
+    def vocabulary(counts: Counter) -> tuple[np.ndarray, np.ndarray]:
+        words, frequencies = zip(*counts.most_common())
+        weights = np.array(frequencies, dtype=float)
+        return np.array(words, dtype=object), weights / weights.sum()
+
+    latin_words, latin_weights = vocabulary(latin_counts)
+    english_words, english_weights = vocabulary(english_counts)
+    return CorpusProfile(
+        chapters_per_book,
+        np.array(paragraphs_per_chapter),
+        np.array([n for n in latin_lengths if n > 0]),
+        np.array([n for n in english_lengths if n > 0]),
+        latin_words, latin_weights, english_words, english_weights,
+    )
+
+
+def _texts(rng: np.random.Generator, words: np.ndarray, weights: np.ndarray, lengths: np.ndarray) -> list[str]:
+    """One string of random words per entry of lengths, drawn in a single batch."""
+    drawn = words[rng.choice(len(words), size=int(lengths.sum()), p=weights)]
+    ends = np.cumsum(lengths)
+    return [" ".join(drawn[end - n:end]) for n, end in zip(lengths, ends)]
+
+
+def generate_books(profile: CorpusProfile, scale: int = 1, seed: int = 0) -> list[SyntheticBook]:
+    """Books with `scale` times as many chapters as the real ones, as aligned rows."""
+    rng = np.random.default_rng(seed)
+    books = []
+
+    for index, real_chapters in enumerate(profile.chapters_per_book):
+        number = index + 1
+        chapters = real_chapters * scale
+        paragraphs = rng.choice(profile.paragraphs_per_chapter, size=chapters)
+        count = int(paragraphs.sum())
+
+        latin = _texts(rng, profile.latin_words, profile.latin_weights, rng.choice(profile.latin_lengths, count))
+        english = _texts(rng, profile.english_words, profile.english_weights, rng.choice(profile.english_lengths, count))
+        title_lengths = rng.integers(*TITLE_WORDS, size=chapters + 1)      # [0] is the book title
+        latin_titles = _texts(rng, profile.latin_words, profile.latin_weights, title_lengths)
+        english_titles = _texts(rng, profile.english_words, profile.english_weights, title_lengths)
+        tight_numbering = rng.random(count) < 0.1      # "1.Qui" instead of "1. Qui", as in the Latin source
+
+        latin_label = LATIN_BOOK_LABELS[index] if index < len(LATIN_BOOK_LABELS) else to_roman(number)
+        english_label = ENGLISH_BOOK_LABELS[index] if index < len(ENGLISH_BOOK_LABELS) else to_roman(number)
+        rows = [(f"Liber {latin_label}: {latin_titles[0]}.", f"THE {english_label} BOOK: {english_titles[0].upper()}")]
+
+        position = 0
+        for chapter in range(1, chapters + 1):
+            roman = to_roman(chapter)
+            latin_number = f"{roman}.  " if chapter == 1 or chapter % 3 == 0 else f"{chapter}. "
+            rows.append((f"Cap. {latin_number}{latin_titles[chapter]}.", f"CHAPTER {roman} {english_titles[chapter]}"))
+            for paragraph in range(1, int(paragraphs[chapter - 1]) + 1):
+                separator = "" if tight_numbering[position] else " "
+                rows.append((f"{paragraph}.{separator}{latin[position]}", f"{paragraph}. {english[position]}"))
+                position += 1
+
+        books.append(SyntheticBook(number, rows))
+    return books
+
+
+# === OUTPUT FORMATS ===
+def gutenberg_html(books: list[SyntheticBook]) -> str:
+    """The English side as one Gutenberg-style page, with license boilerplate around it."""
+    parts = ["<html><head><title>The Imitation of Christ</title></head><body>",
+             "<p>*** START OF THE PROJECT GUTENBERG EBOOK THE IMITATION OF CHRIST ***</p>"]
+    for book in books:
+        for _, english in book.rows:
+            tag = "h2" if english.startswith(("THE ", "CHAPTER")) else "p"
+            parts.append(f"<{tag}>{html_lib.escape(english)}</{tag}>")
+    parts.append("<p>*** END OF THE PROJECT GUTENBERG EBOOK THE IMITATION OF CHRIST ***</p></body></html>")
+    return "\n".join(parts)
+
+
+def latin_library_pages(books: list[SyntheticBook]) -> dict[int, str]:
+    """The Latin side as one Latin Library-style page per book, with the site footer."""
+    pages = {}
+    for book in books:
+        parts = [f"<html><head><title>Kempis {to_roman(book.number)}</title></head><body>",
+                 f"<p class=\"pagehead\">THOMAS À KEMPIS: DE IMITATIONE CHRISTI LIBER {to_roman(book.number)}</p>"]
+        parts.extend(f"<p>{html_lib.escape(latin)}</p>" for latin, _ in book.rows)
+        parts.append('<p class="pagehead"><a href="/">The Latin Library</a> THE LATIN LIBRARY</p></body></html>')
+        pages[book.number] = "\n".join(parts)
+    return pages
+
+
+def write_aligned_tsvs(books: list[SyntheticBook], output_dir: Path) -> list[Path]:
+    """Writes book{n}_aligned.tsv files (two columns, no header) like data/aligned/."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for book in books:
+        path = output_dir / f"book{book.number}_aligned.tsv"
+        with path.open("w", encoding="utf-8", newline="") as f:
+            csv.writer(f, delimiter="\t", lineterminator="\n").writerows(book.rows)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", type=Path, required=True)
+    args = parser.parse_args()
+
+    books = generate_books(load_profile(), args.scale, args.seed)
+    write_aligned_tsvs(books, args.output_dir / "aligned")
+    (args.output_dir / "gutenberg.html").write_text(gutenberg_html(books), encoding="utf-8")
+    for number, page in latin_library_pages(books).items():
+        (args.output_dir / f"kempis{number}.shtml").write_text(page, encoding="utf-8")
+    print(f"{sum(len(book.rows) for book in books):,} aligned rows written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+artifacts.py
+
+Compressed, content-addressed storage for the raw and intermediate text files
+(raw_english_kempis.txt, raw_latin_kempis.txt, the corpus and crawl raw files,
+the boilerplate-free copies).
+
+A text file is written once into the store, compressed, and named after the
+SHA-256 of its uncompressed content:
+
+    data/artifacts/objects/<first 2 hex>/<sha256>.gz      (or .zst)
+
+and the path the pipeline knows it by gets a small JSON ref next to it
+(`raw_latin_kempis.txt.ref`: digest, codec, sizes, paragraph separator).
+Writing the same content again stores nothing new and leaves the ref (and its
+mtime) alone, so identical outputs are deduplicated across runs and works and
+run_pipeline sees an unchanged input.
+
+Reading goes through the ref when it is newer than a plain file at the same
+path, otherwise through the plain file (the snapshots committed in data/raw/,
+memory-mapped). Readers stream: iter_paragraphs yields one paragraph at a time
+from fixed-size chunks, so memory does not grow with the file.
+
+Codecs: gzip (standard library) or zstd when the zstandard package is
+installed (ARTIFACT_CODEC=zstd).
+
+Usage:
+        python -m src.artifacts info data/raw/raw_latin_kempis.txt
+        python -m src.artifacts export data/raw/raw_latin_kempis.txt    # refresh the plain snapshot
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from src.config import ARTIFACT_CODEC, ARTIFACT_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1 << 20
+REF_SUFFIX = ".ref"
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# extract_latin (and the crawler) separate paragraphs with a blank line; extract_english
+# writes one paragraph per line, where a "\n" after "\r" is a wrapped line inside a paragraph
+SEPARATOR_PATTERNS = {"\n\n": re.compile(rb"\n\n"), "\n": re.compile(rb"(?<!\r)\n")}
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """What a ref records about a stored text file."""
+    digest: str             # SHA-256 of the uncompressed content
+    codec: str
+    size: int               # uncompressed bytes
+    stored_size: int        # bytes of the compressed object
+    paragraphs: int
+    separator: str
+
+
+def ref_path(path: Path) -> Path:
+    """raw_latin_kempis.txt → raw_latin_kempis.txt.ref"""
+    path = Path(path)
+    return path.with_name(path.name + REF_SUFFIX)
+
+
+def logical_path(path: Path) -> Path:
+    """The inverse of ref_path (paths without the suffix are returned as is)."""
+    path = Path(path)
+    return path.with_name(path.name[:-len(REF_SUFFIX)]) if path.name.endswith(REF_SUFFIX) else path
+
+
+def detect_separator(sample: bytes) -> str:
+    return "\n\n" if b"\n\n" in sample else "\n"
+
+
+def split_paragraphs(chunks: Iterable[bytes], separator: str) -> Iterator[str]:
+    """Paragraphs (stripped, non-empty) of text arriving in byte chunks of any size."""
+    pattern = SEPARATOR_PATTERNS[separator]
+    tail = b""
+    for chunk in chunks:
+        parts = pattern.split(tail + chunk)
+        tail = parts.pop()              # may continue in the next chunk
+        for part in parts:
+            text = part.decode("utf-8").strip()
+            if text:
+                yield text
+    text = tail.decode("utf-8").strip()
+    if text:
+        yield text
+
+
+def _hash(paragraphs: Iterable[str], separator: str) -> tuple[str, int, int]:
+    """(SHA-256, bytes, paragraphs) of the content write_paragraphs would store."""
+    digest, size, count = hashlib.sha256(), 0, 0
+    for paragraph in paragraphs:
+        data = (paragraph + separator).encode("utf-8")
+        digest.update(data)
+        size += len(data)
+        count += 1
+    return digest.hexdigest(), size, count
+
+
+# === CODECS ===
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _resolve_codec(codec: str) -> str:
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unknown artifact codec {codec!r}, expected one of {list(CODEC_SUFFIXES)}")
+    if codec == "zstd" and _zstandard() is None:
+        logger.warning("zstandard is not installed; artifacts are written with gzip")
+        return "gzip"
+    return codec
+
+
+# === STORE ===
+class ArtifactStore:
+    """
+    Content-addressed object store plus the refs that name its objects.
+
+    Args:
+        root (Path): Folder of the objects (refs live next to the paths they name).
+        codec (str): "gzip" or "zstd" for new objects; objects are read with the codec they were written with.
+    """
+
+    def __init__(self, root: Path = ARTIFACT_STORE_DIR, codec: str = ARTIFACT_CODEC):
+        self.root = Path(root)
+        self.codec = codec
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}{CODEC_SUFFIXES[codec]}"
+
+    # --- writing ---
+    def write_paragraphs(self, path: Path, paragraphs: Iterable[str], separator: str = "\n\n") -> Artifact:
+        """
+        Stores the paragraphs, each followed by separator, as the content of path.
+
+        A list is hashed first (much cheaper than compressing it), so content that
+        is already stored is never compressed again. Any other iterable is
+        compressed and hashed in one pass into a temporary object, dropped if the
+        digest turns out to be stored already. The ref is replaced last, so a
+        failure part-way keeps the previous content.
+
+        Returns:
+            Artifact: The stored content's digest, sizes and paragraph count.
+        """
+        path = Path(path)
+        codec = _resolve_codec(self.codec)
+        found = None
+        if isinstance(paragraphs, Sequence):
+            digest, size, count = _hash(paragraphs, separator)
+            found = self._find_object(digest)
+        if found is None:
+            digest, size, count, (object_path, codec, reused) = self._store_object(paragraphs, separator, codec)
+        else:
+            (object_path, codec), reused = found, True
+
+        artifact = Artifact(digest, codec, size, object_path.stat().st_size, count, separator)
+        if not self._ref_is_current(path, digest):
+            self._write_ref(path, artifact)
+        logger.info(
+            f"Saved {count} paragraphs to {path} ({digest[:12]}, {size:,} → {artifact.stored_size:,} "
+            f"bytes {artifact.codec}{', already stored' if reused else ''})"
+        )
+        return artifact
+
+    def _store_object(self, paragraphs: Iterable[str], separator: str, codec: str):
+        """Compresses and hashes in one pass; (digest, size, count, (object path, codec, already stored))."""
+        objects_dir = self.root / "objects"
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        temp_name = objects_dir / f".{uuid.uuid4().hex}.tmp"
+
+        digest, size, count = hashlib.sha256(), 0, 0
+        try:
+            # A plain exclusive open, so the object gets the umask mode like its ref (mkstemp would make it 0600)
+            with open(temp_name, "xb") as raw:
+                if codec == "zstd":
+                    out = _zstandard().ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+                else:
+                    out = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0)
+                with out:
+                    for paragraph in paragraphs:
+                        data = (paragraph + separator).encode("utf-8")
+                        digest.update(data)
+                        out.write(data)
+                        size += len(data)
+                        count += 1
+
+            digest = digest.hexdigest()
+            existing = self._find_object(digest)
+            if existing is not None:
+                temp_name.unlink()
+                return digest, size, count, (*existing, True)
+            target = self._object_path(digest, codec)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_name, target)
+            return digest, size, count, (target, codec, False)
+        except BaseException:
+            temp_name.unlink(missing_ok=True)
+            raise
+
+    def _ref_is_current(self, path: Path, digest: str) -> bool:
+        """The ref already names digest and is not older than a plain file at path."""
+        current = self.ref(path)
+        return current is not None and current.digest == digest and self._ref_wins(path)
+
+    @staticmethod
+    def _write_ref(path: Path, artifact: Artifact) -> None:
+        target = ref_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(asdict(artifact), indent=2), encoding="utf-8")
+        os.replace(temp, target)
+
+    # --- lookup ---
+    def _find_object(self, digest: str) -> tuple[Path, str] | None:
+        for codec in CODEC_SUFFIXES:
+            candidate = self._object_path(digest, codec)
+            if candidate.exists():
+                return candidate, codec
+        return None
+
+    @staticmethod
+    def ref(path: Path) -> Artifact | None:
+        """The artifact recorded in path's ref, None when there is no ref."""
+        target = ref_path(path)
+        if not target.exists():
+            return None
+        return Artifact(**json.loads(target.read_text(encoding="utf-8")))
+
+    @staticmethod
+    def _ref_wins(path: Path) -> bool:
+        """Read through the ref: it exists and no plain file at path is newer."""
+        target = ref_path(path)
+        if not target.exists():
+            return False
+        return not Path(path).exists() or target.stat().st_mtime >= Path(path).stat().st_mtime
+
+    def exists(self, path: Path) -> bool:
+        return ref_path(path).exists() or Path(path).exists()
+
+    # --- reading ---
+    def iter_chunks(self, path: Path, chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+        """The uncompressed content of path in chunks (decompressed from the store or memory-mapped)."""
+        path = Path(path)
+        if self._ref_wins(path):
+            artifact = self.ref(path)
+            found = self._find_object(artifact.digest)
+            if found is None:
+                raise FileNotFoundError(f"{ref_path(path)} names object {artifact.digest}, missing from {self.root}")
+            yield from self._read_object(*found, chunk_bytes)
+            return
+
+        if not path.exists():
+            raise FileNotFoundError(f"Input file not found: {path}")
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, len(mapped), chunk_bytes):
+                    yield mapped[start:start + chunk_bytes]
+
+    @staticmethod
+    def _read_object(object_path: Path, codec: str, chunk_bytes: int) -> Iterator[bytes]:
+        with object_path.open("rb") as raw:
+            if codec == "zstd":
+                zstandard = _zstandard()
+                if zstandard is None:
+                    raise RuntimeError(f"{object_path} is zstd-compressed; install zstandard to read it")
+                source = zstandard.ZstdDecompressor().stream_reader(raw)
+            else:
+                source = gzip.GzipFile(fileobj=raw, mode="rb")
+            with source:
+                while chunk := source.read(chunk_bytes):
+                    yield chunk
+
+    def separator(self, path: Path) -> str:
+        """The paragraph separator recorded in the ref, or detected from the start of the file."""
+        if self._ref_wins(path):
+            return self.ref(path).separator
+        return detect_separator(next(self.iter_chunks(path, 1 << 16), b""))
+
+    def iter_paragraphs(self, path: Path, chunk_bytes: int = CHUNK_BYTES) -> Iterator[str]:
+        """Streams the paragraphs of path, stripped, empty ones skipped."""
+        return split_paragraphs(self.iter_chunks(path, chunk_bytes), self.separator(path))
+
+    def read_text(self, path: Path) -> str:
+        """The whole content of path (for consumers that need it at once, such as the aligner)."""
+        return b"".join(self.iter_chunks(path)).decode("utf-8")
+
+    def export(self, path: Path, output_path: Path | None = None) -> Path:
+        """Writes the stored content of path as a plain file (by default, at path itself)."""
+        output_path = Path(output_path or path)
+        temp = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        with temp.open("wb") as out:
+            for chunk in self.iter_chunks(path):
+                out.write(chunk)
+        os.replace(temp, output_path)
+        return output_path
+
+
+# === MODULE-LEVEL HELPERS (default store) ===
+def iter_paragraphs(path: Path, store: ArtifactStore | None = None) -> Iterator[str]:
+    return (store or ArtifactStore()).iter_paragraphs(path)
+
+
+def read_text(path: Path, store: ArtifactStore | None = None) -> str:
+    return (store or ArtifactStore()).read_text(path)
+
+
+def find_artifacts(folder: Path, pattern: str) -> list[Path]:
+    """Logical paths in folder matching pattern, whether stored as plain files, refs or both."""
+    folder = Path(folder)
+    found = {logical_path(p) for p in folder.glob(pattern)} | {logical_path(p) for p in folder.glob(pattern + REF_SUFFIX)}
+    return sorted(found)
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect and export stored text artifacts.")
+    parser.add_argument("command", choices=["info", "export"])
+    parser.add_argument("paths", nargs="+", type=Path, help="Logical paths, e.g. data/raw/raw_latin_kempis.txt")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore()
+    for path in args.paths:
+        artifact = store.ref(path)
+        if args.command == "info":
+            if artifact is None:
+                print(f"📄 {path}: plain file only")
+                continue
+            ratio = artifact.stored_size / artifact.size if artifact.size else 0
+            print(f"📦 {path}: {artifact.paragraphs} paragraphs, {artifact.size:,} bytes → "
+                  f"{artifact.stored_size:,} {artifact.codec} ({ratio:.0%}), sha256 {artifact.digest}")
+        else:
+            print(f"✅ {path} exported to {store.export(path)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -3,6 +3,9 @@ General configuration file for the ETL pipeline.
 
 By default, paths are rooted in the current working directory (project root),
 but you can override this by setting the PROJECT_ROOT environment variable.
+
+Importing this module has no side effects: folders are created by the stages
+that write into them, when they run.
 """
 
 from pathlib import Path
@@ -18,8 +21,30 @@ PROJECT_ROOT = Path(os.getenv("PROJECT_ROOT", Path.cwd())).resolve()
 # RAW DATA DIRECTORY
 # --------------------------------------------------
 
-RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
-RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)  # Create if missing
+RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"    # created by the extract scripts (ensure_folder_exists)
+
+# --------------------------------------------------
+# ARTIFACT STORE (compressed, content-addressed raw and intermediate text files, see src/artifacts.py)
+# --------------------------------------------------
+
+ARTIFACT_STORE_DIR = PROJECT_ROOT / "data" / "artifacts"
+ARTIFACT_CODEC = os.getenv("ARTIFACT_CODEC", "gzip")   # "gzip" or "zstd" (needs the zstandard package)
+
+# --------------------------------------------------
+# HTTP RESPONSE CACHE (used by fetch_html in the extract scripts)
+# --------------------------------------------------
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+HTTP_CACHE_DIR = RAW_DATA_DIR / ".http_cache"
+HTTP_CACHE_TTL_SECONDS = float(os.getenv("HTTP_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 1 week
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))  # 200 MB
+HTTP_CACHE_OFFLINE = os.getenv("HTTP_CACHE_OFFLINE", "0") == "1"  # Serve from cache only
+
+# --------------------------------------------------
+# HTML PARSING BACKEND ("stream" = single-pass html.parser, "bs4" = BeautifulSoup tree)
+# --------------------------------------------------
+
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "stream")
 
 # --------------------------------------------------
 # OUTPUT FILE AND SOURCE FOR ENGLISH TEXT EXTRACTION
@@ -36,6 +61,26 @@ LATIN_RAW_FILE = RAW_DATA_DIR / "raw_latin_kempis.txt"
 BASE_LATIN_URL = "https://www.thelatinlibrary.com"
 LATIN_URL = f"{BASE_LATIN_URL}/kempis.html"
 
+# Maximum number of book subpages downloaded concurrently (1 = sequential)
+LATIN_FETCH_WORKERS = int(os.getenv("LATIN_FETCH_WORKERS", "4"))
+
+# Parsed book pages of an unfinished extraction (removed once the raw file is written)
+LATIN_CHECKPOINT_DIR = RAW_DATA_DIR / ".latin_checkpoints"
+
+# --------------------------------------------------
+# SITE CRAWLER (whole author sections of The Latin Library, see extract/crawler.py)
+# --------------------------------------------------
+
+CRAWL_OUTPUT_DIR = RAW_DATA_DIR / "crawl"
+CRAWL_DB_PATH = CRAWL_OUTPUT_DIR / "frontier.sqlite"    # URL frontier, visited set and content hashes
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "4"))
+CRAWL_MAX_ATTEMPTS = int(os.getenv("CRAWL_MAX_ATTEMPTS", "3"))
+
+# Requests per second per host: start, floor and ceiling of the adaptive rate limit
+CRAWL_INITIAL_RATE = float(os.getenv("CRAWL_INITIAL_RATE", "2"))
+CRAWL_MIN_RATE = float(os.getenv("CRAWL_MIN_RATE", "0.2"))
+CRAWL_MAX_RATE = float(os.getenv("CRAWL_MAX_RATE", "10"))
+
 # --------------------------------------------------
 # ALIGNMENT TEMPLATE PATH (for manual Latin-English alignment)
 # --------------------------------------------------
@@ -43,9 +88,74 @@ LATIN_URL = f"{BASE_LATIN_URL}/kempis.html"
 TEMPLATE_DIR = PROJECT_ROOT / "data"
 TEMPLATE_OUTPUT_FILE = TEMPLATE_DIR / "manual_template.csv"
 
+# Output of the automatic aligner (see transform/align.py); kept apart from the hand-aligned files
+AUTO_ALIGNED_DIR = PROJECT_ROOT / "data" / "aligned_auto"
+
 # --------------------------------------------------
 # OUTPUT FILE AND SOURCE FOR TRANSFORM STAGE
 # --------------------------------------------------
 
 INPUT_DIR = PROJECT_ROOT / 'data' / 'aligned'
-OUTPUT_PATH = PROJECT_ROOT / 'data' / 'cleaned' / 'imitation_cleaned.tsv'
\ No newline at end of file
+OUTPUT_PATH = PROJECT_ROOT / 'data' / 'cleaned' / 'imitation_cleaned.tsv'
+
+# Columnar copy of the fact table, partitioned by book_id (see transform/columnar.py)
+PARQUET_OUTPUT_DIR = OUTPUT_PATH.parent / 'imitation_parquet'
+
+# Per-paragraph text statistics and their per-book / per-chapter aggregates (see transform/text_stats.py)
+PARAGRAPH_STATS_PATH = OUTPUT_PATH.parent / 'imitation_paragraph_stats.tsv'
+BOOK_STATS_PATH = OUTPUT_PATH.parent / 'imitation_book_stats.tsv'
+CHAPTER_STATS_PATH = OUTPUT_PATH.parent / 'imitation_chapter_stats.tsv'
+
+# Chapter dimension table (see transform/chapters.py)
+CHAPTERS_PATH = OUTPUT_PATH.parent / 'imitation_chapters.tsv'
+
+# Checks of the aligned files run before every clean (see transform/validate_alignment.py)
+ALIGNMENT_REPORT_PATH = OUTPUT_PATH.parent / 'alignment_report.json'
+ALIGNMENT_ACCEPTED_PATH = PROJECT_ROOT / 'data' / 'alignment_accepted.json'    # known issues of the source texts
+
+# Latin words that the run-together token splitter must leave whole (see transform/segment.py)
+SEGMENTATION_KEEP_PATH = PROJECT_ROOT / 'data' / 'segmentation_keep.json'
+
+# Rows per chunk when the fact table is streamed (see transform/streaming.py); 0 = build it in memory
+TRANSFORM_CHUNK_ROWS = int(os.getenv("TRANSFORM_CHUNK_ROWS", "0"))
+
+# Raw files without the paragraphs that recur across sources, and what was removed (see transform/boilerplate.py)
+BOILERPLATE_OUTPUT_DIR = PROJECT_ROOT / 'data' / 'deduped'
+BOILERPLATE_REPORT_PATH = BOILERPLATE_OUTPUT_DIR / 'boilerplate_report.json'
+DEDUPED_ENGLISH_FILE = BOILERPLATE_OUTPUT_DIR / 'raw' / ENGLISH_RAW_FILE.name
+DEDUPED_LATIN_FILE = BOILERPLATE_OUTPUT_DIR / 'raw' / LATIN_RAW_FILE.name
+
+# Content hashes and row ranges of each aligned book (incremental transform)
+TRANSFORM_MANIFEST_PATH = OUTPUT_PATH.parent / '.transform_manifest.json'
+
+# --------------------------------------------------
+# MULTI-WORK CORPUS MODE (see src/registry.py and src/run_corpus.py)
+# --------------------------------------------------
+
+WORKS_MANIFEST = PROJECT_ROOT / 'data' / 'works.json'
+CORPUS_OUTPUT_DIR = PROJECT_ROOT / 'data' / 'corpus'
+CORPUS_WORKERS = int(os.getenv("CORPUS_WORKERS", str(os.cpu_count() or 1)))
+
+# --------------------------------------------------
+# LOAD STAGE (SQLite stand-in for the PostgreSQL target)
+# --------------------------------------------------
+
+SQLITE_DB_PATH = PROJECT_ROOT / 'data' / 'imitation.sqlite'
+LOAD_BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "10000"))
+
+# --------------------------------------------------
+# FULL-TEXT SEARCH INDEX (see src/search/full_text.py)
+# --------------------------------------------------
+
+SEARCH_INDEX_PATH = OUTPUT_PATH.parent / 'imitation_fulltext.idx'
+
+# Read-only HTTP/JSON query service over the fact table (see src/search/service.py)
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+SERVICE_CACHE_SIZE = int(os.getenv("SERVICE_CACHE_SIZE", "4096"))   # responses kept in the LRU cache
+
+# --------------------------------------------------
+# RUN METRICS (see src/metrics.py; one JSON file per pipeline run)
+# --------------------------------------------------
+
+METRICS_DIR = PROJECT_ROOT / 'data' / 'metrics'
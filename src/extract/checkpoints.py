@@ -0,0 +1,83 @@
+"""
+checkpoints.py
+
+Per-page checkpoints for the Latin extraction.
+
+Every book subpage that was fetched and parsed into at least one paragraph is
+stored under `LATIN_CHECKPOINT_DIR` as `<sha256 of the URL>.json` (url, fetch
+time and paragraphs), written to a temporary file and moved into place so a
+crash never leaves a half-written checkpoint.
+
+A rerun after a failure reads the stored pages back and fetches only the ones
+that are missing. The raw file is assembled once every page has a checkpoint;
+the checkpoints are then removed, so the next full run starts fresh.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.config import LATIN_CHECKPOINT_DIR
+
+
+class IncompleteExtractionError(Exception):
+    """Raised when some pages could not be fetched or parsed; the others stay checkpointed."""
+
+    def __init__(self, missing: list[str]):
+        self.missing = missing
+        super().__init__(f"{len(missing)} page(s) missing after extraction: {', '.join(missing)}")
+
+
+class PageCheckpoints:
+    """
+    Parsed paragraphs of each completed page, keyed by URL.
+
+    Args:
+        directory (Path): Where the checkpoint files are kept.
+    """
+
+    def __init__(self, directory: Path = LATIN_CHECKPOINT_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, url: str) -> list[str] | None:
+        """The checkpointed paragraphs of a page, or None when the page has no (readable) checkpoint."""
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {path.name}: {e}")
+            return None
+        if data.get("url") != url or not data.get("paragraphs"):
+            return None
+        return data["paragraphs"]
+
+    def save(self, url: str, paragraphs: list[str]) -> None:
+        """Stores a page atomically (temporary file + rename)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"url": url, "fetched_at": time.time(), "paragraphs": paragraphs}, ensure_ascii=False)
+        path = self._path(url)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        """Removes every checkpoint (after the raw file was assembled)."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        logging.info(f"Cleared page checkpoints in {self.directory}")
@@ -0,0 +1,421 @@
+"""
+crawler.py
+
+Resumable crawler that mirrors whole sections of The Latin Library (or any
+site with the same page layout) as plain-text files.
+
+1. Starts from one or more index pages and follows the links that match the
+   configured patterns (regular expressions on the absolute URL, same host only).
+2. Pages matching the extract patterns are parsed with parse_book_html and
+   saved as one paragraph per block to:
+       data/raw/crawl/<host>/<url path>.txt
+   (through the artifact store: compressed objects plus a .txt.ref per page)
+3. The URL frontier, the visited set and the content hashes live in a SQLite
+   file (data/raw/crawl/frontier.sqlite). Every state change is committed, so a
+   killed crawl picks up where it stopped when started again with the same file.
+
+- Deduplication: a URL is fetched once (the frontier is keyed by URL, without
+  #fragment). A page whose extracted text (or HTML, for pages without paragraphs)
+  hashes like an earlier page is recorded as a duplicate and not written again.
+- Rate limit: each host gets its own AIMD limit. Every successful response adds
+  a little to the host's requests/second; a 429/503, a timeout or a connection
+  error halves it and honours Retry-After. The crawl runs as fast as the server
+  accepts without repeatedly tripping it.
+- Failed pages go back to the frontier until CRAWL_MAX_ATTEMPTS is reached.
+
+Usage:
+        python3 -m src.extract.crawler --section kempis
+        python3 -m src.extract.crawler --start https://www.thelatinlibrary.com/cicero.html \\
+                --follow 'thelatinlibrary\\.com/cicero/.*\\.shtml$'
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.artifacts import ArtifactStore
+from src.config import (
+    BASE_LATIN_URL,
+    CRAWL_DB_PATH,
+    CRAWL_OUTPUT_DIR,
+    CRAWL_WORKERS,
+    CRAWL_MAX_ATTEMPTS,
+    CRAWL_INITIAL_RATE,
+    CRAWL_MIN_RATE,
+    CRAWL_MAX_RATE,
+)
+from src.extract.extract_latin import create_session, fetch_html, parse_book_html, save_to_file
+from src.extract.http_cache import HttpCache
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+# === CRAWL RULES ===
+@dataclass(frozen=True)
+class CrawlRules:
+    """
+    What to crawl.
+
+    Args:
+        start_urls: Pages the crawl starts from (depth 0).
+        follow: Regexes (re.search on the absolute URL); matching links are queued.
+        extract: Regexes for the pages whose paragraphs are saved. Empty = every
+            followed page (start pages excepted).
+        max_depth: Links are not followed beyond this many hops from a start page.
+    """
+    start_urls: tuple[str, ...]
+    follow: tuple[str, ...]
+    extract: tuple[str, ...] = ()
+    max_depth: int | None = None
+
+    @classmethod
+    def for_section(cls, section: str, base_url: str = BASE_LATIN_URL) -> "CrawlRules":
+        """An author section of The Latin Library: <base>/<section>.html and the pages under <base>/<section>/."""
+        pages = rf"^{re.escape(base_url)}/{re.escape(section)}/[^?#]+\.s?html$"
+        return cls(start_urls=(f"{base_url}/{section}.html",), follow=(pages,), extract=(pages,))
+
+    @property
+    def hosts(self) -> set[str]:
+        return {urlsplit(url).netloc for url in self.start_urls}
+
+    def should_follow(self, url: str) -> bool:
+        return urlsplit(url).netloc in self.hosts and any(re.search(p, url) for p in self.follow)
+
+    def should_extract(self, url: str) -> bool:
+        if self.extract:
+            return any(re.search(p, url) for p in self.extract)
+        return url not in self.start_urls
+
+
+def extract_links(html: str, page_url: str) -> list[str]:
+    """Absolute http(s) URLs of every <a href> on the page, without #fragments, in page order."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for a in soup.find_all("a", href=True):
+        url = urldefrag(urljoin(page_url, a["href"].strip())).url
+        if url.startswith(("http://", "https://")) and url not in links:
+            links.append(url)
+    return links
+
+
+# === FRONTIER ===
+class Frontier:
+    """
+    URL frontier and visited set in SQLite.
+
+    Page status: pending → fetching → done | duplicate | failed
+    (a failed fetch goes back to pending until max_attempts is reached).
+    Pages left in "fetching" by a killed run are pending again on the next open.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pages (
+        url TEXT PRIMARY KEY,
+        depth INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        content_sha256 TEXT,
+        duplicate_of TEXT,
+        paragraphs INTEGER,
+        error TEXT,
+        updated_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pages_status ON pages (status);
+    CREATE TABLE IF NOT EXISTS contents (
+        sha256 TEXT PRIMARY KEY,
+        url TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: Path | str = CRAWL_DB_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+        with self.connection:
+            resumed = self.connection.execute(
+                "UPDATE pages SET status = 'pending' WHERE status = 'fetching'"
+            ).rowcount
+        if resumed:
+            logger.info(f"Resuming crawl: {resumed} interrupted pages back in the frontier.")
+
+    def add(self, urls: list[str], depth: int) -> int:
+        """Queues the URLs not seen before. Returns how many were new."""
+        with self.connection:
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO pages (url, depth, updated_at) VALUES (?, ?, ?)",
+                [(url, depth, time.time()) for url in urls],
+            )
+        return cursor.rowcount
+
+    def claim(self, limit: int) -> list[tuple[str, int]]:
+        """Takes up to `limit` pending pages, oldest first, and marks them as being fetched."""
+        with self.connection:
+            rows = self.connection.execute(
+                "SELECT url, depth FROM pages WHERE status = 'pending' ORDER BY rowid LIMIT ?", (limit,)
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE pages SET status = 'fetching', updated_at = ? WHERE url = ?",
+                [(time.time(), url) for url, _ in rows],
+            )
+        return rows
+
+    def complete(self, url: str, content_sha256: str, paragraphs: int) -> str | None:
+        """
+        Marks a page as fetched. Returns the URL of an earlier page with the same
+        content (the page is then recorded as a duplicate), or None.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO contents (sha256, url) VALUES (?, ?)", (content_sha256, url)
+            )
+            original = self.connection.execute(
+                "SELECT url FROM contents WHERE sha256 = ?", (content_sha256,)
+            ).fetchone()[0]
+            duplicate_of = original if original != url else None
+            self.connection.execute(
+                "UPDATE pages SET status = ?, content_sha256 = ?, duplicate_of = ?, paragraphs = ?, "
+                "error = NULL, updated_at = ? WHERE url = ?",
+                ("duplicate" if duplicate_of else "done", content_sha256, duplicate_of, paragraphs, time.time(), url),
+            )
+        return duplicate_of
+
+    def fail(self, url: str, error: str, max_attempts: int = CRAWL_MAX_ATTEMPTS) -> bool:
+        """Records a failed fetch. Returns True when the page is given up (max_attempts reached)."""
+        with self.connection:
+            self.connection.execute("UPDATE pages SET attempts = attempts + 1 WHERE url = ?", (url,))
+            attempts = self.connection.execute("SELECT attempts FROM pages WHERE url = ?", (url,)).fetchone()[0]
+            given_up = attempts >= max_attempts
+            self.connection.execute(
+                "UPDATE pages SET status = ?, error = ?, updated_at = ? WHERE url = ?",
+                ("failed" if given_up else "pending", error, time.time(), url),
+            )
+        return given_up
+
+    def counts(self) -> dict[str, int]:
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM pages GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+# === ADAPTIVE RATE LIMIT ===
+class AdaptiveRateLimiter:
+    """
+    Per-host request pacing with additive increase / multiplicative decrease.
+
+    acquire(host) blocks until the host's next request slot. success() raises
+    the host's rate by `increase` requests/second (up to max_rate); throttled()
+    multiplies it by `decrease` (down to min_rate) and, given a Retry-After,
+    holds every request to that host until it has passed.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = CRAWL_INITIAL_RATE,
+        min_rate: float = CRAWL_MIN_RATE,
+        max_rate: float = CRAWL_MAX_RATE,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._rates: dict[str, float] = {}
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def rate(self, host: str) -> float:
+        return self._rates.get(host, self.initial_rate)
+
+    def acquire(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1 / self.rate(host)
+        if slot > now:
+            time.sleep(slot - now)
+
+    def success(self, host: str) -> None:
+        with self._lock:
+            self._rates[host] = min(self.max_rate, self.rate(host) + self.increase)
+
+    def throttled(self, host: str, retry_after: float | None = None) -> None:
+        with self._lock:
+            self._rates[host] = max(self.min_rate, self.rate(host) * self.decrease)
+            if retry_after:
+                self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + retry_after)
+        logger.warning(f"{host} asked to slow down: now {self._rates[host]:.2f} requests/s")
+
+
+def _retry_after(response) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _fetch(url: str, session: requests.Session, limiter: AdaptiveRateLimiter, cache: HttpCache | None) -> str:
+    """fetch_html under the host's rate limit, feeding the outcome back into the limit."""
+    host = urlsplit(url).netloc
+    limiter.acquire(host)
+    try:
+        html = fetch_html(url, session=session, cache=cache)
+    except Exception as e:
+        cause = e.__cause__
+        response = getattr(cause, "response", None)
+        status = getattr(response, "status_code", None)
+        if status in THROTTLE_STATUSES or isinstance(cause, (requests.Timeout, requests.ConnectionError)):
+            limiter.throttled(host, _retry_after(response))
+        raise
+    limiter.success(host)
+    return html
+
+
+def output_path_for(url: str, output_dir: Path = CRAWL_OUTPUT_DIR) -> Path:
+    """data/raw/crawl/<host>/<url path>.txt"""
+    parts = urlsplit(url)
+    path = parts.path.strip("/") or "index"
+    return Path(output_dir) / parts.netloc / f"{path}.txt"
+
+
+# === CRAWL ===
+def crawl(
+    rules: CrawlRules,
+    frontier_path: Path | str = CRAWL_DB_PATH,
+    output_dir: Path = CRAWL_OUTPUT_DIR,
+    workers: int = CRAWL_WORKERS,
+    limiter: AdaptiveRateLimiter | None = None,
+    max_pages: int | None = None,
+    max_attempts: int = CRAWL_MAX_ATTEMPTS,
+    cache: HttpCache | None = None,
+    store: ArtifactStore | None = None,
+) -> dict:
+    """
+    Crawls until the frontier is empty (or max_pages pages were fetched in this run).
+
+    Pages are downloaded by `workers` threads sharing one pooled session; parsing
+    and every frontier update happen in the calling thread.
+
+    Returns:
+        dict: Pages fetched in this run, page counts by status, and the final rate per host.
+    """
+    limiter = limiter or AdaptiveRateLimiter()
+    frontier = Frontier(frontier_path)
+    frontier.add(list(rules.start_urls), 0)
+    fetched = 0
+
+    try:
+        with create_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+            running: dict[Future, tuple[str, int]] = {}
+            while True:
+                slots = workers - len(running)
+                if max_pages is not None:
+                    slots = min(slots, max_pages - fetched - len(running))
+                if slots > 0:
+                    for url, depth in frontier.claim(slots):
+                        running[pool.submit(_fetch, url, session, limiter, cache)] = (url, depth)
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = running.pop(future)
+                    try:
+                        html = future.result()
+                    except Exception as e:
+                        given_up = frontier.fail(url, str(e), max_attempts)
+                        logger.warning(f"Failed to fetch {url}{' (giving up)' if given_up else ''}: {e}")
+                        continue
+                    fetched += 1
+                    _process_page(url, depth, html, rules, frontier, output_dir, store)
+    finally:
+        counts = frontier.counts()
+        frontier.close()
+
+    report = {
+        "fetched": fetched,
+        "status": counts,
+        "rates": {host: round(limiter.rate(host), 2) for host in rules.hosts},
+    }
+    logger.info(f"Crawl stopped after {fetched} pages: {counts}")
+    return report
+
+
+def _process_page(
+    url: str, depth: int, html: str, rules: CrawlRules, frontier: Frontier, output_dir: Path,
+    store: ArtifactStore | None = None,
+) -> None:
+    if rules.max_depth is None or depth < rules.max_depth:
+        links = [link for link in extract_links(html, url) if rules.should_follow(link)]
+        new = frontier.add(links, depth + 1)
+        if new:
+            logger.info(f"{url}: {new} new links queued")
+
+    paragraphs = parse_book_html(html) if rules.should_extract(url) else []
+    content = "\n\n".join(paragraphs) if paragraphs else html
+    duplicate_of = frontier.complete(url, hashlib.sha256(content.encode("utf-8")).hexdigest(), len(paragraphs))
+
+    if duplicate_of:
+        logger.info(f"{url} has the same content as {duplicate_of}, not saved again")
+    elif paragraphs:
+        save_to_file(paragraphs, output_path_for(url, output_dir), store)
+
+
+# === MAIN ===
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Mirror a section of The Latin Library as text files.")
+    parser.add_argument("--section", help="Author section, e.g. 'kempis' or 'cicero' (sets start/follow/extract)")
+    parser.add_argument("--start", nargs="+", default=[], help="Start URLs")
+    parser.add_argument("--follow", nargs="+", default=[], help="Regexes of links to follow")
+    parser.add_argument("--extract", nargs="+", default=[], help="Regexes of pages to save (default: all followed)")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--max-pages", type=int, default=None, help="Stop after this many pages (resume later)")
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS)
+    parser.add_argument("--db", type=Path, default=CRAWL_DB_PATH, help="Frontier database")
+    parser.add_argument("--output-dir", type=Path, default=CRAWL_OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.section:
+        rules = CrawlRules.for_section(args.section)
+        rules = CrawlRules(
+            rules.start_urls + tuple(args.start), rules.follow + tuple(args.follow),
+            rules.extract + tuple(args.extract), args.max_depth,
+        )
+    elif args.start and args.follow:
+        rules = CrawlRules(tuple(args.start), tuple(args.follow), tuple(args.extract), args.max_depth)
+    else:
+        parser.error("give --section, or --start and --follow")
+
+    report = crawl(rules, args.db, args.output_dir, args.workers, max_pages=args.max_pages)
+    print(f"✅ {report['fetched']} pages fetched. Frontier: {report['status']}")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
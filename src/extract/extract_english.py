@@ -4,6 +4,7 @@ The Imitation of Christ from Project Gutenberg,
 and saves it as one paragraph per line in:
 
 raw_data/raw_english_kempis.txt
+(stored compressed in the artifact store, see src/artifacts.py)
 
 - Source: https://www.gutenberg.org/cache/epub/1653/pg1653-images.html
 - Output format: Plain text, UTF-8 encoded
@@ -15,18 +16,22 @@ Usage:
 """
 
 
-from src.config import ENGLISH_URL, ENGLISH_RAW_FILE, RAW_DATA_DIR
+from src.config import (
+    ENGLISH_URL,
+    ENGLISH_RAW_FILE,
+    RAW_DATA_DIR,
+    HTTP_CACHE_ENABLED,
+    HTML_PARSER_BACKEND,
+)
+from src import metrics
+from src.artifacts import ArtifactStore
+from src.extract.http_cache import HttpCache
+from src.extract.html_stream import iter_paragraphs
 
 import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
 # Ensure the raw_data directory exists
 
 def ensure_folder_exists(path: Path):
@@ -57,11 +62,13 @@ def ensure_folder_exists(path: Path):
 
 # Fetch HTML content
 
-def fetch_html(url:str) -> str:
+def fetch_html(url:str, cache: HttpCache | None = None) -> str:
     """
     Fetches the HTML content of the given URL with fallback for SSL errors.
     Args:
         url (str): The URL to fetch
+        cache (HttpCache | None): Optional on-disk cache. When given, fresh copies are
+            served from disk and stale ones are revalidated with a conditional request.
     Returns:
         str: The HTML content as a UTF-8 encoded string
     Raises:
@@ -69,75 +76,120 @@ def fetch_html(url:str) -> str:
     """
     logging.info(f"Fetching HTML content from: {url}")
 
+    with metrics.fetch_timer(url) as fetch:
+
+        def get(headers: dict | None = None) -> requests.Response:
+            response = _get(url, headers)
+            fetch["network"] = True
+            fetch["bytes"] = metrics.response_bytes(response)
+            return response
+
+        if cache is not None:
+            return cache.fetch(url, get)
+
+        response = get()
+        logging.info("HTML successfully fetched.")
+        return response.text
+
+def _get(url: str, headers: dict | None = None) -> requests.Response:
+    """Performs the GET request for fetch_html, retrying without SSL verification if needed."""
+    extra = {"headers": headers} if headers else {}
+
     try:
-        response = requests.get(url, timeout=10)  # Default with SSL verification
+        response = requests.get(url, timeout=10, **extra)  # Default with SSL verification
         response.raise_for_status()
     except requests.exceptions.SSLError:
         logging.warning("SSL verification failed. Retrying without SSL verification...")
-        response = requests.get(url, verify=False, timeout=10)
+        response = requests.get(url, verify=False, timeout=10, **extra)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to fetch page: {e}")
 
     response.encoding = "utf-8"
-    logging.info("HTML successfully fetched.")
-    return response.text
+    return response
 
 # Extract clean paragraphs
 
-def extract_text_from_html(html: str) -> list[str]:
+# Tags holding the text, and markers of Gutenberg boilerplate to drop
+TEXT_TAGS = ("p", "h1", "h2", "h3")
+BOILERPLATE_MARKERS = ("Gutenberg", "***")
+
+def extract_text_from_html(
+    html: str,
+    backend: str = HTML_PARSER_BACKEND,
+    tags: tuple[str, ...] = TEXT_TAGS,
+    exclude: tuple[str, ...] = BOILERPLATE_MARKERS,
+) -> list[str]:
     """
     Parses HTML content and extracts clean text from p, h1, h2 and h3 tags.
     Filters out boilerplate content such as Gutenberg notices and decorative markers.
     Args:
         html (str): The full HTML content
+        backend (str): "stream" for the single-pass html.parser extractor,
+            "bs4" for the BeautifulSoup tree. Both return the same paragraphs.
+        tags (tuple[str, ...]): Tags whose text is extracted.
+        exclude (tuple[str, ...]): Paragraphs containing any of these markers are dropped.
     Returns:
         List[str]: A list of cleaned paragraph strings
     """
+    logging.info("Extracting meaningful text from HTML...")
+
+    if backend == "stream":
+        text_parts = list(iter_paragraphs(
+            html, tags=tags, separator=" ", within="body", exclude=exclude
+        ))
+    elif backend == "bs4":
+        text_parts = _extract_text_bs4(html, tags, exclude)
+    else:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    logging.info(f"Extracted {len(text_parts)} paragraphs.")
+
+    return text_parts
+
+def _extract_text_bs4(html: str, tags: tuple[str, ...], exclude: tuple[str, ...]) -> list[str]:
+    """BeautifulSoup implementation of extract_text_from_html."""
+    from bs4 import BeautifulSoup  # only this backend needs it
+
     soup = BeautifulSoup(html, "html.parser")
     body = soup.find("body")
 
     if not body:
         raise Exception("Body tag not found in HTML.")
-    
-    logging.info("Extracting meaningful text from HTML...")
 
     text_parts = []
-    for tag in body.find_all(["p","h1","h2","h3"]):
+    for tag in body.find_all(list(tags)):
         text = tag.get_text(separator=" ", strip=True)
 
-        if not text or "Gutenberg" in text or "***" in text:
+        if not text or any(marker in text for marker in exclude):
             continue
 
         text_parts.append(text)
 
-    logging.info(f"Extracted {len(text_parts)} paragraphs.")
-
     return text_parts
 
 # Save content to .txt file
 
-def save_to_file(paragraphs: list, output_path: Path):
+def save_to_file(paragraphs: list, output_path: Path, store: ArtifactStore | None = None):
     """
-    Writes a list of text paragraphs to a file, one paragraph per line.
+    Stores a list of text paragraphs as output_path, one paragraph per line.
 
-    Each paragraph is written on a separate line using UTF-8 encoding to ensure
-    compatibility across systems and languages.
+    The text goes into the artifact store (see src/artifacts.py) compressed and
+    named after its content hash; content already stored is not written again.
 
     Args:
         paragraphs (List[str]): A list of cleaned text paragraphs to write.
         output_path (Path): A pathlib.Path object representing the output file location.
+        store (ArtifactStore | None): The store to write to (default: ARTIFACT_STORE_DIR).
 
     Raises:
         Exception: If the file cannot be written to the specified path.
     """
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            for paragraph in paragraphs:
-                f.write(paragraph + "\n")
-        logging.info(f"Saved {len(paragraphs)} paragraphs to {output_path}")
+        (store or ArtifactStore()).write_paragraphs(output_path, paragraphs, "\n")
     except Exception as e:
         logging.error(f"Failed to save file to {output_path}: {e}", exc_info=True)
+        raise
 
 
 # Main workflow
@@ -146,22 +198,29 @@ def main():
 
     try:
         ensure_folder_exists(RAW_DATA_DIR)
-        html = fetch_html(ENGLISH_URL)
+        cache = HttpCache.from_config() if HTTP_CACHE_ENABLED else None
+        html = fetch_html(ENGLISH_URL, cache=cache)
         paragraphs = extract_text_from_html(html)
         save_to_file(paragraphs, ENGLISH_RAW_FILE)
+        return len(paragraphs)
     
     except Exception as e:
         logging.error(f"An eror occurres during execution: {e}", exc_info=True)
+        raise   # the extract_english stage must fail, not pass on the previous raw file
 
 # Defines a callable function that can be imported from run_pipeline.py
 
 def run_english_extraction():
     logging.info(" Running English extraction...")
-    main()
+    return main()
 
 # Run the script
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
     logging.info("Starting extraction process...")
     main()
 
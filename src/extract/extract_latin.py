@@ -6,9 +6,13 @@ This script extracts the Latin text of *The Imitation of Christ* from The Latin
 
 1. Fetches the main index page containing links to the four books.
 2. Parses and collects all paragraph texts from each linked subpage.
+   Each parsed subpage is checkpointed (see checkpoints.py), so a rerun after a
+   failure only fetches the pages that are still missing.
 3. Cleans the extracted content by removing empty lines and boilerplate text.
-4. Saves the final result as one paragraph per block to:
+4. Once every page is present, saves the final result as one paragraph per block to:
        raw_data/raw_latin_kempis.txt
+   (stored compressed in the artifact store, see src/artifacts.py; the ref is
+   replaced only once the content is complete, never left half-written)
 
 - Total expected paragraphs: ~674
 - Output encoding: UTF-8
@@ -20,15 +24,29 @@ Usage:
 """
 
 
-from src.config import LATIN_RAW_FILE, LATIN_URL, RAW_DATA_DIR, BASE_LATIN_URL
+from src.config import (
+    LATIN_RAW_FILE,
+    LATIN_URL,
+    RAW_DATA_DIR,
+    BASE_LATIN_URL,
+    LATIN_FETCH_WORKERS,
+    HTTP_CACHE_ENABLED,
+    HTML_PARSER_BACKEND,
+    LATIN_CHECKPOINT_DIR,
+)
+from src import metrics
+from src.artifacts import ArtifactStore
+from src.extract.checkpoints import IncompleteExtractionError, PageCheckpoints
+from src.extract.http_cache import HttpCache
+from src.extract.html_stream import iter_paragraphs
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from pathlib import Path
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
 
 def ensure_folder_exists(path: Path):
     """
@@ -56,12 +74,37 @@ def ensure_folder_exists(path: Path):
         logging.error(f"Failed to create folder {path}:{e}", exc_info=True)
         raise
 
-def fetch_html(url: str) -> str:
+def create_session(pool_size: int = 1) -> requests.Session:
+    """
+    Creates a requests Session whose connection pool can serve `pool_size` workers.
+
+    Reusing one session keeps the TCP/TLS connection to The Latin Library alive
+    between subpage requests instead of opening a new one per page.
+
+    Args:
+        pool_size (int): Maximum number of connections kept open per host.
+
+    Returns:
+        requests.Session: A session ready to be shared by fetch_html calls.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_html(
+    url: str, session: requests.Session | None = None, cache: HttpCache | None = None
+) -> str:
     """
     Fetches the HTML content from the given URL with proper error handling.
 
     Args:
         url (str): The URL of the index page.
+        session (requests.Session | None): Optional session used to reuse
+            connections across calls. Falls back to a one-off request.
+        cache (HttpCache | None): Optional on-disk cache. When given, fresh copies are
+            served from disk and stale ones are revalidated with a conditional request.
 
     Returns:
         str: The UTF-8 encoded HTML content.
@@ -71,26 +114,51 @@ def fetch_html(url: str) -> str:
     """
     logging.info(f"Fetching HTML content from: {url}")
 
+    with metrics.fetch_timer(url) as fetch:
+
+        def get(extra_headers: dict | None = None) -> requests.Response:
+            response = _get(url, session, extra_headers)
+            fetch["network"] = True
+            fetch["bytes"] = metrics.response_bytes(response)
+            return response
+
+        if cache is not None:
+            return cache.fetch(url, get)
+
+        return get().text
+
+def _get(
+    url: str, session: requests.Session | None = None, extra_headers: dict | None = None
+) -> requests.Response:
+    """Performs the GET request for fetch_html with the browser User-Agent."""
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/115.0.0.0 Safari/537.36"
-        )
+        ),
+        **(extra_headers or {}),
     }
     try:
         # Waits for 10 secs before raising an error if the server is unresponsive
-        response = requests.get(url, timeout=10, headers=headers)
+        getter = session.get if session is not None else requests.get
+        response = getter(url, timeout=10, headers=headers)
         response.raise_for_status()
         response.encoding = "utf-8" 
-        html_content = response.text  # HTML body as string
-        return html_content
+        return response
         
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching {url}: {e}", exc_info=True)
         raise Exception(f"Failed to fetch page: {url}") from e
 
-def extract_book_links(index_html: str) -> list[str]:
+# Book subpage links on the index page, and the site footer to drop
+BOOK_LINK_PREFIX = "kempis/kempis"
+BOOK_LINK_SUFFIX = ".shtml"
+BOILERPLATE_MARKERS = ("LATIN LIBRARY",)
+
+def extract_book_links(
+    index_html: str, prefix: str = BOOK_LINK_PREFIX, suffix: str = BOOK_LINK_SUFFIX
+) -> list[str]:
     """
     Extracts the relative URLs of book subpages from index HTLM
     Parses the HTML of the main index page and filters anchor tags 
@@ -98,6 +166,8 @@ def extract_book_links(index_html: str) -> list[str]:
 
     Args:
         index_html (str): The raw HTML content of the index page.
+        prefix (str): Required start of a book link (e.g. "kempis/kempis").
+        suffix (str): Required end of a book link (e.g. ".shtml").
 
     Returns:
         list[str]: A list of relative URL strings pointing to the individual book pages.
@@ -106,12 +176,17 @@ def extract_book_links(index_html: str) -> list[str]:
     soup = BeautifulSoup(index_html, "html.parser")
     book_links = [
         a["href"] for a in soup.find_all("a", href=True)
-        if a["href"].startswith("kempis/kempis") and a["href"].endswith(".shtml")
+        if a["href"].startswith(prefix) and a["href"].endswith(suffix)
     ]
     logging.info(f"Found {len(book_links)} book links.")
     return book_links
 
-def fetch_book_html(base_url: str, relative_path: str) -> str:
+def fetch_book_html(
+    base_url: str,
+    relative_path: str,
+    session: requests.Session | None = None,
+    cache: HttpCache | None = None,
+) -> str:
     """
     Fetches the HTML content of an individual book page.
 
@@ -122,6 +197,8 @@ def fetch_book_html(base_url: str, relative_path: str) -> str:
     Args:
         base_url (str): The root URL of the site (e.g., https://www.thelatinlibrary.com).
         relative_path (str): The relative path to the specific book page.
+        session (requests.Session | None): Optional shared session for connection reuse.
+        cache (HttpCache | None): Optional on-disk response cache.
 
     Returns:
         str: The HTML content of the book page, or an empty string if fetching failed.
@@ -130,12 +207,16 @@ def fetch_book_html(base_url: str, relative_path: str) -> str:
     full_url = f"{base_url}/{relative_path}"
     logging.info(f"Fetching: {full_url}")
     try:
-        return fetch_html(full_url)
+        return fetch_html(full_url, session=session, cache=cache)
     except Exception as e:
         logging.warning(f"Failed to fetch {full_url}: {e}")
         return ""  # Return empty string to skip
 
-def parse_book_html(html: str) -> list[str]:
+def parse_book_html(
+    html: str,
+    backend: str = HTML_PARSER_BACKEND,
+    exclude: tuple[str, ...] = BOILERPLATE_MARKERS,
+) -> list[str]:
     """
     Parses the HTML content of a book page and extracts clean text paragraphs.
 
@@ -145,6 +226,9 @@ def parse_book_html(html: str) -> list[str]:
 
     Args:
         html (str): The raw HTML content of the book page.
+        backend (str): "stream" for the single-pass html.parser extractor,
+            "bs4" for the BeautifulSoup tree. Both return the same paragraphs.
+        exclude (tuple[str, ...]): Paragraphs containing any of these markers are dropped.
 
     Returns:
         list[str]: A list of cleaned paragraph strings extracted from the HTML.
@@ -152,18 +236,32 @@ def parse_book_html(html: str) -> list[str]:
     if not html:
         return []
 
+    if backend == "stream":
+        return list(iter_paragraphs(html, tags=("p",), exclude=exclude))
+    if backend != "bs4":
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
     soup = BeautifulSoup(html, "html.parser")
     paragraphs = []
 
     for p in soup.find_all("p"):
         text = p.get_text(strip=True)
-        if "LATIN LIBRARY" in text or not text:
+        if not text or any(marker in text for marker in exclude):
             continue
         paragraphs.append(text)
 
     return paragraphs
 
-def extract_all_paragraphs(index_html: str, base_url: str) -> list[str]:
+def extract_all_paragraphs(
+    index_html: str,
+    base_url: str,
+    max_workers: int = 1,
+    cache: HttpCache | None = None,
+    link_prefix: str = BOOK_LINK_PREFIX,
+    link_suffix: str = BOOK_LINK_SUFFIX,
+    exclude: tuple[str, ...] = BOILERPLATE_MARKERS,
+    checkpoints: PageCheckpoints | None = None,
+) -> list[str]:
     """
     Extracts and aggregates all clean text paragraphs from all book subpages.
 
@@ -171,68 +269,129 @@ def extract_all_paragraphs(index_html: str, base_url: str) -> list[str]:
     HTML content, parses the content to extract valid <p> tag text, and collects all 
     paragraphs into a single list.
 
+    With `max_workers > 1` the subpages are downloaded by a bounded thread pool
+    sharing one pooled session. Results are consumed in link order, so the book
+    order of the output is stable, and each page is parsed while the remaining
+    downloads are still in flight.
+
     Args:
         index_html (str): The raw HTML content of the main index page.
         base_url (str): The root URL used to construct full paths to the book pages.
+        max_workers (int): Maximum number of concurrent subpage downloads.
+            1 keeps the original sequential behaviour.
+        cache (HttpCache | None): Optional on-disk cache used for every subpage.
+        link_prefix (str), link_suffix (str): Pattern of the book links on the index page.
+        exclude (tuple[str, ...]): Boilerplate markers passed to parse_book_html.
+        checkpoints (PageCheckpoints | None): When given, pages already checkpointed are
+            not fetched again, each newly parsed page is checkpointed, and a page that
+            failed (no paragraphs) raises IncompleteExtractionError instead of being skipped.
 
     Returns:
         list[str]: A list of all cleaned text paragraphs extracted from all book pages.
-    """
-    all_paragraphs = []
-    book_links = extract_book_links(index_html)
-
-    for relative_link in book_links:
-        book_html = fetch_book_html(base_url, relative_link)
-        paragraphs = parse_book_html(book_html)
-        all_paragraphs.extend(paragraphs)
 
+    Raises:
+        IncompleteExtractionError: With checkpoints, if any page is still missing.
+    """
+    book_links = extract_book_links(index_html, prefix=link_prefix, suffix=link_suffix)
+    pages: dict[str, list[str]] = {}
+    if checkpoints is not None:
+        for relative_link in book_links:
+            stored = checkpoints.load(f"{base_url}/{relative_link}")
+            if stored is not None:
+                pages[relative_link] = stored
+        if pages:
+            logging.info(f"Resuming: {len(pages)} of {len(book_links)} book pages read from checkpoints.")
+    to_fetch = [link for link in book_links if link not in pages]
+
+    def collect(relative_link: str, book_html: str) -> None:
+        paragraphs = parse_book_html(book_html, exclude=exclude)
+        pages[relative_link] = paragraphs
+        if checkpoints is not None and paragraphs:
+            checkpoints.save(f"{base_url}/{relative_link}", paragraphs)
+
+    if max_workers <= 1 or len(to_fetch) <= 1:
+        for relative_link in to_fetch:
+            collect(relative_link, fetch_book_html(base_url, relative_link, cache=cache))
+    else:
+        workers = min(max_workers, len(to_fetch))
+        logging.info(f"Fetching {len(to_fetch)} book pages with {workers} workers...")
+        with create_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each task runs in a copy of this context so its fetches are attributed to the current stage
+            futures = [
+                pool.submit(copy_context().run, fetch_book_html, base_url, relative_link, session, cache)
+                for relative_link in to_fetch
+            ]
+            # Iterate in submission order: parsing page N overlaps with downloads N+1..
+            for relative_link, future in zip(to_fetch, futures):
+                collect(relative_link, future.result())
+
+    if checkpoints is not None:
+        # A page that failed to download (or parsed to nothing) is not skipped: stop before assembling
+        missing = [f"{base_url}/{link}" for link in book_links if not pages[link]]
+        if missing:
+            raise IncompleteExtractionError(missing)
+
+    all_paragraphs = [paragraph for link in book_links for paragraph in pages[link]]
     logging.info(f"Total paragraphs collected: {len(all_paragraphs)}")
     return all_paragraphs
 
-def save_to_file(paragraphs: list[str], output_path: Path) -> None:
+def save_to_file(paragraphs: list[str], output_path: Path, store: ArtifactStore | None = None) -> None:
     """
-    Writes a list of text paragraphs to a file, one paragraph per line.
+    Stores a list of text paragraphs as output_path, separated by blank lines.
 
-    Each paragraph is written on a separate line using UTF-8 encoding to ensure
-    compatibility across systems and languages.
+    The text goes into the artifact store (see src/artifacts.py): compressed,
+    named after its content hash, with output_path.ref pointing at it. Content
+    already stored from an earlier run is not written again. The ref is only
+    replaced once the new content is complete.
 
     Args:
         paragraphs (List[str]): A list of cleaned text paragraphs to write.
         output_path (Path): A pathlib.Path object representing the output file location.
+        store (ArtifactStore | None): The store to write to (default: ARTIFACT_STORE_DIR).
 
     Raises:
         Exception: If the file cannot be written to the specified path.
     """
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            for paragraph in paragraphs:
-                f.write(paragraph + "\n\n")
-        logging.info(f"Saved {len(paragraphs)} paragraphs to {output_path}")
+        (store or ArtifactStore()).write_paragraphs(output_path, paragraphs, "\n\n")
     except Exception as e:
         logging.error(f"Failed to save file to {output_path}: {e}", exc_info=True)
         raise
 
-def main() -> None:
+def main() -> int | None:
 
     try:
         logging.info("Starting extraction process...")
         ensure_folder_exists(RAW_DATA_DIR)
 
-        index_html = fetch_html(LATIN_URL)
-        paragraphs = extract_all_paragraphs(index_html, base_url=BASE_LATIN_URL)
+        cache = HttpCache.from_config() if HTTP_CACHE_ENABLED else None
+        checkpoints = PageCheckpoints(LATIN_CHECKPOINT_DIR)
+        index_html = fetch_html(LATIN_URL, cache=cache)
+        paragraphs = extract_all_paragraphs(
+            index_html,
+            base_url=BASE_LATIN_URL,
+            max_workers=LATIN_FETCH_WORKERS,
+            cache=cache,
+            checkpoints=checkpoints,
+        )
         save_to_file(paragraphs, LATIN_RAW_FILE)
+        checkpoints.clear()
 
         logging.info("Extraction completed successfully.")
+        return len(paragraphs)
     
     except Exception as e:
         logging.error(f"An eror occurred during execution: {e}", exc_info=True)
+        raise   # the extract_latin stage must fail, not pass on the previous raw file
 
 # Defines a callable function that can be imported from run_pipeline.py
 
 def run_latin_extraction():
     logging.info(" Running Latin extraction...")
-    main()
+    return main()
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     main()
 
@@ -0,0 +1,185 @@
+"""
+html_stream.py
+
+Event-driven, single-pass paragraph extractor built on the standard library
+`html.parser.HTMLParser`.
+
+It reproduces what the BeautifulSoup code in the extract scripts does:
+
+    soup.find_all(tags) → tag.get_text(separator=..., strip=True) → filter
+
+without ever building a document tree. Text is accumulated only for the tags
+being extracted, and each paragraph is yielded as soon as its closing tag is
+seen, so memory stays proportional to the largest paragraph rather than to
+the whole page.
+
+The input can be a full HTML string or any iterable of string chunks (for
+example a streamed HTTP response), which are fed to the parser incrementally.
+"""
+
+from html.parser import HTMLParser
+from typing import Iterable, Iterator
+
+# Elements that never have content (mirrors BeautifulSoup's HTML tree builder)
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+    "menuitem", "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+    "command", "frame", "image", "isindex", "nextid", "spacer",
+})
+
+# Elements whose text BeautifulSoup excludes from get_text()
+NON_TEXT_ELEMENTS = frozenset({"script", "style", "template"})
+
+
+class ParagraphParser(HTMLParser):
+    """
+    Collects the text of selected tags as the document is fed.
+
+    Args:
+        tags (Iterable[str]): Tag names whose text is extracted (e.g. p, h1).
+        separator (str): String used to join the text fragments of one tag,
+            as in BeautifulSoup's get_text(separator=...).
+        within (str | None): Only extract tags nested inside this element (e.g. "body").
+    """
+
+    def __init__(self, tags: Iterable[str], separator: str = "", within: str | None = None):
+        super().__init__(convert_charrefs=True)
+        self.tags = frozenset(tags)
+        self.separator = separator
+        self.within = within
+        self.saw_within = within is None
+
+        self._stack: list[tuple[str, list[str] | None]] = []  # open (non-void) elements
+        self._records: list[list[str]] = []   # text fragments per extracted tag, in start order
+        self._open: list[list[str]] = []      # records whose tag is still open
+        self._pending: list[str] = []         # text of the current text node
+        self._ready: list[str] = []           # finished paragraphs not yet consumed
+        self._within_depth = 0
+        self._skip_depth = 0
+
+    # --- text nodes --------------------------------------------------------
+
+    def _flush_text(self) -> None:
+        """Ends the current text node and hands its stripped text to every open record."""
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending.clear()
+        if text:
+            for record in self._open:
+                record.append(text)
+
+    def handle_data(self, data: str) -> None:
+        if self._open and not self._skip_depth:
+            self._pending.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_text()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush_text()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush_text()
+        if data.startswith("CDATA[") and self._open and not self._skip_depth:
+            self._pending.append(data[len("CDATA["):])
+            self._flush_text()
+
+    # --- elements ----------------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush_text()
+        if tag in VOID_ELEMENTS:
+            return
+
+        if tag == self.within:
+            self._within_depth += 1
+            self.saw_within = True
+        if tag in NON_TEXT_ELEMENTS:
+            self._skip_depth += 1
+
+        record = None
+        if tag in self.tags and (self.within is None or self._within_depth):
+            record = []
+            self._records.append(record)
+            self._open.append(record)
+        self._stack.append((tag, record))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_text()
+        # Like BeautifulSoup, an end tag closes every element opened after
+        # the matching start tag; an unmatched end tag is ignored.
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                while len(self._stack) > depth:
+                    self._close(*self._stack.pop())
+                return
+
+    def _close(self, tag: str, record: list[str] | None) -> None:
+        if tag == self.within:
+            self._within_depth -= 1
+        if tag in NON_TEXT_ELEMENTS:
+            self._skip_depth -= 1
+        if record is not None:
+            self._open.pop()  # Elements close innermost first, so this is `record`
+            if not self._open:
+                # Outermost extracted tag closed: emit in document (start tag) order
+                self._ready.extend(self.separator.join(parts) for parts in self._records)
+                self._records.clear()
+
+    def close(self) -> None:
+        super().close()
+        self._flush_text()
+        while self._stack:
+            self._close(*self._stack.pop())
+
+    def pop_ready(self) -> list[str]:
+        """Returns and clears the paragraphs completed so far."""
+        ready, self._ready = self._ready, []
+        return ready
+
+
+def iter_paragraphs(
+    source: str | Iterable[str],
+    tags: Iterable[str] = ("p",),
+    separator: str = "",
+    within: str | None = None,
+    exclude: Iterable[str] = (),
+) -> Iterator[str]:
+    """
+    Yields the non-empty text of each selected tag, in one pass over the HTML.
+
+    Args:
+        source (str | Iterable[str]): The HTML document, or an iterable of chunks of it.
+        tags (Iterable[str]): Tag names to extract.
+        separator (str): Joiner for the text fragments inside one tag.
+        within (str | None): Restrict extraction to tags inside this element.
+        exclude (Iterable[str]): Paragraphs containing any of these substrings are skipped.
+
+    Yields:
+        str: Clean paragraph strings in document order.
+
+    Raises:
+        Exception: If `within` is given and that element never appears in the document.
+    """
+    parser = ParagraphParser(tags, separator=separator, within=within)
+    exclude = tuple(exclude)
+    chunks = [source] if isinstance(source, str) else source
+
+    def accepted(paragraphs: list[str]) -> Iterator[str]:
+        for text in paragraphs:
+            if text and not any(marker in text for marker in exclude):
+                yield text
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from accepted(parser.pop_ready())
+
+    parser.close()
+    yield from accepted(parser.pop_ready())
+
+    if not parser.saw_within:
+        raise Exception(f"{within.capitalize()} tag not found in HTML.")
@@ -0,0 +1,188 @@
+"""
+http_cache.py
+
+On-disk HTTP response cache shared by the extract scripts.
+
+Each cached URL is stored under `HTTP_CACHE_DIR` as two files named after the
+SHA-256 of the URL:
+
+- `<key>.body`: the decoded UTF-8 page
+- `<key>.json`: metadata (url, ETag, Last-Modified, fetch time, size)
+
+Lookup policy:
+
+1. Entry younger than the TTL → served from disk, no network at all.
+2. Older entry → conditional request (If-None-Match / If-Modified-Since).
+   A 304 refreshes the entry and serves the body from disk.
+3. Offline mode → always served from disk; a missing entry is an error.
+
+The cache is bounded by size: when the total body size exceeds `max_bytes`,
+the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.config import (
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_TTL_SECONDS,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_OFFLINE,
+)
+
+
+class HttpCache:
+    """
+    Persistent, size-bounded response cache keyed by URL.
+
+    Args:
+        cache_dir (Path): Directory holding the cached bodies and metadata.
+        ttl_seconds (float): Age under which an entry is served without revalidation.
+        max_bytes (int): Upper bound for the total size of cached bodies.
+        offline (bool): Never touch the network; serve from disk or fail.
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float, max_bytes: int, offline: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "HttpCache":
+        """Builds a cache from the settings in config.py."""
+        return cls(HTTP_CACHE_DIR, HTTP_CACHE_TTL_SECONDS, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_OFFLINE)
+
+    # --- paths -------------------------------------------------------------
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    # --- public API --------------------------------------------------------
+
+    def fetch(self, url: str, getter: Callable[[dict], object]) -> str:
+        """
+        Returns the body of `url`, using the network only when needed.
+
+        Args:
+            url (str): The URL to fetch.
+            getter (Callable[[dict], Response]): Performs the HTTP GET with the given
+                extra headers and returns a requests-like response (status_code, text, headers).
+                It is expected to raise on network errors and 4xx/5xx statuses.
+
+        Returns:
+            str: The page body.
+
+        Raises:
+            Exception: In offline mode when the URL is not cached, or when the request
+                fails and there is no cached copy to fall back to.
+        """
+        meta = self._read_meta(url)
+
+        if self.offline:
+            if meta is None:
+                raise Exception(f"Offline mode: no cached copy of {url}")
+            logging.info(f"Offline mode: serving {url} from cache")
+            return self._read_body(url)
+
+        if meta is not None and time.time() - meta["fetched_at"] < self.ttl_seconds:
+            logging.info(f"Cache hit (fresh): {url}")
+            return self._read_body(url)
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = getter(headers)
+        except Exception:
+            if meta is None:
+                raise
+            logging.warning(f"Request failed, serving stale cached copy of {url}", exc_info=True)
+            return self._read_body(url)
+
+        if response.status_code == 304 and meta is not None:
+            logging.info(f"Cache revalidated (304 Not Modified): {url}")
+            meta["fetched_at"] = time.time()
+            self._write_meta(url, meta)
+            return self._read_body(url)
+
+        text = response.text
+        self._store(url, text, response.headers)
+        return text
+
+    def clear(self) -> None:
+        """Removes every cached entry."""
+        with self._lock:
+            for path in self.cache_dir.glob("*.*"):
+                path.unlink(missing_ok=True)
+
+    # --- storage -----------------------------------------------------------
+
+    def _read_meta(self, url: str) -> dict | None:
+        body_path, meta_path = self._paths(url)
+        if not (body_path.exists() and meta_path.exists()):
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logging.warning(f"Ignoring corrupt cache metadata: {meta_path}")
+            return None
+
+    def _read_body(self, url: str) -> str:
+        body_path, _ = self._paths(url)
+        os.utime(body_path)  # Mark as recently used for LRU eviction
+        return body_path.read_text(encoding="utf-8")
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        _, meta_path = self._paths(url)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _store(self, url: str, text: str, headers) -> None:
+        body = text.encode("utf-8")
+        if len(body) > self.max_bytes:
+            logging.info(f"Not caching {url}: {len(body)} bytes exceeds the cache size limit")
+            return
+
+        body_path, _ = self._paths(url)
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(body_path, body)
+            self._write_meta(url, {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "size": len(body),
+            })
+            self._evict()
+
+    def _evict(self) -> None:
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        bodies = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.cache_dir.glob("*.body")]
+        total = sum(size for _, size, _ in bodies)
+
+        for _, size, body_path in sorted(bodies):
+            if total <= self.max_bytes:
+                break
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            logging.info(f"Evicted cached page: {body_path.name}")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,298 @@
+"""
+load_to_sql.py
+
+Load stage: bulk-loads the cleaned paragraph fact table into the `imitation`
+table described in archives/sql/schema.md.
+
+- Rows are inserted with executemany in large batches inside a single
+  transaction (never row-at-a-time round-trips).
+- Secondary indexes are dropped before the insert and built once afterwards,
+  matching the access patterns of archives/sql/sample_queries.md.
+- Reloads are idempotent: the table is emptied and refilled in the same
+  transaction, so a failed load leaves the previous data untouched.
+- Word counts (and chapter numbers, for fact tables without them) come from
+  transform/text_stats.py, and its per-book and per-chapter aggregates are
+  loaded as small summary tables (imitation_book_stats, imitation_chapter_stats)
+  in the same transaction, with the chapter dimension of transform/chapters.py
+  (imitation_chapters).
+
+The database is reached through the LoadBackend interface. SQLiteBackend is
+the local stand-in; a Postgres backend only has to implement the same methods
+(e.g. with psycopg's COPY for bulk_insert).
+
+Usage:
+        python -m src.load.load_to_sql [--db data/imitation.sqlite] [--batch-size 10000]
+"""
+
+import argparse
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from src.config import OUTPUT_PATH, SQLITE_DB_PATH, LOAD_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "imitation"
+
+# Column order of the `imitation` table (schema.md, plus the paragraph number)
+COLUMNS = [
+    "id",
+    "book",
+    "book_number",
+    "chapter_number",
+    "chapter_id",
+    "paragraph_number",
+    "latin_text",
+    "english_text",
+    "latin_word_count",
+    "english_word_count",
+]
+
+CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+    id INTEGER PRIMARY KEY,
+    book TEXT,
+    book_number INTEGER,
+    chapter_number INTEGER,
+    chapter_id TEXT,
+    paragraph_number INTEGER,
+    latin_text TEXT,
+    english_text TEXT,
+    latin_word_count INTEGER,
+    english_word_count INTEGER
+)
+"""
+
+# Index name → indexed columns/expressions, one per sample query access pattern.
+# Expressions are wrapped in parentheses, which both SQLite and Postgres accept.
+INDEXES = {
+    # Query 1: ROW_NUMBER() OVER (PARTITION BY book_number ORDER BY chapter_number, id)
+    "idx_imitation_book_chapter": "book_number, chapter_number, id",
+    # Query 2: GROUP BY book ORDER BY book
+    "idx_imitation_book": "book",
+    # Query 4: ORDER BY ABS(english_word_count - latin_word_count) DESC LIMIT 10
+    "idx_imitation_word_count_diff": "(ABS(english_word_count - latin_word_count))",
+}
+# Query 3 (latin_text ILIKE '%Christum%') cannot use a B-tree index; it needs a full-text index.
+
+# Summary table → primary key columns. Rebuilt from text_stats (and chapters) on every load.
+SUMMARY_TABLES = {
+    f"{TABLE_NAME}_book_stats": ["book_id"],
+    f"{TABLE_NAME}_chapter_stats": ["book_id", "chapter_number"],
+    f"{TABLE_NAME}_chapters": ["chapter_id"],
+}
+
+
+class LoadBackend(ABC):
+    """Operations the load stage needs from a database. One instance = one connection."""
+
+    @abstractmethod
+    def begin(self) -> None: ...
+
+    @abstractmethod
+    def commit(self) -> None: ...
+
+    @abstractmethod
+    def rollback(self) -> None: ...
+
+    @abstractmethod
+    def execute(self, sql: str) -> None: ...
+
+    @abstractmethod
+    def bulk_insert(self, table: str, columns: list[str], rows: Iterable[tuple], batch_size: int) -> int:
+        """Inserts all rows in batches and returns how many were written."""
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+class SQLiteBackend(LoadBackend):
+    """Local SQLite database (file or ":memory:")."""
+
+    def __init__(self, path: Path | str = SQLITE_DB_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly with begin/commit
+        self.connection = sqlite3.connect(str(path), isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def begin(self) -> None:
+        self.connection.execute("BEGIN")
+
+    def commit(self) -> None:
+        self.connection.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+
+    def execute(self, sql: str) -> None:
+        self.connection.execute(sql)
+
+    def bulk_insert(self, table: str, columns: list[str], rows: Iterable[tuple], batch_size: int) -> int:
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        total = 0
+        for batch in _batches(rows, batch_size):
+            self.connection.executemany(sql, batch)
+            total += len(batch)
+        return total
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def to_table_rows(fact_table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Maps the cleaned fact table onto the columns of the `imitation` table.
+
+    Word counts and chapter numbers missing from the fact table are taken from
+    its text statistics; any other missing column is loaded as NULL.
+    """
+    from src.transform.books import BOOK_NAMES, to_roman
+    from src.transform.text_stats import paragraph_stats
+
+    df = pd.DataFrame(index=fact_table.index)
+    df["id"] = fact_table["id"]
+    df["book_number"] = fact_table["book_id"]
+    df["book"] = fact_table["book_id"].map(lambda n: BOOK_NAMES.get(n, f"Book {to_roman(n)}"))
+
+    stats = None
+    for col in COLUMNS:
+        if col in df.columns:
+            continue
+        if col in fact_table.columns:
+            df[col] = fact_table[col]
+        elif col in ("chapter_number", "latin_word_count", "english_word_count"):
+            stats = paragraph_stats(fact_table) if stats is None else stats
+            df[col] = stats[col]
+        else:
+            df[col] = None
+
+    # Plain Python objects for the DB driver: NaN → None, numpy ints → int
+    return df[COLUMNS].astype(object).where(df[COLUMNS].notna(), None)
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def summary_tables(fact_table: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    The per-book and per-chapter aggregates of text_stats, and the chapter dimension
+    when the fact table is segmented into chapters, by summary table name.
+    """
+    from src.transform.chapters import chapter_table
+    from src.transform.text_stats import book_stats, chapter_stats, paragraph_stats
+
+    stats = paragraph_stats(fact_table)
+    books, chapter_aggregates, chapters = SUMMARY_TABLES
+    tables = {books: book_stats(fact_table, stats), chapter_aggregates: chapter_stats(fact_table, stats)}
+    if "paragraph_in_chapter" in fact_table.columns:
+        tables[chapters] = chapter_table(fact_table)
+    return tables
+
+
+def _replace_summary_table(backend: LoadBackend, name: str, table: pd.DataFrame, batch_size: int) -> int:
+    columns = ", ".join(f"{col} {_sql_type(dtype)}" for col, dtype in table.dtypes.items())
+    backend.execute(f"DROP TABLE IF EXISTS {name}")
+    backend.execute(f"CREATE TABLE {name} ({columns}, PRIMARY KEY ({', '.join(SUMMARY_TABLES[name])}))")
+    rows = table.astype(object).where(table.notna(), None).itertuples(index=False, name=None)
+    return backend.bulk_insert(name, list(table.columns), rows, batch_size)
+
+
+def load_fact_table(
+    fact_table: pd.DataFrame,
+    backend: LoadBackend,
+    batch_size: int = LOAD_BATCH_SIZE,
+) -> dict:
+    """
+    Replaces the contents of the `imitation` table with fact_table in one transaction.
+
+    The summary tables are replaced in the same transaction.
+
+    Returns:
+        dict: rows, insert/index/total seconds, rows_per_second and summary table sizes.
+    """
+    rows = to_table_rows(fact_table)
+    summaries = summary_tables(fact_table)
+    start = time.perf_counter()
+
+    backend.begin()
+    try:
+        backend.execute(CREATE_TABLE_SQL)
+        for name in INDEXES:
+            backend.execute(f"DROP INDEX IF EXISTS {name}")
+        backend.execute(f"DELETE FROM {TABLE_NAME}")
+
+        inserted = backend.bulk_insert(
+            TABLE_NAME, COLUMNS, rows.itertuples(index=False, name=None), batch_size
+        )
+        insert_done = time.perf_counter()
+
+        for name, columns in INDEXES.items():
+            backend.execute(f"CREATE INDEX {name} ON {TABLE_NAME} ({columns})")
+
+        summary_rows = {
+            name: _replace_summary_table(backend, name, table, batch_size) for name, table in summaries.items()
+        }
+        backend.commit()
+    except Exception:
+        backend.rollback()
+        raise
+
+    end = time.perf_counter()
+    report = {
+        "rows": inserted,
+        "insert_seconds": round(insert_done - start, 4),
+        "index_seconds": round(end - insert_done, 4),
+        "total_seconds": round(end - start, 4),
+        "rows_per_second": round(inserted / (insert_done - start)) if insert_done > start else None,
+        "summary_tables": summary_rows,
+    }
+    logger.info(
+        f"Loaded {report['rows']} rows into {TABLE_NAME} in {report['total_seconds']}s "
+        f"({report['rows_per_second']} rows/s insert, indexes built in {report['index_seconds']}s)"
+    )
+    return report
+
+
+def main():
+    from src.transform.enrich_kempis import read_fact_table
+
+    parser = argparse.ArgumentParser(description="Load the cleaned fact table into SQL.")
+    parser.add_argument("--input", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--db", type=Path, default=SQLITE_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=LOAD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    backend = SQLiteBackend(args.db)
+    try:
+        report = load_fact_table(read_fact_table(args.input), backend, args.batch_size)
+    finally:
+        backend.close()
+
+    print(f"✅ {report['rows']} rows loaded into {args.db} "
+          f"in {report['total_seconds']}s ({report['rows_per_second']} rows/s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
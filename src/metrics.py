@@ -0,0 +1,181 @@
+"""
+metrics.py
+
+Run metrics for the pipeline, collected in-process and written as JSON.
+
+- Stages: wall time, rows/paragraphs produced, bytes downloaded by the
+  stage's fetches, peak traced memory (tracemalloc) and peak RSS.
+- Fetches: one record per fetch_html call with URL, wall time, bytes
+  downloaded and whether the body came from the network or the HTTP cache.
+
+Fetches are attributed to the stage that is current in the calling context
+(a contextvar), so threads started by a stage must be given a copy of the
+context (see extract_latin.extract_all_paragraphs).
+
+Memory notes: RSS is the process high-water mark when the stage ended.
+tracemalloc peaks are exact only when stages do not overlap, which is why
+run_pipeline runs stages one at a time when memory tracing is on.
+"""
+
+import contextvars
+import cProfile
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current_stage: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_stage", default=None)
+_lock = threading.Lock()
+_stages: list[dict] = []
+_fetches: list[dict] = []
+
+PROFILE_TOP_FUNCTIONS = 30
+
+
+def reset() -> None:
+    """Forgets every recorded stage and fetch (start of a run)."""
+    with _lock:
+        _stages.clear()
+        _fetches.clear()
+
+
+def current_stage() -> str | None:
+    return _current_stage.get()
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    return round(peak / (1024 * 1024 if peak > 1 << 32 else 1024), 1)
+
+
+# === FETCHES ===
+@contextmanager
+def fetch_timer(url: str) -> Iterator[dict]:
+    """
+    Times one fetch_html call. The caller fills "bytes" (body bytes received from
+    the network) and "network" (False when the cache answered without a request).
+    """
+    record = {"url": url, "stage": current_stage(), "bytes": 0, "network": False, "status": "ok"}
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception:
+        record["status"] = "failed"
+        raise
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 4)
+        with _lock:
+            _fetches.append(record)
+
+
+def response_bytes(response) -> int:
+    """Size of a response body as received (0 for a 304 or a response without content)."""
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+# === STAGES ===
+@contextmanager
+def stage_timer(name: str, trace_memory: bool = False, profile_dir: Path | None = None) -> Iterator[dict]:
+    """
+    Records the metrics of one stage. The caller may set "rows" on the yielded dict.
+
+    Args:
+        name (str): Stage name; fetches made inside are attributed to it.
+        trace_memory (bool): Measure the peak Python allocation with tracemalloc.
+        profile_dir (Path | None): When given, cProfile the stage and write
+            <name>.prof (for pstats/snakeviz) and <name>.txt (top functions) there.
+    """
+    record = {"stage": name, "status": "ok", "rows": None}
+    token = _current_stage.set(name)
+    profiler = cProfile.Profile() if profile_dir is not None else None
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+    except Exception:
+        record["status"] = "failed"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            record["profile"] = str(_write_profile(profiler, Path(profile_dir), name))
+        record["seconds"] = round(time.perf_counter() - start, 4)
+        if trace_memory:
+            record["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        if started_tracing:
+            tracemalloc.stop()   # tracing slows every allocation; leave it on only if someone else started it
+        record["rss_peak_mb"] = peak_rss_mb()
+        _current_stage.reset(token)
+        with _lock:
+            _stages.append(record)
+
+
+def _write_profile(profiler: cProfile.Profile, profile_dir: Path, name: str) -> Path:
+    import io
+    import pstats  # only needed with --profile
+
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / f"{name}.prof"
+    profiler.dump_stats(path)
+
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    (profile_dir / f"{name}.txt").write_text(text.getvalue(), encoding="utf-8")
+    return path
+
+
+# === REPORT ===
+def collect(**run_info) -> dict:
+    """
+    Snapshot of everything recorded so far, with per-stage fetch totals.
+
+    Keyword arguments are stored under "run" (e.g. wall time, options used).
+    """
+    with _lock:
+        stages = [dict(stage) for stage in _stages]
+        fetches = [dict(fetch) for fetch in _fetches]
+
+    for stage in stages:
+        own = [fetch for fetch in fetches if fetch["stage"] == stage["stage"]]
+        stage["fetches"] = len(own)
+        stage["bytes_downloaded"] = sum(fetch["bytes"] for fetch in own)
+
+    return {
+        "run": {"finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **run_info},
+        "stages": stages,
+        "fetches": fetches,
+        "totals": {
+            "fetches": len(fetches),
+            "bytes_downloaded": sum(fetch["bytes"] for fetch in fetches),
+            "fetch_seconds": round(sum(fetch["seconds"] for fetch in fetches), 4),
+            "rss_peak_mb": peak_rss_mb(),
+        },
+    }
+
+
+def write_metrics(report: dict, path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
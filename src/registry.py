@@ -0,0 +1,152 @@
+"""
+registry.py
+
+Source registry for the multi-work corpus mode.
+
+The registry is a JSON manifest (by default data/works.json) that lists every
+bilingual work the pipeline can process: where its English and Latin texts live,
+which parser rules apply to each source, and where outputs are written.
+
+Manifest format:
+
+    {
+      "works": [
+        {
+          "id": "imitation_of_christ",
+          "title": "The Imitation of Christ",
+          "english": {
+            "url": "https://www.gutenberg.org/cache/epub/1653/pg1653-images.html",
+            "tags": ["p", "h1", "h2", "h3"],
+            "exclude": ["Gutenberg", "***"]
+          },
+          "latin": {
+            "index_url": "https://www.thelatinlibrary.com/kempis.html",
+            "base_url": "https://www.thelatinlibrary.com",
+            "link_prefix": "kempis/kempis",
+            "link_suffix": ".shtml",
+            "exclude": ["LATIN LIBRARY"]
+          },
+          "aligned_dir": "data/aligned",
+          "output_dir": "data/corpus/imitation_of_christ"
+        }
+      ]
+    }
+
+`english`, `latin`, `aligned_dir` and `output_dir` are optional. Relative paths
+are resolved against PROJECT_ROOT, and `output_dir` defaults to
+CORPUS_OUTPUT_DIR/<id>.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.config import PROJECT_ROOT, CORPUS_OUTPUT_DIR, WORKS_MANIFEST
+
+
+@dataclass(frozen=True)
+class EnglishSource:
+    """A Gutenberg-style single HTML page."""
+    url: str
+    tags: tuple[str, ...] = ("p", "h1", "h2", "h3")
+    exclude: tuple[str, ...] = ("Gutenberg", "***")
+
+
+@dataclass(frozen=True)
+class LatinSource:
+    """A Latin Library-style index page linking to one subpage per book."""
+    index_url: str
+    base_url: str
+    link_prefix: str
+    link_suffix: str = ".shtml"
+    exclude: tuple[str, ...] = ("LATIN LIBRARY",)
+
+
+@dataclass(frozen=True)
+class Work:
+    """One bilingual work and the paths of its outputs."""
+    id: str
+    title: str
+    output_dir: Path
+    english: EnglishSource | None = None
+    latin: LatinSource | None = None
+    aligned_dir: Path | None = None
+
+    @property
+    def english_raw_file(self) -> Path:
+        return self.output_dir / "raw_english.txt"
+
+    @property
+    def latin_raw_file(self) -> Path:
+        return self.output_dir / "raw_latin.txt"
+
+    @property
+    def auto_aligned_dir(self) -> Path:
+        """Where the automatic aligner writes this work's book files when there is no aligned_dir."""
+        return self.output_dir / "aligned"
+
+    @property
+    def cleaned_file(self) -> Path:
+        return self.output_dir / "cleaned.tsv"
+
+
+def _resolve(path: str | None) -> Path | None:
+    if path is None:
+        return None
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def parse_work(entry: dict) -> Work:
+    """
+    Builds a Work from one manifest entry.
+
+    Raises:
+        ValueError: If the entry has no id or a source has unknown or missing keys.
+    """
+    if "id" not in entry:
+        raise ValueError(f"Manifest entry without an 'id': {entry}")
+
+    work_id = entry["id"]
+    english = latin = None
+    try:
+        if "english" in entry:
+            source = entry["english"]
+            english = EnglishSource(**{k: tuple(v) if isinstance(v, list) else v for k, v in source.items()})
+        if "latin" in entry:
+            source = entry["latin"]
+            latin = LatinSource(**{k: tuple(v) if isinstance(v, list) else v for k, v in source.items()})
+    except TypeError as e:
+        raise ValueError(f"Invalid source definition for work '{work_id}': {e}") from e
+
+    return Work(
+        id=work_id,
+        title=entry.get("title", work_id),
+        output_dir=_resolve(entry.get("output_dir")) or CORPUS_OUTPUT_DIR / work_id,
+        english=english,
+        latin=latin,
+        aligned_dir=_resolve(entry.get("aligned_dir")),
+    )
+
+
+def load_manifest(path: Path = WORKS_MANIFEST) -> list[Work]:
+    """
+    Loads every work listed in a JSON manifest.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist.
+        ValueError: If an entry is invalid or two works share an id.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Works manifest not found: {path}")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    works = [parse_work(entry) for entry in data.get("works", [])]
+
+    ids = [work.id for work in works]
+    duplicates = sorted({work_id for work_id in ids if ids.count(work_id) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate work ids in manifest: {duplicates}")
+
+    return works
@@ -0,0 +1,198 @@
+"""
+Corpus runner: runs the extract → clean pipeline for every work in the
+source registry (data/works.json), spreading works across a process pool.
+
+Each work runs in isolation: a failure is logged and recorded in the summary,
+and the remaining works carry on. Outputs are written per work to its
+`output_dir` (raw_english.txt, raw_latin.txt and cleaned.tsv), and a run
+summary is saved as corpus_summary.json. Works without a hand-aligned folder
+are aligned automatically (transform/align.py) into `output_dir/aligned`.
+
+Usage:
+        python -m src.run_corpus [--manifest data/works.json] [--workers 8] [--only work_id ...]
+"""
+
+import argparse
+import json
+import logging
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from src.config import (
+    WORKS_MANIFEST,
+    CORPUS_OUTPUT_DIR,
+    CORPUS_WORKERS,
+    HTTP_CACHE_ENABLED,
+)
+from src.registry import Work, load_manifest
+
+logger = logging.getLogger(__name__)
+
+
+# === ONE WORK ===
+def run_work(work: Work, use_cache: bool = HTTP_CACHE_ENABLED) -> dict:
+    """
+    Runs extraction and cleaning for a single work.
+
+    Never raises: any error is caught and reported in the returned summary,
+    so one broken source cannot take down the rest of the corpus.
+
+    Returns:
+        dict: work_id, status ("ok" or "failed"), seconds, paragraph/row counts and error.
+            aligned_rows is set when the work was aligned automatically.
+    """
+    # Imported here so the parent process stays light; workers import what they use
+    from src.extract import extract_english, extract_latin
+    from src.extract.checkpoints import PageCheckpoints
+    from src.extract.http_cache import HttpCache
+
+    start = time.perf_counter()
+    result = {
+        "work_id": work.id,
+        "status": "ok",
+        "english_paragraphs": None,
+        "latin_paragraphs": None,
+        "aligned_rows": None,
+        "cleaned_rows": None,
+        "error": None,
+    }
+
+    try:
+        work.output_dir.mkdir(parents=True, exist_ok=True)
+        cache = HttpCache.from_config() if use_cache else None
+
+        if work.english is not None:
+            html = extract_english.fetch_html(work.english.url, cache=cache)
+            paragraphs = extract_english.extract_text_from_html(
+                html, tags=work.english.tags, exclude=work.english.exclude
+            )
+            extract_english.save_to_file(paragraphs, work.english_raw_file)
+            result["english_paragraphs"] = len(paragraphs)
+
+        if work.latin is not None:
+            checkpoints = PageCheckpoints(work.output_dir / ".latin_checkpoints")
+            index_html = extract_latin.fetch_html(work.latin.index_url, cache=cache)
+            paragraphs = extract_latin.extract_all_paragraphs(
+                index_html,
+                base_url=work.latin.base_url,
+                max_workers=extract_latin.LATIN_FETCH_WORKERS,
+                cache=cache,
+                link_prefix=work.latin.link_prefix,
+                link_suffix=work.latin.link_suffix,
+                exclude=work.latin.exclude,
+                checkpoints=checkpoints,
+            )
+            extract_latin.save_to_file(paragraphs, work.latin_raw_file)
+            checkpoints.clear()
+            result["latin_paragraphs"] = len(paragraphs)
+
+        aligned_dir = work.aligned_dir
+        if aligned_dir is None and work.english is not None and work.latin is not None:
+            # No hand alignment for this work: align the raw texts automatically
+            from src.artifacts import read_text
+            from src.transform import align
+
+            rows_by_book = align.align_texts(read_text(work.latin_raw_file), read_text(work.english_raw_file))
+            align.write_alignment(rows_by_book, work.auto_aligned_dir)
+            aligned_dir = work.auto_aligned_dir
+            result["aligned_rows"] = sum(len(rows) for rows in rows_by_book.values())
+
+        if aligned_dir is not None and aligned_dir.exists():
+            from src.transform.incremental import run_incremental
+
+            report = run_incremental(
+                aligned_dir,
+                work.cleaned_file,
+                work.output_dir / ".transform_manifest.json",
+            )
+            result["cleaned_rows"] = report["rows"]
+
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        logger.error(f"❌ Work '{work.id}' failed:\n{traceback.format_exc()}")
+
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+# === WHOLE CORPUS ===
+def run_corpus(works: list[Work], max_workers: int = CORPUS_WORKERS) -> dict:
+    """
+    Runs every work, in a process pool when max_workers > 1.
+
+    Returns:
+        dict: Aggregate counters, throughput in works/minute and one result per work
+            (in manifest order).
+    """
+    start = time.perf_counter()
+    results: dict[str, dict] = {}
+
+    if max_workers <= 1:
+        for work in works:
+            results[work.id] = run_work(work)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(run_work, work): work for work in works}
+            for future in as_completed(futures):
+                work = futures[future]
+                try:
+                    results[work.id] = future.result()
+                except Exception as e:  # e.g. a worker process died
+                    results[work.id] = {"work_id": work.id, "status": "failed", "error": repr(e), "seconds": None}
+                status = "✅" if results[work.id]["status"] == "ok" else "❌"
+                logger.info(f"{status} {work.id} finished ({len(results)}/{len(works)})")
+
+    elapsed = time.perf_counter() - start
+    ordered = [results[work.id] for work in works]
+    succeeded = sum(1 for r in ordered if r["status"] == "ok")
+
+    return {
+        "works": len(works),
+        "succeeded": succeeded,
+        "failed": len(works) - succeeded,
+        "workers": max_workers,
+        "seconds": round(elapsed, 3),
+        "works_per_minute": round(len(works) / elapsed * 60, 2) if elapsed > 0 else None,
+        "results": ordered,
+    }
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Run the pipeline over every work in the registry.")
+    parser.add_argument("--manifest", type=Path, default=WORKS_MANIFEST)
+    parser.add_argument("--workers", type=int, default=CORPUS_WORKERS)
+    parser.add_argument("--only", nargs="+", metavar="WORK_ID", help="Process only these works")
+    args = parser.parse_args(argv)
+
+    works = load_manifest(args.manifest)
+    if args.only:
+        unknown = sorted(set(args.only) - {work.id for work in works})
+        if unknown:
+            parser.error(f"unknown work id(s) in --only: {', '.join(unknown)}")
+        works = [work for work in works if work.id in set(args.only)]
+
+    logger.info(f"🚀 Starting corpus run: {len(works)} works, {args.workers} workers")
+    summary = run_corpus(works, max_workers=args.workers)
+
+    CORPUS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    summary_path = CORPUS_OUTPUT_DIR / "corpus_summary.json"
+    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    logger.info(
+        f"🏁 Corpus run finished: {summary['succeeded']} ok, {summary['failed']} failed "
+        f"in {summary['seconds']}s ({summary['works_per_minute']} works/minute)"
+    )
+    logger.info(f"Summary saved to {summary_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    main()
@@ -1,40 +1,453 @@
 """
-Main script. Currently, it only touches the extract phase.
+Main script. Runs the pipeline as a graph of stages:
+
+    extract_english ──┐
+    extract_latin ────┴──▶ dedupe ──▶ template   (hand alignment into data/aligned/ happens outside the pipeline)
+    validate ──▶ clean ──┬──▶ enrich
+                         ├──▶ stats
+                         ├──▶ load
+                         └──▶ index
+
+- extract_english / extract_latin: download the raw texts (data/raw/)
+- dedupe: the raw files without cross-source boilerplate (data/deduped/)
+- template: the manual alignment template (data/manual_template.csv), from the deduped Latin
+- validate: alignment checks of data/aligned/; errors stop the run before cleaning
+- clean: the cleaned paragraph fact table from data/aligned/ (incremental) and its chapter table
+- enrich: typed, book-partitioned Parquet copy of the fact table
+- stats: word/character/type counts per paragraph, aggregated per book and chapter
+- load: bulk load of the fact table into SQL
+- index: full-text search index over the fact table
+
+Stages whose dependencies are done run in parallel, so the wall time of a full
+run is close to the longest path rather than the sum of all stages.
+A stage is skipped, make-style, when all its outputs exist and are newer than
+all its inputs. A stage that runs but finds nothing to change (clean on aligned
+files that were only touched) is recorded as skipped too, so it does not rerun
+the stages downstream of it. A failed stage blocks only the stages downstream of it.
+
+Every run writes a JSON metrics file (see src/metrics.py) to data/metrics/:
+per-stage wall time, rows produced, bytes downloaded and peak memory, and one
+record per fetch_html call.
+
+Usage:
+        python -m src.run_pipeline                    # every stage
+        python -m src.run_pipeline --stage load       # load and everything upstream of it
+        python -m src.run_pipeline --stage clean --force
+        python -m src.run_pipeline --dry-run
+        python -m src.run_pipeline --profile          # cProfile dump per stage (stages run one at a time)
+        python -m src.run_pipeline --trace-memory     # tracemalloc peaks (stages run one at a time)
 """
 
+import argparse
 import logging
+import time
 import traceback
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
 
-from src.extract.extract_english import run_english_extraction
-from src.extract.extract_latin import run_latin_extraction
-
-# === CONFIGURE LOGGING ===
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
+from src import metrics
+from src.artifacts import ref_path
+from src.config import (
+    ENGLISH_RAW_FILE,
+    LATIN_RAW_FILE,
+    DEDUPED_ENGLISH_FILE,
+    DEDUPED_LATIN_FILE,
+    BOILERPLATE_REPORT_PATH,
+    TEMPLATE_OUTPUT_FILE,
+    INPUT_DIR,
+    ALIGNMENT_REPORT_PATH,
+    ALIGNMENT_ACCEPTED_PATH,
+    SEGMENTATION_KEEP_PATH,
+    OUTPUT_PATH,
+    TRANSFORM_MANIFEST_PATH,
+    PARQUET_OUTPUT_DIR,
+    SQLITE_DB_PATH,
+    SEARCH_INDEX_PATH,
+    PARAGRAPH_STATS_PATH,
+    BOOK_STATS_PATH,
+    CHAPTER_STATS_PATH,
+    CHAPTERS_PATH,
+    CORPUS_OUTPUT_DIR,
+    METRICS_DIR,
+    PROJECT_ROOT,
 )
 
 logger = logging.getLogger(__name__)
 
-# === MAIN EXECUTION ===
-def main():
-    logger.info("🚀 Starting Extract Phase")
+# The code that produces the fact table; editing it makes the clean stage stale
+TRANSFORM_CODE = tuple(
+    PROJECT_ROOT / "src" / "transform" / name for name in ("books.py", "chapters.py", "clean_kempis.py", "enrich_kempis.py", "incremental.py", "segment.py", "streaming.py")
+)
+BOILERPLATE_CODE = PROJECT_ROOT / "src" / "transform" / "boilerplate.py"
+SEGMENT_CODE = PROJECT_ROOT / "src" / "transform" / "segment.py"
+STATS_CODE = PROJECT_ROOT / "src" / "transform" / "text_stats.py"
+VALIDATE_CODE = PROJECT_ROOT / "src" / "transform" / "validate_alignment.py"
 
-    try:
-        run_english_extraction()
-        logger.info("✅ English extraction completed.")
-    except Exception as e:
-        logger.error("❌ Failed during English extraction.")
-        logger.error(traceback.format_exc())
 
+# What a stage's run returns when it found nothing to change; the stage is then recorded as skipped
+UNCHANGED = "unchanged"
+
+
+# === STAGE DEFINITION ===
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of the pipeline.
+
+    inputs and outputs are files or folders (a folder stands for every file in it);
+    they decide whether the stage is up to date. depends_on names the stages that
+    must finish first. run may return the number of rows/paragraphs it produced,
+    which is recorded in the run metrics, or UNCHANGED when it found its outputs
+    already current.
+    """
+    name: str
+    run: Callable[[], object]
+    depends_on: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str                       # "ok", "skipped", "failed", "blocked" (or "would run" in a dry run)
+    seconds: float = 0.0
+    error: str | None = None
+    upstream: list[str] = field(default_factory=list)
+
+
+def _files(path: Path) -> list[Path]:
+    path = Path(path)
+    if path.is_dir():
+        return [f for f in path.rglob("*") if f.is_file()]
+    # A stored artifact (src/artifacts.py) is its ref, the plain file, or both
+    return [f for f in (path, ref_path(path)) if f.exists()]
+
+
+def is_up_to_date(stage: Stage) -> bool:
+    """True when every output exists and the oldest output is newer than the newest input."""
+    if not stage.outputs:
+        return False
+    output_files = []
+    for output in stage.outputs:
+        files = _files(output)
+        if not files:
+            return False
+        output_files.extend(files)
+
+    input_files = [f for path in stage.inputs for f in _files(path)]
+    if not input_files:
+        return True
+    return min(f.stat().st_mtime for f in output_files) >= max(f.stat().st_mtime for f in input_files)
+
+
+# === GRAPH HELPERS ===
+def _check_graph(stages: list[Stage]) -> None:
+    """Names must be unique and every stage must come after the stages it depends on (so no cycles)."""
+    seen: set[str] = set()
+    names = {stage.name for stage in stages}
+    if len(names) != len(stages):
+        raise ValueError("Duplicate stage names.")
+    for stage in stages:
+        unknown = [dep for dep in stage.depends_on if dep not in names]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+        later = [dep for dep in stage.depends_on if dep not in seen]
+        if later:
+            raise ValueError(f"Stage '{stage.name}' is listed before its dependencies {later} (or they form a cycle).")
+        seen.add(stage.name)
+
+
+def with_upstream(stages: dict[str, Stage], targets: list[str]) -> list[str]:
+    """The target stages plus everything they depend on, in definition order."""
+    selected: set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in stages:
+            raise ValueError(f"Unknown stage '{name}'. Available: {list(stages)}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(stages[name].depends_on)
+    return [name for name in stages if name in selected]
+
+
+def critical_path_seconds(stages: dict[str, Stage], results: dict[str, StageResult]) -> float:
+    """Duration of the longest dependency chain among the stages that ran."""
+    finish: dict[str, float] = {}
+    for name in stages:  # definition order is a valid topological order (see _check_graph)
+        if name in results:
+            deps = [finish.get(dep, 0.0) for dep in stages[name].depends_on]
+            finish[name] = max(deps, default=0.0) + results[name].seconds
+    return max(finish.values(), default=0.0)
+
+
+# === RUNNER ===
+def run_stages(
+    stages: list[Stage],
+    targets: list[str] | None = None,
+    force: bool = False,
+    max_workers: int | None = None,
+    dry_run: bool = False,
+    trace_memory: bool = False,
+    profile_dir: Path | None = None,
+) -> dict:
+    """
+    Runs the selected stages in dependency order, independent ones in parallel.
+
+    Args:
+        stages (list[Stage]): The whole graph, listed so that dependencies come first.
+        targets (list[str] | None): Stages to bring up to date (with their upstream). None = all.
+        force (bool): Run the selected stages even when they are up to date.
+        max_workers (int | None): Parallel stages at most. None = as many as there are stages.
+        dry_run (bool): Only report what would run.
+        trace_memory (bool): Record tracemalloc peaks per stage. Stages then run one at
+            a time, since overlapping stages would share the peak.
+        profile_dir (Path | None): When given, write a cProfile dump per stage there.
+
+    Returns:
+        dict: Per-stage results, wall time, the sum of stage times and the critical path time.
+    """
+    _check_graph(stages)
+    graph = {stage.name: stage for stage in stages}
+
+    selected = with_upstream(graph, targets) if targets else list(graph)
+    results: dict[str, StageResult] = {}
+    start = time.perf_counter()
+
+    if dry_run:
+        for name in selected:
+            stale = force or not is_up_to_date(graph[name])
+            results[name] = StageResult(name, "would run" if stale else "skipped")
+        return _summary(graph, results, start)
+
+    pending = list(selected)
+    running: dict[Future, str] = {}
+    started: dict[str, float] = {}
+    metrics.reset()
+
+    def execute(stage: Stage) -> bool:
+        """Runs the stage; False when it found nothing to change."""
+        with metrics.stage_timer(stage.name, trace_memory, profile_dir) as record:
+            produced = stage.run()
+            if isinstance(produced, int):
+                record["rows"] = produced
+            missing = [str(path) for path in stage.outputs if not _files(path)]
+            if missing:
+                raise RuntimeError(f"Stage finished without producing {missing}")
+        return produced != UNCHANGED
+
+    # tracemalloc and cProfile are process-wide (on 3.12+ a second active profiler raises)
+    if trace_memory or profile_dir is not None:
+        max_workers = 1
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(selected) or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = [dep for dep in graph[name].depends_on if dep in selected]
+                if any(results.get(dep) and results[dep].status in ("failed", "blocked") for dep in deps):
+                    failed = [dep for dep in deps if results[dep].status in ("failed", "blocked")]
+                    results[name] = StageResult(name, "blocked", upstream=failed)
+                    logger.warning(f"⛔ {name} blocked by failed upstream stage(s) {failed}")
+                    pending.remove(name)
+                elif all(dep in results for dep in deps):
+                    pending.remove(name)
+                    upstream_ran = any(results[dep].status == "ok" for dep in deps)
+                    if not force and not upstream_ran and is_up_to_date(graph[name]):
+                        results[name] = StageResult(name, "skipped")
+                        logger.info(f"⏭️  {name} is up to date")
+                        continue
+                    logger.info(f"▶️  {name} started")
+                    started[name] = time.perf_counter()
+                    running[pool.submit(execute, graph[name])] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                seconds = round(time.perf_counter() - started[name], 3)
+                try:
+                    changed = future.result()
+                    results[name] = StageResult(name, "ok" if changed else "skipped", seconds)
+                    logger.info(f"✅ {name} finished in {seconds}s" if changed else f"⏭️  {name} found nothing to change")
+                except Exception as e:
+                    results[name] = StageResult(name, "failed", seconds, f"{type(e).__name__}: {e}")
+                    logger.error(f"❌ {name} failed:\n{traceback.format_exc()}")
+
+    return _summary(graph, results, start)
+
+
+def _summary(graph: dict[str, Stage], results: dict[str, StageResult], start: float) -> dict:
+    ran = {name: result for name, result in results.items() if result.status in ("ok", "failed")}
+    return {
+        "stages": {name: results[name] for name in graph if name in results},
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "sum_seconds": round(sum(result.seconds for result in ran.values()), 3),
+        "critical_path_seconds": round(critical_path_seconds(graph, ran), 3),
+        "failed": [name for name, result in results.items() if result.status in ("failed", "blocked")],
+    }
+
+
+# === PIPELINE STAGES ===
+# Each returns the number of paragraphs/rows it produced (for the run metrics)
+def _extract_english():
+    from src.extract.extract_english import run_english_extraction
+    return run_english_extraction()
+
+
+def _extract_latin():
+    from src.extract.extract_latin import run_latin_extraction
+    return run_latin_extraction()
+
+
+def _dedupe():
+    # Every extracted file is a source (the corpus works too), so boilerplate shared with them is found
+    from src.transform.boilerplate import dedupe_files, default_sources
+    report = dedupe_files(default_sources())
+    return report.paragraphs - report.removed
+
+
+def _template():
+    from src.transform.create_template import read_segmented_latin_text, write_alignment_template
+    return write_alignment_template(read_segmented_latin_text(DEDUPED_LATIN_FILE), TEMPLATE_OUTPUT_FILE)
+
+
+def _validate():
+    # A failing report is kept next to the real one, so the stage stays stale until the files are fixed
+    from src.transform.validate_alignment import validate_alignment, write_report
+    failed_path = ALIGNMENT_REPORT_PATH.with_suffix(".failed.json")
+    report = validate_alignment(INPUT_DIR, None)
+    if not report["ok"]:
+        ALIGNMENT_REPORT_PATH.unlink(missing_ok=True)
+        write_report(report, failed_path)
+        raise ValueError(f"{report['errors']} alignment error(s), see {failed_path}")
+    failed_path.unlink(missing_ok=True)
+    write_report(report, ALIGNMENT_REPORT_PATH)
+    return report["rows"]
+
+
+def _clean():
+    from src.transform.incremental import run_incremental
+    report = run_incremental(INPUT_DIR, OUTPUT_PATH, TRANSFORM_MANIFEST_PATH)
+    # Same content (e.g. aligned files only touched): the fact table is untouched, so downstream stays current
+    if report["mode"] == "unchanged" and CHAPTERS_PATH.exists():
+        return UNCHANGED
+
+    # Only here, so an up-to-date clean stage never imports pandas
+    from src.transform.chapters import write_chapter_table
+    from src.transform.enrich_kempis import read_fact_table
+    write_chapter_table(read_fact_table(OUTPUT_PATH), CHAPTERS_PATH)
+    return report["rows"]
+
+
+def _enrich():
+    from src.transform.columnar import write_parquet
+    from src.transform.enrich_kempis import read_fact_table
+    fact_table = read_fact_table(OUTPUT_PATH, compact=True)
+    write_parquet(fact_table, PARQUET_OUTPUT_DIR)
+    return len(fact_table)
+
+
+def _stats():
+    from src.transform.enrich_kempis import read_fact_table
+    from src.transform.text_stats import write_stats
+    return write_stats(read_fact_table(OUTPUT_PATH, compact=True))["paragraphs"]
+
+
+def _load():
+    from src.load.load_to_sql import SQLiteBackend, load_fact_table
+    from src.transform.enrich_kempis import read_fact_table
+
+    backend = SQLiteBackend(SQLITE_DB_PATH)
     try:
-        run_latin_extraction()
-        logger.info("✅ Latin extraction completed.")
-    except Exception as e:
-        logger.error("❌ Failed during Latin extraction.")
-        logger.error(traceback.format_exc())
+        return load_fact_table(read_fact_table(OUTPUT_PATH, compact=True), backend)["rows"]
+    finally:
+        backend.close()
+
+
+def _index():
+    from src.search.full_text import build_index
+    from src.transform.enrich_kempis import read_fact_table
+    return build_index(read_fact_table(OUTPUT_PATH, compact=True), SEARCH_INDEX_PATH)["documents"]
+
+
+STAGES = [
+    Stage("extract_english", _extract_english, outputs=(ENGLISH_RAW_FILE,)),
+    Stage("extract_latin", _extract_latin, outputs=(LATIN_RAW_FILE,)),
+    Stage("dedupe", _dedupe, ("extract_english", "extract_latin"),
+          inputs=(ENGLISH_RAW_FILE, LATIN_RAW_FILE, CORPUS_OUTPUT_DIR, BOILERPLATE_CODE),
+          outputs=(DEDUPED_ENGLISH_FILE, DEDUPED_LATIN_FILE, BOILERPLATE_REPORT_PATH)),
+    Stage("template", _template, ("dedupe",), inputs=(DEDUPED_LATIN_FILE, INPUT_DIR, SEGMENTATION_KEEP_PATH, SEGMENT_CODE),
+          outputs=(TEMPLATE_OUTPUT_FILE,)),
+    Stage("validate", _validate, inputs=(INPUT_DIR, ALIGNMENT_ACCEPTED_PATH, VALIDATE_CODE),
+          outputs=(ALIGNMENT_REPORT_PATH,)),
+    Stage("clean", _clean, ("validate",), inputs=(INPUT_DIR, SEGMENTATION_KEEP_PATH, *TRANSFORM_CODE), outputs=(OUTPUT_PATH, CHAPTERS_PATH)),
+    Stage("enrich", _enrich, ("clean",), inputs=(OUTPUT_PATH,), outputs=(PARQUET_OUTPUT_DIR,)),
+    Stage("stats", _stats, ("clean",), inputs=(OUTPUT_PATH, STATS_CODE),
+          outputs=(PARAGRAPH_STATS_PATH, BOOK_STATS_PATH, CHAPTER_STATS_PATH)),
+    Stage("load", _load, ("clean",), inputs=(OUTPUT_PATH, STATS_CODE), outputs=(SQLITE_DB_PATH,)),
+    Stage("index", _index, ("clean",), inputs=(OUTPUT_PATH,), outputs=(SEARCH_INDEX_PATH,)),
+]
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Run the pipeline stages in dependency order.")
+    parser.add_argument("--stage", nargs="+", choices=[stage.name for stage in STAGES],
+                        help="Run only these stages and their upstream dependencies")
+    parser.add_argument("--force", action="store_true", help="Run the selected stages even if up to date")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum number of stages run in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run")
+    parser.add_argument("--profile", action="store_true", help="Write a cProfile dump of each stage (runs stages one at a time)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record tracemalloc peaks per stage (runs stages one at a time)")
+    parser.add_argument("--metrics-dir", type=Path, default=METRICS_DIR, help="Where run metrics are written")
+    args = parser.parse_args(argv)
+
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    profile_dir = args.metrics_dir / f"profile_{run_id}" if args.profile else None
+
+    logger.info("🚀 Starting pipeline")
+    summary = run_stages(
+        STAGES,
+        args.stage,
+        force=args.force,
+        max_workers=args.workers,
+        dry_run=args.dry_run,
+        trace_memory=args.trace_memory,
+        profile_dir=profile_dir,
+    )
+
+    for result in summary["stages"].values():
+        logger.info(f"   {result.name:<16} {result.status:<9} {result.seconds:>8.3f}s")
+    logger.info(
+        f"🏁 Pipeline finished in {summary['wall_seconds']}s "
+        f"(stages sum {summary['sum_seconds']}s, critical path {summary['critical_path_seconds']}s)"
+    )
+
+    if not args.dry_run:
+        report = metrics.collect(
+            run_id=run_id,
+            wall_seconds=summary["wall_seconds"],
+            sum_seconds=summary["sum_seconds"],
+            critical_path_seconds=summary["critical_path_seconds"],
+            statuses={name: result.status for name, result in summary["stages"].items()},
+            failed=summary["failed"],
+        )
+        path = metrics.write_metrics(report, args.metrics_dir / f"run_{run_id}.json")
+        logger.info(f"📊 Run metrics written to {path}")
+        if profile_dir is not None:
+            logger.info(f"🔬 Stage profiles written to {profile_dir}")
+    return summary
 
-    logger.info("🏁 Extract Phase finished.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    main()
@@ -0,0 +1,371 @@
+"""
+full_text.py
+
+Inverted full-text index over the latin_text and english_text columns of the
+paragraph fact table, with a small query API.
+
+Latin spelling is normalized before indexing and querying, so a query matches
+every orthographic variant found in the aligned files:
+
+    æ → ae, œ → oe, j → i, v → u, accents removed, case folded
+    ("Cælestia" and "caelestia" → "caelestia"; "Jesu" and "Iesu" → "iesu";
+     "vita" and "uita" → "uita")
+
+Query syntax (clauses are AND-ed, results ranked with BM25):
+
+    christum                   a single term
+    "regnum dei"               a phrase (consecutive positions)
+    christ*                    a prefix (christus, christi, christo, ...)
+    "regnum dei" christ*       any combination
+
+On-disk format (one file, see INDEX_MAGIC):
+
+    magic | u32 header length | header (JSON) | postings | documents (zlib JSON)
+
+The header holds the lexicon of each field (term → offset, size, document
+frequency) and the document lengths. A posting list is a sequence of varints:
+for each document, the gap from the previous document ordinal, the term
+frequency, then the gaps between positions. Posting lists are decoded on first
+use and cached, so repeated lookups do not touch the bytes again.
+
+Usage:
+        python -m src.search.full_text build
+        python -m src.search.full_text query 'christ*' [--field english] [--limit 5]
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import logging
+import math
+import re
+import struct
+import time
+import unicodedata
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import OUTPUT_PATH, SEARCH_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"CBFTIDX1"
+FIELDS = {"latin": "latin_text", "english": "english_text"}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_PREFIX_EXPANSIONS = 256
+
+LATIN_LIGATURES = str.maketrans({"æ": "ae", "œ": "oe", "j": "i", "v": "u"})
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+CLAUSE_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+# === NORMALIZATION AND TOKENIZATION ===
+def _fold(text: str) -> str:
+    """Lowercases and strips diacritics (é → e, ë → e)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_latin(text: str) -> str:
+    """Maps Latin orthographic variants to one spelling: æ→ae, œ→oe, j→i, v→u, no accents."""
+    # Accents first, so an accented ǽ is folded to æ before the ligature is split
+    return _fold(text).translate(LATIN_LIGATURES)
+
+
+def normalize_english(text: str) -> str:
+    return _fold(text).replace("æ", "ae").replace("œ", "oe")
+
+
+NORMALIZERS = {"latin": normalize_latin, "english": normalize_english}
+
+
+def tokenize(text: str, field: str = "latin") -> list[str]:
+    """Normalized tokens of text, in order."""
+    return TOKEN_RE.findall(NORMALIZERS[field](text))
+
+
+# === VARINTS ===
+def encode_varints(values, out: bytearray) -> None:
+    """Appends unsigned LEB128 varints to out."""
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def decode_varints(data: bytes) -> list[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+# === BUILD ===
+def build_index(fact_table: pd.DataFrame, path: Path = SEARCH_INDEX_PATH) -> dict:
+    """
+    Builds the index for every row of fact_table and writes it to path.
+
+    Returns:
+        dict: Number of documents, terms per field and file size in bytes.
+    """
+    path = Path(path)
+    postings_blob = bytearray()
+    header = {"version": 1, "documents": len(fact_table), "fields": {}}
+
+    for field, column in FIELDS.items():
+        postings: dict[str, dict[int, list[int]]] = defaultdict(dict)
+        lengths = []
+        for ordinal, text in enumerate(fact_table[column].tolist()):
+            tokens = tokenize(text, field)
+            lengths.append(len(tokens))
+            for position, token in enumerate(tokens):
+                postings[token].setdefault(ordinal, []).append(position)
+
+        lexicon = {}
+        for term in sorted(postings):
+            start = len(postings_blob)
+            previous = 0
+            for ordinal, positions in postings[term].items():  # ordinals were added in order
+                encode_varints((ordinal - previous, len(positions)), postings_blob)
+                encode_varints((b - a for a, b in zip([0] + positions, positions)), postings_blob)
+                previous = ordinal
+            lexicon[term] = [start, len(postings_blob) - start, len(postings[term])]
+
+        header["fields"][field] = {
+            "lexicon": lexicon,
+            "lengths": lengths,
+            "avg_length": sum(lengths) / len(lengths) if lengths else 0.0,
+        }
+
+    documents = fact_table[["id", "book_id", "chapter_id", "latin_text", "english_text"]]
+    documents_blob = zlib.compress(
+        json.dumps(documents.astype(object).values.tolist(), ensure_ascii=False).encode("utf-8"), 6
+    )
+    header["postings_size"] = len(postings_blob)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(INDEX_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(postings_blob)
+        f.write(documents_blob)
+    tmp.replace(path)
+
+    stats = {
+        "documents": len(fact_table),
+        "terms": {field: len(header["fields"][field]["lexicon"]) for field in FIELDS},
+        "postings_bytes": len(postings_blob),
+        "bytes": path.stat().st_size,
+    }
+    logger.info(f"Indexed {stats['documents']} paragraphs ({stats['terms']} terms) into {path}")
+    return stats
+
+
+# === QUERY ===
+@dataclass(frozen=True)
+class Hit:
+    """One matching paragraph with its aligned translation."""
+    id: int
+    score: float
+    book_id: int
+    chapter_id: str
+    latin_text: str
+    english_text: str
+
+
+class FullTextIndex:
+    """Read side of the index. Load once, query many times."""
+
+    def __init__(self, path: Path = SEARCH_INDEX_PATH):
+        data = Path(path).read_bytes()
+        if data[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"Not a full-text index file: {path}")
+
+        offset = len(INDEX_MAGIC)
+        (header_size,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_size])
+        offset += header_size
+
+        self._postings = memoryview(data)[offset:offset + header["postings_size"]]
+        self.documents = [tuple(row) for row in json.loads(zlib.decompress(data[offset + header["postings_size"]:]))]
+        self._fields = header["fields"]
+        self._terms = {field: sorted(info["lexicon"]) for field, info in self._fields.items()}
+        self._decode = lru_cache(maxsize=4096)(self._decode_postings)
+        self._scores = lru_cache(maxsize=4096)(self._term_scores)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _decode_postings(self, field: str, term: str) -> dict[int, list[int]]:
+        """Posting list of term: document ordinal → sorted positions."""
+        entry = self._fields[field]["lexicon"].get(term)
+        if entry is None:
+            return {}
+        start, size, _ = entry
+        values = decode_varints(self._postings[start:start + size])
+
+        postings, ordinal, i = {}, 0, 0
+        while i < len(values):
+            ordinal += values[i]
+            count = values[i + 1]
+            positions, position = [], 0
+            for gap in values[i + 2:i + 2 + count]:
+                position += gap
+                positions.append(position)
+            postings[ordinal] = positions
+            i += 2 + count
+        return postings
+
+    def postings(self, term: str, field: str = "latin") -> dict[int, list[int]]:
+        """Posting list (document ordinal → positions) of a normalized term."""
+        return self._decode(field, term)
+
+    def expand_prefix(self, prefix: str, field: str = "latin") -> list[str]:
+        """Indexed terms starting with a normalized prefix, in sorted order."""
+        terms = self._terms[field]
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + "\uffff")
+        return terms[start:min(end, start + MAX_PREFIX_EXPANSIONS)]
+
+    def _bm25(self, field: str, frequencies: dict[int, int]) -> dict[int, float]:
+        info = self._fields[field]
+        n, df = len(self.documents), len(frequencies)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        avg = info["avg_length"] or 1.0
+        lengths = info["lengths"]
+        return {
+            ordinal: idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[ordinal] / avg))
+            for ordinal, tf in frequencies.items()
+        }
+
+    def _term_scores(self, field: str, term: str) -> dict[int, float]:
+        return self._bm25(field, {o: len(p) for o, p in self.postings(term, field).items()})
+
+    def _phrase_frequencies(self, terms: list[str], field: str) -> dict[int, int]:
+        """Document ordinal → number of times terms occur consecutively."""
+        lists = [self.postings(term, field) for term in terms]
+        if not all(lists):
+            return {}
+        candidates = set.intersection(*(set(p) for p in lists))
+        frequencies = {}
+        for ordinal in candidates:
+            starts = set(lists[0][ordinal])
+            for k, postings in enumerate(lists[1:], start=1):
+                starts &= {position - k for position in postings[ordinal]}
+                if not starts:
+                    break
+            if starts:
+                frequencies[ordinal] = len(starts)
+        return frequencies
+
+    def _clause_scores(self, clause: str, is_phrase: bool, field: str) -> dict[int, float]:
+        if not is_phrase and clause.endswith("*"):
+            stem = "".join(tokenize(clause[:-1], field))
+            scores: dict[int, float] = defaultdict(float)
+            for term in self.expand_prefix(stem, field) if stem else []:
+                for ordinal, score in self._scores(field, term).items():
+                    scores[ordinal] += score
+            return scores
+
+        terms = tokenize(clause, field)
+        if not terms:
+            return {}
+        if len(terms) == 1:
+            return self._scores(field, terms[0])
+        # A quoted phrase, or a token like "ad-uitam" that normalizes to several terms
+        return self._bm25(field, self._phrase_frequencies(terms, field))
+
+    def search(self, query: str, field: str = "latin", limit: int | None = 10) -> list[Hit]:
+        """
+        Runs a query against one field and returns the best matches first.
+
+        Args:
+            query (str): Terms, "quoted phrases" and prefix* clauses; all must match.
+            field (str): "latin" or "english".
+            limit (int | None): Maximum number of hits, None for all.
+
+        Returns:
+            list[Hit]: Matching paragraphs with both texts, by descending BM25 score.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {list(FIELDS)}")
+
+        clauses = [self._clause_scores(phrase or word, bool(phrase), field) for phrase, word in CLAUSE_RE.findall(query)]
+        if not clauses:
+            return []
+
+        # AND: start from the rarest clause so every intersection step stays small
+        clauses.sort(key=len)
+        total = dict(clauses[0])
+        for scores in clauses[1:]:
+            total = {o: s + scores[o] for o, s in total.items() if o in scores}
+
+        key = lambda item: (-item[1], item[0])
+        ranked = sorted(total.items(), key=key) if limit is None else heapq.nsmallest(limit, total.items(), key=key)
+        hits = []
+        for ordinal, score in ranked:
+            doc_id, book_id, chapter_id, latin_text, english_text = self.documents[ordinal]
+            hits.append(Hit(doc_id, round(score, 4), book_id, chapter_id, latin_text, english_text))
+        return hits
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build or query the full-text index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index the cleaned fact table")
+    build.add_argument("--input", type=Path, default=OUTPUT_PATH)
+    build.add_argument("--index", type=Path, default=SEARCH_INDEX_PATH)
+
+    query = commands.add_parser("query", help="Search the index")
+    query.add_argument("query")
+    query.add_argument("--index", type=Path, default=SEARCH_INDEX_PATH)
+    query.add_argument("--field", choices=list(FIELDS), default="latin")
+    query.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from src.transform.enrich_kempis import read_fact_table
+
+        stats = build_index(read_fact_table(args.input), args.index)
+        print(f"✅ Indexed {stats['documents']} paragraphs ({stats['bytes'] / 1024:.0f} KB) into {args.index}")
+        return
+
+    index = FullTextIndex(args.index)
+    start = time.perf_counter()
+    hits = index.search(args.query, field=args.field, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for hit in hits:
+        print(f"[{hit.id}] {hit.chapter_id}  score={hit.score}")
+        print(f"    LA: {hit.latin_text}")
+        print(f"    EN: {hit.english_text}")
+    print(f"🔎 {len(hits)} hits in {elapsed_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -0,0 +1,262 @@
+"""
+service.py
+
+Read-only HTTP/JSON query service over the cleaned fact table, on asyncio
+streams (no web framework).
+
+The fact table is loaded once. Every paragraph is serialized to JSON at
+start-up and kept as bytes in fact table order, so a response is a slice and a
+join, never a DataFrame lookup:
+
+- by id: position from a binary search over the sorted ids
+- by chapter: each chapter_id's (start, end) row offsets are precomputed, so a
+  range of chapters is one contiguous slice
+- by keyword: the full-text index of full_text.py (BM25, Latin spelling
+  variants, phrases and prefixes)
+
+Responses are cached per request target in an LRU cache (SERVICE_CACHE_SIZE
+entries), so hot queries are served without touching the index again.
+
+Endpoints (GET):
+
+    /health                               counts and cache statistics
+    /paragraphs/<id>                      one paragraph
+    /chapters/<chapter_id>                the paragraphs of one chapter, e.g. /chapters/III.13
+    /chapters?from=I.3&to=I.5             the paragraphs of a range of chapters, in order
+    /search?q=christ*&field=latin&limit=10
+
+Usage:
+        python -m src.search.service [--host 127.0.0.1] [--port 8765]
+        curl 'http://127.0.0.1:8765/search?q="regnum dei"'
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.config import OUTPUT_PATH, SEARCH_INDEX_PATH, SERVICE_HOST, SERVICE_PORT, SERVICE_CACHE_SIZE
+from src.search.full_text import FIELDS, FullTextIndex
+
+logger = logging.getLogger(__name__)
+
+# Columns of a paragraph in the responses, when the fact table has them
+ROW_COLUMNS = ("id", "book_id", "chapter_number", "chapter_id", "paragraph_number", "paragraph_in_chapter",
+               "latin_text", "english_text")
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 100
+MAX_HEADER_LINES = 100
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+# === IN-MEMORY STORE ===
+class CorpusStore:
+    """The fact table as pre-serialized JSON rows, with id and chapter offsets."""
+
+    def __init__(self, fact_table: pd.DataFrame, index: FullTextIndex | None = None):
+        columns = [col for col in ROW_COLUMNS if col in fact_table.columns]
+        records = fact_table[columns].astype(object).to_dict("records")
+        self._rows = [json.dumps(record, ensure_ascii=False).encode("utf-8") for record in records]
+
+        ids = fact_table["id"].to_numpy(dtype=np.int64)
+        self._order = np.argsort(ids, kind="stable")
+        self._ids = ids[self._order]
+
+        # chapter_id → [start, end) rows; fact table rows of a chapter are contiguous
+        chapter_ids = fact_table["chapter_id"].astype(str).to_numpy(dtype=object)
+        starts = np.flatnonzero(np.r_[True, chapter_ids[1:] != chapter_ids[:-1]]) if len(chapter_ids) else np.array([], int)
+        ends = np.r_[starts[1:], len(chapter_ids)]
+        self.chapters = {chapter_ids[start]: (int(start), int(end)) for start, end in zip(starts, ends)}
+
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def _array(rows: list[bytes]) -> bytes:
+        return b"[" + b",".join(rows) + b"]"
+
+    def paragraph(self, paragraph_id: int) -> bytes | None:
+        position = int(np.searchsorted(self._ids, paragraph_id))
+        if position == len(self._ids) or self._ids[position] != paragraph_id:
+            return None
+        return self._rows[self._order[position]]
+
+    def chapter_range(self, first: str, last: str) -> bytes | None:
+        """The paragraphs from chapter first through chapter last (inclusive), None if either is unknown."""
+        if first not in self.chapters or last not in self.chapters:
+            return None
+        start, end = self.chapters[first][0], self.chapters[last][1]
+        if start >= end:
+            raise ValueError(f"Chapter {last} comes before {first}")
+        return self._array(self._rows[start:end])
+
+    def search(self, query: str, field: str = "latin", limit: int = SEARCH_DEFAULT_LIMIT) -> bytes:
+        if self.index is None:
+            raise ValueError("No full-text index loaded")
+        hits = [(hit.score, self.paragraph(hit.id)) for hit in self.index.search(query, field=field, limit=limit)]
+        results = [b'{"score":%s,"paragraph":%s}' % (json.dumps(score).encode(), row) for score, row in hits if row]
+        header = json.dumps({"query": query, "field": field, "count": len(results)})[:-1].encode("utf-8")
+        return header + b',"results":' + self._array(results) + b"}"
+
+
+def load_store(fact_path: Path = OUTPUT_PATH, index_path: Path | None = SEARCH_INDEX_PATH) -> CorpusStore:
+    """Loads the fact table and, when its file exists, the full-text index."""
+    from src.transform.enrich_kempis import read_fact_table
+
+    index = FullTextIndex(index_path) if index_path is not None and Path(index_path).exists() else None
+    if index is None:
+        logger.warning(f"No full-text index at {index_path}; /search is disabled (python -m src.search.full_text build)")
+    return CorpusStore(read_fact_table(fact_path), index)
+
+
+# === ROUTING ===
+def _json(status: int, payload) -> tuple[int, bytes]:
+    return status, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _error(status: int, message: str) -> tuple[int, bytes]:
+    return _json(status, {"error": message})
+
+
+def route(store: CorpusStore, target: str) -> tuple[int, bytes]:
+    """(status, JSON body) for a GET request target. Deterministic, so it can be cached."""
+    url = urlsplit(target)
+    parts = [unquote(part) for part in url.path.strip("/").split("/")]
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    try:
+        if parts[0] == "paragraphs" and len(parts) == 2:
+            if not parts[1].isdigit():
+                raise ValueError(f"Paragraph id must be an integer, got {parts[1]!r}")
+            body = store.paragraph(int(parts[1]))
+            return (200, body) if body is not None else _error(404, f"No paragraph {parts[1]}")
+
+        if parts[0] == "chapters" and len(parts) <= 2:
+            first = parts[1] if len(parts) == 2 else params.get("from")
+            last = parts[1] if len(parts) == 2 else params.get("to", first)
+            if not first:
+                raise ValueError("Give a chapter (/chapters/I.3) or a range (/chapters?from=I.3&to=I.5)")
+            body = store.chapter_range(first, last)
+            return (200, body) if body is not None else _error(404, f"No chapter {first if first not in store.chapters else last}")
+
+        if parts[0] == "search" and len(parts) == 1:
+            field = params.get("field", "latin")
+            limit = params.get("limit", str(SEARCH_DEFAULT_LIMIT))
+            if not params.get("q"):
+                raise ValueError("Missing query parameter q")
+            if field not in FIELDS:
+                raise ValueError(f"Unknown field {field!r}, expected one of {list(FIELDS)}")
+            if not limit.isdigit() or not 1 <= int(limit) <= SEARCH_MAX_LIMIT:
+                raise ValueError(f"limit must be between 1 and {SEARCH_MAX_LIMIT}")
+            return 200, store.search(params["q"], field, int(limit))
+    except ValueError as e:             # bad parameters, a reversed chapter range, no index
+        return _error(400, str(e))
+    return _error(404, f"Unknown path {url.path}")
+
+
+# === HTTP ===
+class QueryService:
+    """Serves route() over HTTP/1.1 with keep-alive; responses are cached by request target."""
+
+    def __init__(self, store: CorpusStore, cache_size: int = SERVICE_CACHE_SIZE):
+        self.store = store
+        self.respond = lru_cache(maxsize=cache_size)(lambda target: route(store, target))
+
+    def health(self) -> tuple[int, bytes]:
+        cache = self.respond.cache_info()
+        return _json(200, {
+            "paragraphs": len(self.store),
+            "chapters": len(self.store.chapters),
+            "search": self.store.index is not None,
+            "cache": {"hits": cache.hits, "misses": cache.misses, "size": cache.currsize, "max_size": cache.maxsize},
+        })
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get("content-length", "0") != "0":        # no request bodies: skip them
+                    await reader.readexactly(int(headers["content-length"]))
+
+                method, target, version = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if method not in ("GET", "HEAD"):
+                    status, body = _error(405, f"Method {method} not allowed")
+                elif urlsplit(target).path.rstrip("/") == "/health":
+                    status, body = self.health()
+                else:
+                    try:
+                        status, body = self.respond(target)
+                    except Exception:
+                        logger.exception(f"Error serving {target}")
+                        status, body = _error(500, "Internal error")
+
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + (body if method != "HEAD" else b"")
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass                        # client went away or sent garbage: drop the connection
+        finally:
+            writer.close()
+
+
+async def start_service(
+    store: CorpusStore, host: str = SERVICE_HOST, port: int = SERVICE_PORT, cache_size: int = SERVICE_CACHE_SIZE
+) -> asyncio.Server:
+    """Starts listening (port 0 picks a free port) and returns the server; it serves until closed."""
+    service = QueryService(store, cache_size)
+    return await asyncio.start_server(service.handle_connection, host, port, limit=1 << 16)
+
+
+# === MAIN EXECUTION ===
+async def _serve(args) -> None:
+    store = load_store(args.input, args.index)
+    server = await start_service(store, args.host, args.port, args.cache_size)
+    address = server.sockets[0].getsockname()
+    logger.info(f"Serving {len(store)} paragraphs on http://{address[0]}:{address[1]}")
+    print(f"🌐 Query service on http://{address[0]}:{address[1]} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Read-only HTTP/JSON query service over the fact table.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--input", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--index", type=Path, default=SEARCH_INDEX_PATH)
+    parser.add_argument("--cache-size", type=int, default=SERVICE_CACHE_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 Query service stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -0,0 +1,551 @@
+"""
+align.py
+
+Automatic Latin–English paragraph alignment. Replaces the blank manual
+template (create_template.py) as the way to produce data/aligned-style files.
+
+Input: the two raw files written by extract_latin / extract_english.
+Output: one book{n}_aligned.tsv per book (latin_text <TAB> english_text, no
+header, the format clean_kempis reads) and a book{n}_alignment.tsv sidecar
+with a confidence score for every row.
+
+How it works:
+
+1. Both texts are split into books and chapters. Book pages are recognised by
+   "Liber Primus/Secundus/..." (Latin) and "THE FIRST/SECOND/... BOOK"
+   (English); chapters by "Cap. N." and "CHAPTER N".
+2. Chapters whose number appears on both sides are hard anchors: the two
+   headings form one row and only the paragraphs in between are aligned
+   against each other.
+3. Within each anchored span every Latin paragraph becomes one row, paired
+   with a run of consecutive English sentences. The runs are chosen by a
+   Gale–Church style dynamic program over character lengths:
+       - length cost: -log P(|delta|), delta = (len_en - c * len_la) / sqrt(s2 * len_la)
+       - a penalty when a run starts in the middle of an English paragraph
+       - a bonus when the Latin "N." paragraph number matches the English one
+       - a fixed cost for a Latin paragraph left without English
+   Only cells within a band around the length-proportional diagonal are
+   evaluated, and the costs of a whole span are computed as one numpy array.
+
+The confidence of a row is P(|delta|) of its pair: 1.0 when the lengths are
+exactly in the expected ratio, close to 0 when they are far apart, 0 when the
+Latin paragraph got no English.
+
+Usage:
+        python -m src.transform.align [--latin data/raw/raw_latin_kempis.txt]
+                                      [--english data/raw/raw_english_kempis.txt]
+                                      [--output-dir data/aligned_auto]
+"""
+
+import argparse
+import csv
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.artifacts import read_text
+from src.config import AUTO_ALIGNED_DIR, ENGLISH_RAW_FILE, LATIN_RAW_FILE
+from src.transform.books import from_roman
+
+logger = logging.getLogger(__name__)
+
+# === ALIGNMENT PARAMETERS ===
+VARIANCE_PER_CHAR = 6.8        # s2 in Gale & Church (1993)
+MAX_SENTENCES = 24             # Longest run of English sentences one Latin paragraph may take
+BAND_WIDTH = 40                # Sentences explored on each side of the diagonal
+MID_PARAGRAPH_COST = 4.0       # A run that starts inside an English paragraph
+NUMBER_BONUS = 3.0             # Latin "N." paragraph paired with English "N." paragraph
+EMPTY_COST = 15.0              # A Latin paragraph with no English
+MIN_PROBABILITY = 1e-12
+COST_BLOCK_ROWS = 1024         # Latin paragraphs whose costs are computed in one numpy batch
+
+# === STRUCTURE MARKERS ===
+ORDINALS = {
+    "primus": 1, "secundus": 2, "tertius": 3, "quartus": 4, "quintus": 5, "sextus": 6,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5, "sixth": 6,
+}
+LATIN_BOOK_RE = re.compile(r"\bLiber\s*(primus|secundus|tertius|quartus|quintus|sextus)", re.IGNORECASE)
+LATIN_CHAPTER_RE = re.compile(r"^Cap\.\s*([IVXLC]+|\d+)\b", re.IGNORECASE)
+LATIN_SKIP_RE = re.compile(r"^THOMAS À KEMPIS:|The Latin Library")
+ENGLISH_BOOK_RE = re.compile(r"^THE (FIRST|SECOND|THIRD|FOURTH|FIFTH|SIXTH) BOOK\b")
+ENGLISH_CHAPTER_RE = re.compile(r"^CHAPTER ([IVXLC]+|\d+)\s*$")
+ENGLISH_FOOTNOTE_RE = re.compile(r"^\(\d+\)\s")
+ENGLISH_END_RE = re.compile(r"^THE FULL PROJECT GUTENBERG LICENSE|^\*\*\* ?END OF")
+FOOTNOTE_MARK_RE = re.compile(r"\s?\(\d+\)")
+SPEAKER_LABEL_RE = re.compile(r"^The Voice of (the )?[A-Z]\w+$")  # Dropped under chapter headings
+NUMBERED_RE = re.compile(r"^(\d+)\.")
+SENTENCE_END_RE = re.compile(r"[.!?][”’\"')]*\s+(?=[“‘\"(]*[A-Z])")
+
+HEADING_LINE_MAX = 60   # Source lines wrap at ~78 characters; paragraph first lines are long
+SENTENCE_ENDINGS = (".", "!", "?", ":", ";", "”", '"')
+
+
+def _chapter_number(token: str) -> int:
+    return int(token) if token.isdigit() else from_roman(token)
+
+
+@dataclass
+class Unit:
+    """A paragraph or heading of one side of the text."""
+    text: str
+    kind: str = "paragraph"        # "book", "chapter" or "paragraph"
+    number: int | None = None      # chapter number, or the "N." of a numbered paragraph
+
+
+@dataclass
+class Book:
+    number: int
+    units: list[Unit]
+
+
+# === SEGMENTATION ===
+def _paragraph_number(text: str) -> int | None:
+    match = NUMBERED_RE.match(text)
+    return int(match.group(1)) if match else None
+
+
+def segment_latin(text: str) -> list[Book]:
+    """Splits the raw Latin file (paragraphs separated by blank lines) into books of units."""
+    books: list[Book] = []
+    for paragraph in (p.strip() for p in text.split("\n\n")):
+        if not paragraph:
+            continue
+        paragraph = " ".join(paragraph.splitlines())
+        book_match = LATIN_BOOK_RE.search(paragraph)
+        if book_match:
+            number = ORDINALS[book_match.group(1).lower()]
+            if not books or books[-1].number != number:
+                books.append(Book(number, []))
+            if paragraph.lower().startswith("liber"):
+                books[-1].units.append(Unit(paragraph, "book", number))
+            continue
+        if not books or LATIN_SKIP_RE.search(paragraph):
+            continue
+
+        chapter_match = LATIN_CHAPTER_RE.match(paragraph)
+        if chapter_match:
+            books[-1].units.append(Unit(paragraph, "chapter", _chapter_number(chapter_match.group(1))))
+        else:
+            books[-1].units.append(Unit(paragraph, "paragraph", _paragraph_number(paragraph)))
+    return books
+
+
+def _continues_heading(line: str) -> bool:
+    """A wrapped chapter title or speaker label: lower-case start, or short and unpunctuated."""
+    return line[0].islower() or (len(line) < HEADING_LINE_MAX and not line.endswith(SENTENCE_ENDINGS))
+
+
+def segment_english(text: str) -> list[Book]:
+    """
+    Splits the raw English file (one line per source line) into books of units.
+
+    A paragraph starts at a heading, at a line beginning with "N.", or at the first
+    line after a chapter title. Footnotes (from the first "(N) ..." line to the next heading),
+    inline "(N)" footnote marks and everything after the end of the text
+    (Gutenberg licence) are dropped.
+    """
+    books: list[Book] = []
+    current: list[str] | None = None
+    after_chapter = in_footnotes = False
+
+    def flush():
+        nonlocal current
+        if current:
+            paragraph = " ".join(current)
+            books[-1].units.append(Unit(paragraph, "paragraph", _paragraph_number(paragraph)))
+        current = None
+
+    for line in (raw.strip() for raw in text.splitlines()):
+        if not line:
+            continue
+        if ENGLISH_END_RE.match(line):
+            break
+
+        book_match = ENGLISH_BOOK_RE.match(line)
+        if book_match:
+            if books:
+                flush()
+            books.append(Book(ORDINALS[book_match.group(1).lower()], [Unit(line, "book")]))
+            books[-1].units[0].number = books[-1].number
+            after_chapter = in_footnotes = False
+            continue
+        chapter_match = ENGLISH_CHAPTER_RE.match(line)
+        if not books or (in_footnotes and not chapter_match):
+            continue
+        if ENGLISH_FOOTNOTE_RE.match(line):
+            flush()
+            in_footnotes = True
+            continue
+
+        line = FOOTNOTE_MARK_RE.sub("", line)
+        if not line:
+            continue
+        if chapter_match:
+            flush()
+            books[-1].units.append(Unit(line, "chapter", _chapter_number(chapter_match.group(1))))
+            after_chapter, in_footnotes = True, False
+        elif after_chapter or (current == [] and _continues_heading(line)):
+            # The chapter title and its wrapped lines are part of the heading row
+            if not SPEAKER_LABEL_RE.match(line):
+                books[-1].units[-1].text += " " + line
+            after_chapter = False
+            current = []
+        elif NUMBERED_RE.match(line) or current is None:
+            flush()
+            current = [line]
+        else:
+            current.append(line)
+
+    if books:
+        flush()
+    return books
+
+
+def split_sentences(paragraph: str) -> list[str]:
+    """Splits an English paragraph after ., ! or ? followed by a capitalised word."""
+    sentences, start = [], 0
+    for match in SENTENCE_END_RE.finditer(paragraph):
+        sentences.append(paragraph[start:match.end()].strip())
+        start = match.end()
+    sentences.append(paragraph[start:].strip())
+    return [s for s in sentences if s]
+
+
+# === LENGTH-BASED DYNAMIC PROGRAMMING ===
+def _two_tailed_probability(delta: np.ndarray) -> np.ndarray:
+    """P(|Z| >= |delta|) for a standard normal Z, i.e. erfc(|delta| / sqrt(2)), vectorized."""
+    # Abramowitz & Stegun 7.1.26 (absolute error < 1.5e-7)
+    x = np.abs(delta) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return poly * np.exp(-x * x)
+
+
+def align_lengths(
+    latin_lengths: np.ndarray,
+    english_lengths: np.ndarray,
+    paragraph_starts: np.ndarray | None = None,
+    latin_numbers: np.ndarray | None = None,
+    english_numbers: np.ndarray | None = None,
+    ratio: float | None = None,
+    max_sentences: int = MAX_SENTENCES,
+    band_width: int = BAND_WIDTH,
+) -> tuple[list[tuple[int, int]], np.ndarray]:
+    """
+    Pairs every Latin paragraph with a run of consecutive English sentences.
+
+    Args:
+        latin_lengths: Character length of each Latin paragraph (n,).
+        english_lengths: Character length of each English sentence (m,).
+        paragraph_starts: True where an English sentence starts a paragraph (m,).
+        latin_numbers / english_numbers: "N." paragraph numbers, 0 where absent.
+        ratio: Expected English/Latin length ratio; estimated from the totals if None.
+
+    Returns:
+        The (start, end) English sentence range of each Latin paragraph, and the
+        confidence of each pair.
+    """
+    la = np.maximum(np.asarray(latin_lengths, dtype=np.float64), 1.0)
+    en = np.asarray(english_lengths, dtype=np.float64)
+    n, m = len(la), len(en)
+    if n == 0:
+        return [], np.zeros(0)
+
+    starts_paragraph = np.ones(m + 1, dtype=bool)
+    if paragraph_starts is not None:
+        starts_paragraph[:m] = paragraph_starts
+    la_numbers = np.zeros(n, dtype=np.int64) if latin_numbers is None else np.asarray(latin_numbers)
+    en_numbers = np.zeros(m + 1, dtype=np.int64)
+    if english_numbers is not None:
+        en_numbers[:m] = english_numbers
+    if ratio is None:
+        ratio = en.sum() / la.sum() if en.sum() else 1.0
+
+    # Band: for Latin paragraph i, end positions j around the length-proportional diagonal
+    en_cumulative = np.concatenate([[0.0], np.cumsum(en)])
+    la_fraction = np.concatenate([[0.0], np.cumsum(la)]) / la.sum()
+    center = np.searchsorted(en_cumulative, la_fraction * en_cumulative[-1])
+    center[-1] = m
+    width = max(band_width, max_sentences)
+    lo = np.maximum(center - width, 0)
+    offsets = np.arange(2 * width + 1)
+    ks = np.arange(max_sentences + 1)
+
+    T = len(offsets)
+
+    def block_costs(rows: slice):
+        """Cost and probability of every (paragraph, end position, run length) in the band, for a block of rows."""
+        end = lo[1:][rows, None, None] + offsets[None, :, None]           # (b, T, 1)
+        start = end - ks[None, None, :]                                    # (b, T, K+1)
+        previous_t = start - lo[:-1][rows, None, None]
+        valid = (start >= 0) & (end <= m) & (previous_t >= 0) & (previous_t < T)
+        start_c, end_c = np.clip(start, 0, m), np.clip(end, 0, m)
+        run_length = en_cumulative[end_c] - en_cumulative[start_c]
+
+        la_i = la[rows, None, None]
+        delta = (run_length - ratio * la_i) / np.sqrt(VARIANCE_PER_CHAR * la_i)
+        probability = _two_tailed_probability(delta)
+        cost = -np.log(np.maximum(probability, MIN_PROBABILITY))
+        cost += np.where(starts_paragraph[start_c], 0.0, MID_PARAGRAPH_COST)
+        numbers = la_numbers[rows, None, None]
+        cost -= np.where((numbers > 0) & (en_numbers[start_c] == numbers), NUMBER_BONUS, 0.0)
+        cost[:, :, 0] = EMPTY_COST
+        probability[:, :, 0] = 0.0
+        cost[~valid] = np.inf
+        return cost, probability, np.clip(previous_t, 0, T - 1)
+
+    # DP over rows: total[i, t] = best cost of aligning the first i paragraphs ending at lo[i] + t.
+    # Costs are computed a block of rows at a time to bound memory on long texts.
+    total = np.full((n + 1, T), np.inf)
+    total[0, 0] = 0.0
+    choice = np.zeros((n, T), dtype=np.int64)
+    chosen_probability = np.zeros((n, T))
+    for block_start in range(0, n, COST_BLOCK_ROWS):
+        rows = slice(block_start, min(block_start + COST_BLOCK_ROWS, n))
+        cost, probability, previous_t = block_costs(rows)
+        for b in range(cost.shape[0]):
+            i = block_start + b + 1
+            candidates = total[i - 1][previous_t[b]] + cost[b]
+            choice[i - 1] = np.argmin(candidates, axis=1)
+            total[i] = candidates[offsets, choice[i - 1]]
+            chosen_probability[i - 1] = probability[b][offsets, choice[i - 1]]
+
+    final_t = m - lo[n]
+    if not 0 <= final_t < T or not np.isfinite(total[n, final_t]):
+        raise ValueError("No alignment found within the band; increase band_width or max_sentences.")
+
+    pairs, confidence = [], np.zeros(n)
+    t = final_t
+    for i in range(n, 0, -1):
+        k = choice[i - 1, t]
+        j = lo[i] + t
+        pairs.append((j - k, j))
+        confidence[i - 1] = chosen_probability[i - 1, t]
+        t = j - k - lo[i - 1]
+    pairs.reverse()
+    return pairs, confidence
+
+
+# === ALIGNING A WHOLE WORK ===
+@dataclass
+class AlignedRow:
+    latin_text: str
+    english_text: str
+    confidence: float
+    kind: str                 # "anchor" (heading pair) or "paragraph"
+    english_sentences: int
+    starts_mid_paragraph: bool = False
+
+
+def _sentences(units: list[Unit]) -> tuple[list[str], list[bool], list[int]]:
+    sentences, starts, numbers = [], [], []
+    for unit in units:
+        for position, sentence in enumerate(split_sentences(unit.text)):
+            sentences.append(sentence)
+            starts.append(position == 0)
+            numbers.append((unit.number or 0) if position == 0 and unit.kind == "paragraph" else 0)
+    return sentences, starts, numbers
+
+
+def _align_span(latin: list[Unit], english: list[Unit], ratio: float) -> list[AlignedRow]:
+    sentences, starts, numbers = _sentences(english)
+    if not latin:
+        return []
+    pairs, confidence = align_lengths(
+        np.array([len(unit.text) for unit in latin]),
+        np.array([len(sentence) for sentence in sentences]),
+        np.array(starts, dtype=bool),
+        np.array([unit.number if unit.kind == "paragraph" and unit.number else 0 for unit in latin]),
+        np.array(numbers),
+        ratio=ratio,
+    )
+    return [
+        AlignedRow(
+            unit.text,
+            " ".join(sentences[start:end]),
+            round(float(score), 4),
+            "paragraph",
+            end - start,
+            end > start and not starts[start],
+        )
+        for unit, (start, end), score in zip(latin, pairs, confidence)
+    ]
+
+
+def _chapter_spans(units: list[Unit], anchors: list[int]) -> list[tuple[Unit | None, list[Unit]]]:
+    """Splits units at the anchored chapter headings: (heading or None for the intro, body)."""
+    spans: list[tuple[Unit | None, list[Unit]]] = [(None, [])]
+    for unit in units:
+        if unit.kind == "chapter" and unit.number in anchors:
+            spans.append((unit, []))
+        else:
+            spans[-1][1].append(unit)
+    return spans
+
+
+def _anchors(latin: list[Unit], english: list[Unit]) -> list[int]:
+    """Chapter numbers present exactly once on both sides and in the same order."""
+    def numbers(units):
+        found = [u.number for u in units if u.kind == "chapter"]
+        return [n for n in found if found.count(n) == 1]
+
+    la, en = numbers(latin), numbers(english)
+    common = set(la) & set(en)
+    la_order = [n for n in la if n in common]
+    en_order = [n for n in en if n in common]
+    # Keep the longest prefix in which both sides agree on the order
+    anchors = []
+    for a, b in zip(la_order, en_order):
+        if a != b:
+            break
+        anchors.append(a)
+    return anchors
+
+
+def align_book(latin: Book, english: Book, ratio: float) -> list[AlignedRow]:
+    """Aligns one book: anchored chapter headings, then paragraphs within each chapter."""
+    anchors = _anchors(latin.units, english.units)
+    rows: list[AlignedRow] = []
+
+    la_spans = _chapter_spans(latin.units, anchors)
+    en_spans = _chapter_spans(english.units, anchors)
+    for (la_heading, la_body), (en_heading, en_body) in zip(la_spans, en_spans):
+        if la_heading is not None:
+            rows.append(AlignedRow(la_heading.text, en_heading.text, 1.0, "anchor", 1))
+
+        # Book headings pair with each other when both sides have one
+        if la_body and en_body and la_body[0].kind == en_body[0].kind == "book":
+            rows.append(AlignedRow(la_body[0].text, en_body[0].text, 1.0, "anchor", 1))
+            la_body, en_body = la_body[1:], en_body[1:]
+
+        span_rows = _align_span(la_body, en_body, ratio)
+        if not la_body and en_body and rows:
+            # English without any Latin counterpart: keep it with the preceding row
+            rows[-1].english_text += " " + " ".join(unit.text for unit in en_body)
+        rows.extend(span_rows)
+    return rows
+
+
+def align_texts(latin_text: str, english_text: str) -> dict[int, list[AlignedRow]]:
+    """
+    Aligns the raw Latin and English texts of a work.
+
+    Returns:
+        dict[int, list[AlignedRow]]: Aligned rows per book number, for the books
+            found on both sides.
+    """
+    latin_books = {book.number: book for book in segment_latin(latin_text)}
+    english_books = {book.number: book for book in segment_english(english_text)}
+    shared = sorted(set(latin_books) & set(english_books))
+    for number in sorted(set(latin_books) ^ set(english_books)):
+        logger.warning(f"Book {number} found on one side only, not aligned.")
+
+    def total_length(books, kind_filter):
+        return sum(len(u.text) for n in shared for u in books[n].units if u.kind == kind_filter)
+
+    la_total = total_length(latin_books, "paragraph")
+    ratio = total_length(english_books, "paragraph") / la_total if la_total else 1.0
+
+    return {number: align_book(latin_books[number], english_books[number], ratio) for number in shared}
+
+
+def _tsv_cell(text: str) -> str:
+    return " ".join(text.split("\t")).replace("\n", " ")
+
+
+def write_alignment(rows_by_book: dict[int, list[AlignedRow]], output_dir: Path) -> list[Path]:
+    """Writes book{n}_aligned.tsv and its book{n}_alignment.tsv confidence sidecar for each book."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for number, rows in rows_by_book.items():
+        aligned_path = output_dir / f"book{number}_aligned.tsv"
+        with aligned_path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            writer.writerows([_tsv_cell(row.latin_text), _tsv_cell(row.english_text)] for row in rows)
+
+        sidecar_path = output_dir / f"book{number}_alignment.tsv"
+        with sidecar_path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            writer.writerow(["row", "kind", "confidence", "english_sentences", "starts_mid_paragraph"])
+            writer.writerows(
+                [i, row.kind, row.confidence, row.english_sentences, int(row.starts_mid_paragraph)]
+                for i, row in enumerate(rows, start=1)
+            )
+        written.append(aligned_path)
+    return written
+
+
+# === VALIDATION AGAINST A HAND ALIGNMENT ===
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z]+", text.lower())
+
+
+def compare_with_reference(rows: list[AlignedRow], reference: list[tuple[str, str]], edge_words: int = 5) -> dict:
+    """
+    Measures how many hand-aligned rows the automatic alignment reproduces.
+
+    Rows are matched on the first words of their Latin text. A matched row agrees
+    when its English text starts and ends with the same words as the reference
+    (paragraph numbers, punctuation and case are ignored, as hand edits differ there).
+
+    Returns:
+        dict: reference rows, matched rows, agreeing rows and the agreement ratio.
+    """
+    def key(text):
+        return " ".join(_words(text)[:8])
+
+    aligned = {key(row.latin_text): _words(row.english_text) for row in rows}
+    matched = agreed = 0
+    for latin, english in reference:
+        candidate = aligned.get(key(latin))
+        if candidate is None:
+            continue
+        matched += 1
+        expected = _words(english)
+        agreed += candidate[:edge_words] == expected[:edge_words] and candidate[-edge_words:] == expected[-edge_words:]
+
+    return {
+        "reference_rows": len(reference),
+        "matched_rows": matched,
+        "agreeing_rows": agreed,
+        "agreement": round(agreed / matched, 4) if matched else None,
+    }
+
+
+def read_aligned_file(path: Path) -> list[tuple[str, str]]:
+    with Path(path).open(encoding="utf-8", newline="") as f:
+        return [(row[0], row[1] if len(row) > 1 else "") for row in csv.reader(f, delimiter="\t")]
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Align the raw Latin and English texts automatically.")
+    parser.add_argument("--latin", type=Path, default=LATIN_RAW_FILE)
+    parser.add_argument("--english", type=Path, default=ENGLISH_RAW_FILE)
+    parser.add_argument("--output-dir", type=Path, default=AUTO_ALIGNED_DIR)
+    parser.add_argument("--reference-dir", type=Path, help="Hand-aligned files to compare against (e.g. data/aligned)")
+    args = parser.parse_args(argv)
+
+    rows_by_book = align_texts(read_text(args.latin), read_text(args.english))
+    written = write_alignment(rows_by_book, args.output_dir)
+
+    for number, rows in rows_by_book.items():
+        scores = np.array([row.confidence for row in rows if row.kind == "paragraph"])
+        low = int((scores < 0.05).sum())
+        median = f"{np.median(scores):.2f}" if scores.size else "n/a (no paragraphs)"
+        print(f"📖 Book {number}: {len(rows)} rows, median confidence {median}, {low} below 0.05")
+        reference = args.reference_dir / f"book{number}_aligned.tsv" if args.reference_dir else None
+        if reference is not None and reference.exists():
+            report = compare_with_reference(rows, read_aligned_file(reference))
+            agreement = "n/a" if report["agreement"] is None else f"{report['agreement']:.1%}"
+            print(f"   {report['agreeing_rows']}/{report['matched_rows']} rows agree with {reference} ({agreement})")
+    print(f"✅ Aligned files saved to: {args.output_dir} ({len(written)} books)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
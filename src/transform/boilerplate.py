@@ -0,0 +1,321 @@
+"""
+boilerplate.py
+
+Corpus-wide boilerplate and near-duplicate paragraph detection.
+
+The extract scripts drop boilerplate with fixed markers ("Gutenberg", "***",
+"LATIN LIBRARY"). That misses license blocks, tables of contents and running
+headers that are worded a little differently in every Gutenberg book. Here the
+boilerplate is learned from the corpus itself: a paragraph that recurs, exactly
+or nearly, in at least `min_sources` different extracted files is boilerplate.
+
+1. Every paragraph is reduced to word k-shingles (lowercased, letters and digits only).
+2. A MinHash signature of `permutations` values is computed per paragraph
+   (numpy, one batch of paragraphs at a time).
+3. Locality-sensitive hashing: the signature is cut into `bands` bands; two
+   paragraphs sharing any band land in the same bucket. Each paragraph is
+   compared only with the cluster leaders in its buckets and joins the first one
+   whose estimated Jaccard similarity reaches `similarity`, otherwise it starts
+   a new cluster. No pairwise comparison of the corpus is needed, so the cost is
+   linear in the number of shingles.
+4. Clusters whose paragraphs come from at least `min_sources` files are removed.
+
+Paragraphs with fewer than `min_words` words (chapter headings such as
+"CHAPTER I") are never removed: they recur across books without being boilerplate.
+
+Input: raw text files, one paragraph per block (the extract output format).
+Output: the same files without boilerplate under data/deduped/ (paths relative to
+data/ are kept; stored through src/artifacts.py like the raw files), and a JSON
+report of every removed cluster.
+
+Usage:
+        python -m src.transform.boilerplate                 # data/raw/*.txt and data/corpus/*/raw_*.txt
+        python -m src.transform.boilerplate a.txt b.txt c.txt --min-sources 3
+"""
+
+import argparse
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.artifacts import ArtifactStore, find_artifacts
+from src.config import (
+    PROJECT_ROOT,
+    RAW_DATA_DIR,
+    CORPUS_OUTPUT_DIR,
+    BOILERPLATE_OUTPUT_DIR,
+    BOILERPLATE_REPORT_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+# === DETECTION PARAMETERS ===
+SHINGLE_WORDS = 3              # k of the word k-shingles (at most len(SHINGLE_MULTIPLIERS))
+PERMUTATIONS = 64              # MinHash signature length
+BANDS = 16                     # LSH bands (PERMUTATIONS / BANDS rows each): ~50% similar pairs share a bucket
+SIMILARITY = 0.7               # Estimated Jaccard similarity to join a cluster
+MIN_SOURCES = 2                # A cluster seen in this many files is boilerplate
+MIN_WORDS = 4                  # Shorter paragraphs are never removed
+BATCH_SHINGLES = 1 << 16       # Shingles hashed per numpy batch (x PERMUTATIONS x 12 bytes of memory)
+
+SHINGLE_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+# === SHINGLES AND SIGNATURES ===
+def shingle_hashes(paragraphs: list[str], k: int = SHINGLE_WORDS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit hashes of the word k-shingles of every paragraph, concatenated.
+
+    A paragraph shorter than k words gives one shingle. Every word is hashed
+    once (pandas' vectorized string hash); a shingle combines the hashes of its
+    k words with fixed odd multipliers, so the k-word strings are never built.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The shingle hashes and the offset of each
+            paragraph's first shingle (for np.minimum.reduceat).
+    """
+    words = [TOKEN_RE.findall(paragraph.lower()) for paragraph in paragraphs]
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    flat = np.array([word for paragraph_words in words for word in paragraph_words], dtype=object)
+    hashes = pd.util.hash_array(flat) if len(flat) else np.empty(0, dtype=np.uint64)
+
+    # Each paragraph is followed by k zero hashes, so no shingle spans two paragraphs
+    padded_lengths = lengths + k
+    padded_starts = np.concatenate([[0], np.cumsum(padded_lengths)[:-1]])
+    padded = np.zeros(int(padded_lengths.sum()), dtype=np.uint64)
+    word_positions = np.repeat(padded_starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    padded[word_positions + np.arange(len(hashes))] = hashes
+
+    counts = np.maximum(lengths - k + 1, 1)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    starts = np.repeat(padded_starts - offsets, counts) + np.arange(int(counts.sum()))
+
+    combined = padded[starts] * SHINGLE_MULTIPLIERS[0]
+    for j in range(1, k):
+        combined += padded[starts + j] * SHINGLE_MULTIPLIERS[j]
+    return combined, offsets
+
+
+def _permutations(count: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=count, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=count, dtype=np.uint64, endpoint=True)
+    return a, b
+
+
+def minhash_signatures(paragraphs: list[str], permutations: int = PERMUTATIONS, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signature of every paragraph, shape (len(paragraphs), permutations).
+
+    Each permutation is a multiply-shift hash, h(x) = (a*x + b) mod 2**64 >> 32
+    with a odd, applied to the paragraph's shingle hashes; the signature holds
+    the minimum per permutation.
+    """
+    a, b = _permutations(permutations, seed)
+    signatures = np.empty((len(paragraphs), permutations), dtype=np.uint32)
+
+    start = 0
+    while start < len(paragraphs):
+        # About BATCH_SHINGLES shingles per batch (a paragraph has at most one per word)
+        end, size = start, 0
+        while end < len(paragraphs) and (end == start or size < BATCH_SHINGLES):
+            size += paragraphs[end].count(" ") + 1
+            end += 1
+
+        values, offsets = shingle_hashes(paragraphs[start:end])
+        hashed = ((values[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)).astype(np.uint32)
+        signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=0)
+        start = end
+
+    return signatures
+
+
+# === CLUSTERING ===
+def cluster_paragraphs(signatures: np.ndarray, bands: int = BANDS, similarity: float = SIMILARITY) -> np.ndarray:
+    """
+    Cluster id of every paragraph (the index of its cluster's first paragraph).
+
+    Buckets hold cluster leaders only: a paragraph is compared with at most a
+    handful of leaders, whatever the size of the corpus.
+    """
+    rows = signatures.shape[1] // bands
+    if rows * bands != signatures.shape[1]:
+        raise ValueError(f"{signatures.shape[1]} permutations cannot be split into {bands} bands")
+
+    buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+    clusters = np.empty(len(signatures), dtype=np.int64)
+
+    for i, signature in enumerate(signatures):
+        keys = [signature[band * rows:(band + 1) * rows].tobytes() for band in range(bands)]
+        leader = -1
+        for band, key in enumerate(keys):
+            for candidate in buckets[band].get(key, ()):
+                if np.mean(signatures[candidate] == signature) >= similarity:
+                    leader = candidate
+                    break
+            if leader >= 0:
+                break
+
+        if leader >= 0:
+            clusters[i] = leader
+        else:
+            clusters[i] = i
+            for band, key in enumerate(keys):
+                buckets[band].setdefault(key, []).append(i)
+    return clusters
+
+
+# === DETECTION ===
+@dataclass
+class BoilerplateReport:
+    """What remove_boilerplate dropped: per-source counts and every removed cluster."""
+    paragraphs: int = 0
+    removed: int = 0
+    per_source: dict[str, dict] = field(default_factory=dict)
+    clusters: list[dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "paragraphs": self.paragraphs,
+            "removed": self.removed,
+            "per_source": self.per_source,
+            "clusters": self.clusters,
+        }
+
+
+def remove_boilerplate(
+    documents: dict[str, list[str]],
+    min_sources: int = MIN_SOURCES,
+    min_words: int = MIN_WORDS,
+    similarity: float = SIMILARITY,
+    permutations: int = PERMUTATIONS,
+    bands: int = BANDS,
+) -> tuple[dict[str, list[str]], BoilerplateReport]:
+    """
+    Drops the paragraphs that recur (near-)identically in at least min_sources documents.
+
+    Args:
+        documents (dict[str, list[str]]): Paragraphs of each source, keyed by a source name.
+
+    Returns:
+        tuple: The documents without boilerplate (same keys, paragraph order kept),
+            and a BoilerplateReport.
+    """
+    sources = [name for name, paragraphs in documents.items() for _ in paragraphs]
+    paragraphs = [paragraph for name in documents for paragraph in documents[name]]
+    report = BoilerplateReport(paragraphs=len(paragraphs))
+    if not paragraphs:
+        return {name: [] for name in documents}, report
+
+    clusters = cluster_paragraphs(minhash_signatures(paragraphs, permutations), bands, similarity)
+
+    members: dict[int, list[int]] = {}
+    for i, cluster in enumerate(clusters):
+        members.setdefault(int(cluster), []).append(i)
+
+    drop = np.zeros(len(paragraphs), dtype=bool)
+    for leader, indices in members.items():
+        cluster_sources = sorted({sources[i] for i in indices})
+        if len(cluster_sources) < min_sources:
+            continue
+        removable = [i for i in indices if len(paragraphs[i].split()) >= min_words]
+        if not removable:
+            continue
+        drop[removable] = True
+        report.clusters.append({
+            "text": paragraphs[leader][:200],
+            "occurrences": len(removable),
+            "sources": cluster_sources,
+        })
+    report.clusters.sort(key=lambda c: (-len(c["sources"]), -c["occurrences"]))
+
+    filtered, position = {}, 0
+    for name, document in documents.items():
+        keep = ~drop[position:position + len(document)]
+        filtered[name] = [paragraph for paragraph, kept in zip(document, keep) if kept]
+        report.per_source[name] = {"paragraphs": len(document), "removed": int((~keep).sum())}
+        position += len(document)
+    report.removed = int(drop.sum())
+
+    logger.info(
+        f"Boilerplate: removed {report.removed} of {report.paragraphs} paragraphs "
+        f"in {len(report.clusters)} recurring clusters across {len(documents)} sources."
+    )
+    return filtered, report
+
+
+# === FILES ===
+def read_paragraphs(path: Path, store: ArtifactStore | None = None) -> tuple[list[str], str]:
+    """Paragraphs of a raw text file (stored artifact or plain file) and the separator it uses."""
+    store = store or ArtifactStore()
+    return list(store.iter_paragraphs(path)), store.separator(path)
+
+
+def default_sources() -> list[Path]:
+    """The Kempis raw files and the raw files of every corpus work."""
+    works = sorted(p for work_dir in CORPUS_OUTPUT_DIR.glob("*") for p in find_artifacts(work_dir, "raw_*.txt"))
+    return find_artifacts(RAW_DATA_DIR, "raw_*.txt") + works
+
+
+def output_path_for(source: Path, output_dir: Path = BOILERPLATE_OUTPUT_DIR) -> Path:
+    """data/raw/x.txt → data/deduped/raw/x.txt; files outside data/ keep only their name."""
+    data_dir = PROJECT_ROOT / "data"
+    source = Path(source).resolve()
+    relative = source.relative_to(data_dir) if source.is_relative_to(data_dir) else Path(source.name)
+    return Path(output_dir) / relative
+
+
+def dedupe_files(
+    paths: list[Path],
+    output_dir: Path = BOILERPLATE_OUTPUT_DIR,
+    report_path: Path = BOILERPLATE_REPORT_PATH,
+    store: ArtifactStore | None = None,
+    **options,
+) -> BoilerplateReport:
+    """Runs remove_boilerplate over the files and stores the filtered copies and writes the JSON report."""
+    store = store or ArtifactStore()
+    documents, separators = {}, {}
+    for path in paths:
+        documents[str(path)], separators[str(path)] = read_paragraphs(path, store)
+    filtered, report = remove_boilerplate(documents, **options)
+
+    # Each file keeps its own layout; the pipeline's template stage reads the Latin copy (see run_pipeline.py)
+    for path, paragraphs in filtered.items():
+        store.write_paragraphs(output_path_for(Path(path), output_dir), paragraphs, separators[path])
+
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(report_path).write_text(json.dumps(report.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove paragraphs that recur across extracted sources.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Raw text files (default: every extracted file)")
+    parser.add_argument("--output-dir", type=Path, default=BOILERPLATE_OUTPUT_DIR)
+    parser.add_argument("--report", type=Path, default=BOILERPLATE_REPORT_PATH)
+    parser.add_argument("--min-sources", type=int, default=MIN_SOURCES)
+    parser.add_argument("--min-words", type=int, default=MIN_WORDS)
+    parser.add_argument("--similarity", type=float, default=SIMILARITY)
+    args = parser.parse_args()
+
+    paths = args.paths or default_sources()
+    report = dedupe_files(
+        paths, args.output_dir, args.report,
+        min_sources=args.min_sources, min_words=args.min_words, similarity=args.similarity,
+    )
+    print(f"✅ {report.removed} of {report.paragraphs} paragraphs removed "
+          f"({len(report.clusters)} recurring clusters) from {len(paths)} files")
+    for cluster in report.clusters[:10]:
+        print(f"   {len(cluster['sources'])} sources x{cluster['occurrences']}: {cluster['text'][:80]!r}")
+    print(f"Filtered files in {args.output_dir}, report: {args.report}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -0,0 +1,55 @@
+"""
+books.py
+
+Book labels, chapter heading patterns, Roman numerals and discovery of the
+aligned book files. Kept free of pandas so the incremental transform can check
+whether anything changed without loading it.
+"""
+
+import re
+from pathlib import Path
+
+from src.config import INPUT_DIR
+
+# === BOOK METADATA ===
+BOOK_NAMES = {
+    1: "Book I",
+    2: "Book II",
+    3: "Book III",
+    4: "Book IV"
+}
+
+# === CHAPTER HEADINGS (aligned text, before cleaning) ===
+# "Cap. V.", "Cap. 5.", "Chap. 24." / "CHAPTER V" and the "HAPTER XXI" that lost its C in the source.
+# Unanchored RE2 syntax, so pyarrow.compute can run them too; the number is the named group "chapter".
+LATIN_CHAPTER_RE = r"C(?:h)?ap\.\s*(?P<chapter>[IVXLCDM]+|\d+)\b"
+ENGLISH_CHAPTER_RE = r"C?HAPTER\s+(?P<chapter>[IVXLCDM]+|\d+)\b"
+
+# === ROMAN NUMERALS (book labels, chapter numbers) ===
+ROMAN_VALUES = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+def from_roman(numeral: str) -> int:
+    """"XIV" (or "xiv") → 14. A smaller value before a larger one is subtracted."""
+    values = [ROMAN_VALUES[ch] for ch in numeral.upper()]
+    return sum(-v if i + 1 < len(values) and v < values[i + 1] else v for i, v in enumerate(values))
+
+def to_roman(number: int) -> str:
+    numerals = [
+        (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+        (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+    ]
+    roman = ""
+    for value, letters in numerals:
+        count, number = divmod(number, value)
+        roman += letters * count
+    return roman
+
+# === BOOK DISCOVERY ===
+def find_book_numbers(input_dir: Path = INPUT_DIR) -> list[int]:
+    """Returns the book numbers of every book{n}_aligned.tsv in input_dir, in numeric order."""
+    numbers = [
+        int(match.group(1))
+        for file in Path(input_dir).glob("book*_aligned.tsv")
+        if (match := re.fullmatch(r"book(\d+)_aligned\.tsv", file.name))
+    ]
+    return sorted(numbers)
@@ -0,0 +1,119 @@
+"""
+chapters.py
+
+Structural segmentation of the aligned books into chapters.
+
+Headings are recognised on the raw aligned text, before the cleaner strips
+"Cap. 5." and "CHAPTER" from it:
+
+- book headings: "Liber Primus: ..." / "THE FIRST BOOK: ..."
+- chapter headings: "Cap. V.", "Cap. 5.", "Chap. 24." / "CHAPTER V" (and the
+  "HAPTER XXI" that lost its C in the source)
+
+A row is a chapter heading when either side is one (book III chapter 13 has
+no English). Numbers are then derived for the whole frame at once:
+
+- chapter_number: running count of chapter headings (0 for the book title and
+  any preface before the first chapter)
+- paragraph_in_chapter: rows since the last heading (0 on heading rows)
+- chapter_id: "<book in Roman numerals>.<chapter_number>", e.g. "III.13"
+
+The chapter dimension table (one row per chapter_id, with its Latin and English
+titles and paragraph count) is built from the heading rows of the fact table.
+"""
+
+import logging
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import CHAPTERS_PATH
+from src.transform.books import ENGLISH_CHAPTER_RE, LATIN_CHAPTER_RE
+
+logger = logging.getLogger(__name__)
+
+LATIN_BOOK_RE = re.compile(r"^\s*Liber\s+\w+\s*:")
+ENGLISH_BOOK_RE = re.compile(r"^\s*THE\s+\w+\s+BOOK\b")
+
+# What the cleaner leaves of a Roman chapter number ("I. De imitatione", "XII Of the inward growth")
+TITLE_NUMBER_RE = r"^[IVXLCDM]+\.?\s+"
+
+# heading values
+PARAGRAPH, BOOK, CHAPTER = "", "book", "chapter"
+
+
+# === HEADINGS (raw text) ===
+def find_headings(latin: pd.Series, english: pd.Series) -> pd.Series:
+    """"book", "chapter" or "" (a paragraph) for every row of raw, uncleaned aligned text."""
+    latin, english = latin.fillna("").astype(str), english.fillna("").astype(str)
+    is_chapter = latin.str.match(rf"\s*{LATIN_CHAPTER_RE}") | english.str.match(rf"\s*{ENGLISH_CHAPTER_RE}")
+    is_book = latin.str.match(LATIN_BOOK_RE) | english.str.match(ENGLISH_BOOK_RE)
+    kind = np.select([is_chapter.to_numpy(bool), is_book.to_numpy(bool)], [CHAPTER, BOOK], PARAGRAPH)
+    return pd.Series(kind, index=latin.index, dtype=object)
+
+
+# === NUMBERS (cumulative) ===
+def number_chapters(headings: pd.Series, previous: tuple[int, int] = (0, 0)) -> pd.DataFrame:
+    """
+    chapter_number and paragraph_in_chapter of every row of one book, from its headings.
+
+    previous is (chapter_number, paragraph_in_chapter) of the row just before
+    `headings`, so a book processed in chunks is numbered as if read whole.
+    """
+    kind = headings.to_numpy(dtype=object)
+    position = np.arange(len(kind))
+    last_heading = np.maximum.accumulate(np.where(kind != PARAGRAPH, position, -1)) if len(kind) else position
+
+    chapter = previous[0] + np.cumsum(kind == CHAPTER)
+    paragraph = np.where(last_heading >= 0, position - last_heading, previous[1] + position + 1)
+    return pd.DataFrame({"chapter_number": chapter, "paragraph_in_chapter": paragraph}, index=headings.index)
+
+
+def chapter_ids(book_roman: str, chapter_number: pd.Series) -> pd.Series:
+    return book_roman + "." + chapter_number.astype(str)
+
+
+# === CHAPTER DIMENSION ===
+def chapter_table(fact_table: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per chapter: chapter_id, book_id, chapter_number, chapter_title_latin,
+    chapter_title_english and paragraphs (rows after the heading), in fact table order.
+    """
+    keys = ["chapter_id", "book_id", "chapter_number"]
+    in_chapter = fact_table["paragraph_in_chapter"] > 0
+    table = in_chapter.groupby([fact_table[key] for key in keys], sort=False, observed=True).sum()
+    table = table.rename("paragraphs").reset_index()
+
+    headings = fact_table.loc[~in_chapter, keys + ["latin_text", "english_text"]].drop_duplicates("chapter_id")
+    numbered = headings["chapter_number"] > 0          # chapter 0 is titled by the book heading
+    titles = pd.DataFrame({"chapter_id": headings["chapter_id"].astype(str)})
+    for side in ("latin", "english"):
+        text = headings[f"{side}_text"].astype(str)
+        titles[f"chapter_title_{side}"] = text.where(~numbered, text.str.replace(TITLE_NUMBER_RE, "", n=1, regex=True))
+
+    table["chapter_id"] = table["chapter_id"].astype(str)
+    table = table.merge(titles, on="chapter_id", how="left")
+    return table[["chapter_id", "book_id", "chapter_number", "chapter_title_latin", "chapter_title_english", "paragraphs"]]
+
+
+def write_chapter_table(fact_table: pd.DataFrame, path: Path = CHAPTERS_PATH) -> int:
+    table = chapter_table(fact_table)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(path, sep="\t", index=False, encoding="utf-8")
+    logger.info(f"Chapter table written: {len(table)} chapters → {path}")
+    return len(table)
+
+
+def main():
+    from src.config import OUTPUT_PATH
+    from src.transform.enrich_kempis import read_fact_table
+
+    chapters = write_chapter_table(read_fact_table(OUTPUT_PATH))
+    print(f"✅ {chapters} chapters saved to: {CHAPTERS_PATH}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -35,6 +35,8 @@ from src.config import INPUT_DIR
 import pandas as pd
 import re
 from pathlib import Path
+from src.transform.chapters import find_headings
+from src.transform.segment import Segmenter, segment_column
 
 # === BOOK NAMES ===
 BOOK_NAMES = {
@@ -45,21 +47,39 @@ BOOK_NAMES = {
 }
 
 # === TEXT CLEANER ===
+# Leading "Cap. 5.", "CHAPTER", "3." and stray "." markers, removed in one anchored pass.
+# Equivalent to applying the three patterns one after the other.
+PREFIX_RE = re.compile(
+    r'^(?:(?:cap\.|chapter)\s*\d*\.*\s*)?(?:\d+\.\s*)?(?:\.\s*)?',
+    flags=re.IGNORECASE,
+)
+
 def clean_text_column(series: pd.Series) -> pd.Series:
-    def clean_line(text):
-        text = str(text).strip()
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'^(cap\.|chapter)\s*\d*\.*\s*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'^\d+\.\s*', '', text)
-        text = re.sub(r'^\.\s*', '', text)
-        return text.strip()
+    r"""
+    Strips whitespace, collapses inner whitespace runs to one space and removes
+    chapter/paragraph numbering prefixes, column-wise.
+
+    Output is identical to cleaning each cell with:
+        strip → re.sub(r'\s+', ' ') → drop Cap./CHAPTER, "N." and "." prefixes → strip
+
+    Only rows that can contain a whitespace run (a double space, or a tab/newline/
+    non-breaking space, all of which are non-printable) go through split/join;
+    every other row already has single spaces.
+    """
+    # Object dtype keeps Python's str semantics (str.strip, \s) whatever the pandas string backend
+    text = series.astype(str).fillna("nan").astype(object).str.strip()
+
+    irregular = text.str.contains("  ", regex=False) | ~text.map(str.isprintable).astype(bool)
+    if irregular.any():
+        text = text.where(~irregular, text[irregular].str.split().str.join(" "))
 
-    return series.astype(str).apply(clean_line)
+    # The prefix pattern is anchored, so one substitution per cell is enough
+    text = text.str.replace(PREFIX_RE, "", n=1, regex=True).str.strip()
+    return text.astype(str)
 
 # === CLEAN SINGLE BOOK ===
-def clean_aligned_book(book_number: int) -> pd.DataFrame:
-    book_label = BOOK_NAMES[book_number]
-    input_file = INPUT_DIR / f'book{book_number}_aligned.tsv'
+def clean_aligned_book(book_number: int, input_dir: Path = INPUT_DIR, segmenter: Segmenter | None = None) -> pd.DataFrame:
+    input_file = Path(input_dir) / f'book{book_number}_aligned.tsv'
 
     if not input_file.exists():
         print(f"❌ File not found: {input_file}")
@@ -67,7 +87,11 @@ def clean_aligned_book(book_number: int) -> pd.DataFrame:
 
     df = pd.read_csv(input_file, sep='\t', names=["latin_text", "english_text"], encoding='utf-8')
 
+    # Headings are found before cleaning, which removes "Cap. 5." and "CHAPTER"
+    df["heading"] = find_headings(df["latin_text"], df["english_text"])
     df["latin_text"] = clean_text_column(df["latin_text"])
     df["english_text"] = clean_text_column(df["english_text"])
+    if segmenter is not None:
+        df["latin_text"] = segment_column(df["latin_text"], segmenter, f"Book {book_number}")
 
     return df
\ No newline at end of file
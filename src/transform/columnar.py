@@ -0,0 +1,186 @@
+"""
+columnar.py
+
+Typed, columnar (Parquet) copy of the paragraph fact table, partitioned by book.
+
+Layout (Hive-style, readable by pyarrow, pandas, DuckDB, Spark, ...):
+
+    data/cleaned/imitation_parquet/          → symlink to the current .imitation_parquet-<version>/
+        book_id=1/part-0.parquet
+        book_id=2/part-0.parquet
+        ...
+
+- Every column has an explicit Arrow type (small integers, dictionary-encoded
+  chapter ids, UTF-8 text).
+- The text columns are compressed with zstd, the small columns with snappy.
+- `book_id` lives in the directory name, so a reader asking for one book only
+  opens that partition, and only the requested columns are decoded.
+
+Usage:
+        python -m src.transform.columnar        # converts imitation_cleaned.tsv
+"""
+
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.config import OUTPUT_PATH, PARQUET_OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMN = "book_id"
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int16())]), flavor="hive")
+
+# Explicit Arrow type of every known fact table column
+COLUMN_TYPES = {
+    "id": pa.int32(),
+    "chapter_number": pa.int16(),
+    "chapter_id": pa.dictionary(pa.int16(), pa.string()),
+    "paragraph_number": pa.int32(),
+    "paragraph_in_chapter": pa.int16(),
+    "latin_text": pa.string(),
+    "english_text": pa.string(),
+}
+
+TEXT_COLUMNS = ("latin_text", "english_text")
+TEXT_COMPRESSION = "zstd"
+TEXT_COMPRESSION_LEVEL = 9
+DEFAULT_COMPRESSION = "snappy"
+
+
+def fact_schema(columns: list[str]) -> pa.Schema:
+    """Arrow schema for the given (non-partition) columns, in order."""
+    unknown = [col for col in columns if col not in COLUMN_TYPES]
+    if unknown:
+        raise ValueError(f"No Arrow type declared for columns: {unknown}")
+    return pa.schema([(col, COLUMN_TYPES[col]) for col in columns])
+
+
+def _versions(root: Path) -> list[Path]:
+    """The version folders written for root, current and previous ones included."""
+    return [p for p in root.parent.glob(f".{root.name}-*") if p.is_dir() and not p.is_symlink()]
+
+
+def write_parquet(df: pd.DataFrame, root: Path = PARQUET_OUTPUT_DIR) -> list[Path]:
+    """
+    Writes the fact table as one Parquet file per book under root.
+
+    Every write goes to a new version folder next to root, and root is a
+    symlink to the current version, swapped in one os.replace: readers see the
+    old or the new dataset, never a half-written or missing one. The previous
+    version is kept until the next write, so a read that started on it can
+    finish; older ones are deleted. Reruns are idempotent.
+
+    Returns:
+        list[Path]: The written partition files.
+    """
+    root = Path(root)
+    columns = [col for col in df.columns if col != PARTITION_COLUMN]
+    schema = fact_schema(columns)
+    compression = {
+        col: TEXT_COMPRESSION if col in TEXT_COLUMNS else DEFAULT_COMPRESSION for col in columns
+    }
+    compression_level = {col: TEXT_COMPRESSION_LEVEL for col in columns if col in TEXT_COLUMNS}
+
+    root.parent.mkdir(parents=True, exist_ok=True)
+    version = root.with_name(f".{root.name}-{uuid.uuid4().hex[:12]}")
+    link = version.with_name(f"{version.name}.link")
+    version.mkdir()                 # a plain mkdir: the umask sets the mode
+    written = []
+    try:
+        for book_id, book_df in df.groupby(PARTITION_COLUMN, sort=True):
+            table = pa.Table.from_pandas(book_df[columns], schema=schema, preserve_index=False)
+            part_dir = version / f"{PARTITION_COLUMN}={int(book_id)}"
+            part_dir.mkdir()
+            pq.write_table(
+                table,
+                part_dir / "part-0.parquet",
+                compression=compression,
+                compression_level=compression_level,
+                use_dictionary=["chapter_id"],
+            )
+            written.append(root / part_dir.name / "part-0.parquet")
+
+        previous = root.with_name(os.readlink(root)) if root.is_symlink() else None
+        if previous is None and root.is_dir():
+            # A dataset written before versions: moved aside once, then treated as the previous version
+            previous = root.with_name(f".{root.name}-unversioned")
+            root.rename(previous)
+        os.symlink(version.name, link)
+        os.replace(link, root)
+    except BaseException:
+        link.unlink(missing_ok=True)
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+
+    for old in _versions(root):
+        if old not in (version, previous):
+            shutil.rmtree(old, ignore_errors=True)
+
+    logger.info(f"Wrote {len(df)} rows in {len(written)} partitions to {root} ({version.name})")
+    return written
+
+
+def read_parquet(
+    root: Path = PARQUET_OUTPUT_DIR,
+    columns: list[str] | None = None,
+    book_ids: list[int] | None = None,
+) -> pd.DataFrame:
+    """
+    Reads the partitioned fact table with column and partition pruning.
+
+    Args:
+        root (Path): Dataset folder written by write_parquet.
+        columns (list[str] | None): Columns to load (may include book_id). None loads all.
+        book_ids (list[int] | None): Books to load. Other partitions are not opened.
+
+    Returns:
+        pd.DataFrame: The selected rows and columns, ordered by book then file order.
+    """
+    root = Path(root)
+    # Numeric book order (directory listing would put book_id=10 before book_id=2)
+    files = sorted(
+        root.glob(f"{PARTITION_COLUMN}=*/*.parquet"),
+        key=lambda f: (int(f.parent.name.split("=", 1)[1]), f.name),
+    )
+    if not files:
+        raise FileNotFoundError(f"No Parquet partitions found under {root}")
+
+    dataset = ds.dataset(
+        [str(f) for f in files],
+        format="parquet",
+        partitioning=PARTITIONING,
+        partition_base_dir=str(root),
+    )
+    row_filter = ds.field(PARTITION_COLUMN).isin(book_ids) if book_ids is not None else None
+
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    df = table.to_pandas()
+
+    if "chapter_id" in df.columns:  # dictionary → plain strings, as in the TSV
+        df["chapter_id"] = df["chapter_id"].astype(str)
+    if columns is None:
+        # Put the partition column back where it sits in the TSV
+        ordered = ["id", PARTITION_COLUMN] + [c for c in df.columns if c not in ("id", PARTITION_COLUMN)]
+        df = df[[c for c in ordered if c in df.columns]]
+    return df
+
+
+def main():
+    from src.transform.enrich_kempis import read_fact_table
+
+    df = read_fact_table(OUTPUT_PATH)
+    write_parquet(df, PARQUET_OUTPUT_DIR)
+    print(f"✅ Columnar fact table saved to: {PARQUET_OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
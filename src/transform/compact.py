@@ -0,0 +1,102 @@
+"""
+compact.py
+
+Compact in-memory representation of the paragraph fact table.
+
+With default dtypes every cell of `book`, `chapter_id` and the text columns
+is a separate Python object (about 50 bytes of overhead per string on top of
+the text) and every number is an int64. compact_fact_table converts:
+
+- id, book_id, paragraph_number, chapter_number → the smallest integer type
+  that holds their values
+- book, chapter_id → categoricals (each distinct label stored once, rows hold
+  a small integer code)
+- latin_text, english_text → Arrow-backed strings (one contiguous UTF-8 buffer
+  plus offsets per column, no per-cell objects)
+
+Values are unchanged: the compact frame writes the same TSV and compares equal
+cell by cell. memory_report shows the bytes per column before and after.
+
+Usage:
+        python -m src.transform.compact                 # report for imitation_cleaned.tsv
+        python -m src.transform.compact --scale 10      # the same table repeated 10 times
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import OUTPUT_PATH
+
+INTEGER_COLUMNS = ("id", "book_id", "paragraph_number", "chapter_number", "paragraph_in_chapter")
+CATEGORY_COLUMNS = ("book", "chapter_id")
+TEXT_COLUMNS = ("latin_text", "english_text")
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+
+
+def compact_fact_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a copy of the fact table with compact dtypes (see the module docstring)."""
+    compact = df.copy()
+    for col in compact.columns:
+        if col in INTEGER_COLUMNS:
+            compact[col] = pd.to_numeric(compact[col], downcast="integer")
+        elif col in CATEGORY_COLUMNS:
+            compact[col] = compact[col].astype("category")
+        elif col in TEXT_COLUMNS:
+            compact[col] = compact[col].astype(TEXT_DTYPE)
+    return compact
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bytes per column (deep, i.e. including the strings themselves) before and after.
+
+    The last row, "total", also counts the index.
+    """
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "bytes_before": before.memory_usage(deep=True, index=False),
+        "dtype_after": after.dtypes.astype(str),
+        "bytes_after": after.memory_usage(deep=True, index=False),
+    })
+    report.loc["total"] = [
+        "", before.memory_usage(deep=True).sum(), "", after.memory_usage(deep=True).sum(),
+    ]
+    report["saved"] = (1 - report["bytes_after"] / report["bytes_before"]).map("{:.0%}".format)
+    return report
+
+
+def text_bytes(df: pd.DataFrame) -> int:
+    """UTF-8 size of the text columns: the floor any in-memory representation has to hold."""
+    return int(sum(df[col].astype(str).str.encode("utf-8").str.len().sum() for col in TEXT_COLUMNS if col in df))
+
+
+def main():
+    from src.transform.enrich_kempis import read_fact_table
+
+    parser = argparse.ArgumentParser(description="Memory used by the fact table with default and compact dtypes.")
+    parser.add_argument("--input", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the table N times (ids renumbered)")
+    args = parser.parse_args()
+
+    # Plain object columns, as the transform builds them
+    df = read_fact_table(args.input).astype({col: object for col in ("chapter_id", *TEXT_COLUMNS)})
+    if args.scale > 1:
+        df = pd.concat([df] * args.scale, ignore_index=True)
+        df["id"] = range(1, len(df) + 1)
+
+    compact = compact_fact_table(df)
+    report = memory_report(df, compact)
+    print(report.to_string())
+
+    rows, raw = len(df), text_bytes(df)
+    before, after = report.loc["total", "bytes_before"], report.loc["total", "bytes_after"]
+    print(f"\n{rows:,} rows, {raw / 1e6:.1f} MB of UTF-8 text")
+    print(f"per row: {before / rows:,.0f} → {after / rows:,.0f} bytes "
+          f"({before / raw:.2f}x → {after / raw:.2f}x the raw text)")
+    print(f"10x corpus: {10 * before / 1e6:,.0f} MB → {10 * after / 1e6:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
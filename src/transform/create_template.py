@@ -4,35 +4,47 @@ create_template.py
 Creates a CSV file with one column of Latin paragraphs and a blank column for manual English alignment.
 Output: Desktop/latin_alignment_sheet.csv
 
-
+Run-together words of the extracted text ("PrimusAdmonitiones") are split
+first (see segment.py).
 """
 
 
 import csv
 from pathlib import Path
-from src.config import LATIN_RAW_FILE, TEMPLATE_OUTPUT_FILE
-
-def read_latin_text(input_path: Path) -> list[str]:
-    if not input_path.exists():
+from typing import Iterable, Iterator
+from src.artifacts import ArtifactStore
+from src.config import DEDUPED_LATIN_FILE, TEMPLATE_OUTPUT_FILE
+from src.transform.segment import Segmenter, corpus_segmenter
+
+def read_latin_text(input_path: Path, store: ArtifactStore | None = None) -> Iterator[str]:
+    """Streams the Latin paragraphs from the artifact store (or the plain raw file)."""
+    store = store or ArtifactStore()
+    if not store.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
-    
-    with input_path.open("r", encoding="utf-8") as f:
-        contents = f.read()
-    
-    paragraphs = [p.strip() for p in contents.split("\n\n") if p.strip()]
-    return paragraphs
-
-def write_alignment_template(paragraphs: list[str], output_path: Path) -> None:
+    return store.iter_paragraphs(input_path)
+
+def read_segmented_latin_text(
+    input_path: Path, store: ArtifactStore | None = None, segmenter: Segmenter | None = None
+) -> Iterator[str]:
+    """read_latin_text with run-together tokens split by the same corpus lexicon the clean stage uses."""
+    segmenter = segmenter or corpus_segmenter()
+    paragraphs = read_latin_text(input_path, store)
+    return (segmenter.fix(p, f"Paragraph {i}") for i, p in enumerate(paragraphs, 1))
+
+def write_alignment_template(paragraphs: Iterable[str], output_path: Path) -> int:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    rows = 0
     with output_path.open("w", encoding="utf-8", newline="") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["Latin Paragraph", "English Paragraph (Manual)"])
         for paragraph in paragraphs:
             writer.writerow([paragraph, ""])
+            rows += 1
+    return rows
 
 def main():
-    paragraphs = read_latin_text(LATIN_RAW_FILE)
+    paragraphs = read_segmented_latin_text(DEDUPED_LATIN_FILE)
     write_alignment_template(paragraphs, TEMPLATE_OUTPUT_FILE)
 
 if __name__ == "__main__":
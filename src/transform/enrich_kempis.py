@@ -2,56 +2,106 @@
 
 """
 
-from src.config import OUTPUT_PATH
+from src.config import OUTPUT_PATH, INPUT_DIR, TRANSFORM_CHUNK_ROWS
 
+import argparse
 import pandas as pd
 from pathlib import Path
+from src.transform.books import BOOK_NAMES, find_book_numbers, to_roman
+from src.transform.chapters import chapter_ids, number_chapters
 from src.transform.clean_kempis import clean_aligned_book
-
-# === BOOK METADATA ===
-BOOK_NAMES = {
-    1: "Book I",
-    2: "Book II",
-    3: "Book III",
-    4: "Book IV"
-}
+from src.transform.segment import Segmenter, corpus_segmenter
 
 # === WORD COUNTER ===
 def word_count(text):
     return len(str(text).split())
 
 # === ENRICHMENT FUNCTION: TRANSFORM TO STAR-SCHEMA FACT TABLE===
-def enrich_book_to_fact(df: pd.DataFrame, book_number: int) -> pd.DataFrame:
+def enrich_book_to_fact(
+    df: pd.DataFrame, book_number: int, first_paragraph: int = 1, previous: tuple[int, int] = (0, 0)
+) -> pd.DataFrame:
+    # first_paragraph > 1 and previous = (chapter_number, paragraph_in_chapter) of the last row
+    # already written when df is a later chunk of the book (see streaming.py)
+    # df["heading"] comes from chapters.find_headings on the raw text (see clean_aligned_book)
 
     df["book_id"] = book_number
-    df["book"] = BOOK_NAMES[book_number]
-    df["paragraph_number"] = range(1, len(df) + 1)
-    
-    roman = ["I", "II", "III", "IV"][book_number - 1]
-    df["chapter_id"] = roman + "." + df["paragraph_number"].astype(str)
+    df["book"] = BOOK_NAMES.get(book_number, f"Book {to_roman(book_number)}")
+    df["paragraph_number"] = range(first_paragraph, first_paragraph + len(df))
+
+    chapters = number_chapters(df["heading"], previous)
+    df["chapter_number"] = chapters["chapter_number"]
+    df["paragraph_in_chapter"] = chapters["paragraph_in_chapter"]
+    df["chapter_id"] = chapter_ids(to_roman(book_number), df["chapter_number"])
     
     return df[[
         "book_id",
+        "chapter_number",
         "chapter_id",
         "paragraph_number",
+        "paragraph_in_chapter",
         "latin_text",
         "english_text"
     ]]
 
-# === MAIN ===
-if __name__ == "__main__":
+# === FACT TABLE FOR A WHOLE WORK ===
+def build_fact_table(input_dir: Path = INPUT_DIR, segmenter: Segmenter | None = None) -> pd.DataFrame:
+    # The segmenter's lexicon spans every book, so it is built before any book is cleaned
+    if segmenter is None:
+        segmenter = corpus_segmenter(input_dir)
     all_books = []
 
-    for book_number in range(1, 5):
-        df = clean_aligned_book(book_number)
+    for book_number in find_book_numbers(input_dir):
+        df = clean_aligned_book(book_number, input_dir, segmenter)
         if df is not None:
-            enriched = enrich_book_to_fact (df, book_number)
+            enriched = enrich_book_to_fact(df, book_number)
             all_books.append(enriched)
 
     combined_df = pd.concat(all_books, ignore_index=True)
     combined_df.insert(0, "id", range(1, len(combined_df) + 1))
+    return combined_df
+
+# === READ BACK THE FACT TABLE ===
+FACT_TABLE_DTYPES = {
+    "id": "int64",
+    "book_id": "int64",
+    "chapter_number": "int64",
+    "chapter_id": "str",
+    "paragraph_number": "int64",
+    "paragraph_in_chapter": "int64",
+    "latin_text": "str",
+    "english_text": "str",
+}
+
+def read_fact_table(path: Path = OUTPUT_PATH, compact: bool = False) -> pd.DataFrame:
+    """
+    Loads the fact table TSV with its column types; text is never turned into NaN.
+    compact=True returns the low-memory representation of transform/compact.py.
+    """
+    df = pd.read_csv(path, sep="\t", keep_default_na=False, encoding="utf-8", dtype=str)
+    df = df.astype({col: dtype for col, dtype in FACT_TABLE_DTYPES.items() if col in df.columns})
+    if compact:
+        from src.transform.compact import compact_fact_table
+        df = compact_fact_table(df)
+    return df
+
+# === MAIN ===
+def main():
+    # Only books whose aligned file changed since the last run are reprocessed
+    from src.transform.incremental import run_incremental
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    combined_df.to_csv(OUTPUT_PATH, sep='\t', index=False, encoding='utf-8')
+    parser = argparse.ArgumentParser(description="Build the paragraph fact table.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every book, ignoring the manifest")
+    parser.add_argument("--chunk-rows", type=int, default=TRANSFORM_CHUNK_ROWS,
+                        help="Stream full rebuilds in chunks of this many rows (0 = in memory)")
+    args = parser.parse_args()
 
-    print(f"\n✅ Star-schema-style paragraph fact table saved to: {OUTPUT_PATH}")
\ No newline at end of file
+    report = run_incremental(INPUT_DIR, OUTPUT_PATH, full=args.full, chunk_rows=args.chunk_rows)
+
+    if report["skipped"]:
+        print(f"⏭️  Skipped unchanged books: {report['skipped']}")
+    if report["rebuilt"]:
+        print(f"🔁 Rebuilt books: {report['rebuilt']}")
+    print(f"\n✅ Star-schema-style paragraph fact table saved to: {OUTPUT_PATH} ({report['rows']} rows)")
+
+if __name__ == "__main__":
+    main()
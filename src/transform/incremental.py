@@ -0,0 +1,211 @@
+"""
+incremental.py
+
+Incremental build of the paragraph fact table (imitation_cleaned.tsv).
+
+A manifest next to the output records, for every book{n}_aligned.tsv, the
+SHA-256 of its content and the range of rows it produced in the output.
+On the next run only the books whose hash changed (or that are new) are
+cleaned and enriched again. The rows of every other book are spliced in from
+the existing output, and the global `id` column is renumbered, so the result
+is exactly what a full rebuild would write.
+
+A full rebuild is done when there is no manifest, when the output file was
+modified outside the pipeline (its hash no longer matches), when the transform
+code itself changed, or on request. The run-together token corrections
+(segment.py) are learned from the whole corpus, so a changed book can change
+them for the others: their hash is kept too, and a different set of corrections
+also means a full rebuild.
+
+pandas and the modules that build rows are imported only once something has
+to be rebuilt: the "nothing changed" check needs just hashlib and json.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.config import INPUT_DIR, OUTPUT_PATH, SEGMENTATION_KEEP_PATH, TRANSFORM_MANIFEST_PATH, TRANSFORM_CHUNK_ROWS
+from src.transform.books import find_book_numbers
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# The modules whose code decides the rows (hashed from their files, without importing them)
+TRANSFORM_MODULES = ("books.py", "chapters.py", "clean_kempis.py", "enrich_kempis.py", "segment.py", "streaming.py")
+
+
+def file_sha256(path: Path) -> str:
+    """Returns the hex SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_sha256() -> str:
+    """Hash of the modules that produce the rows (and of the segmentation keep-list); any edit forces a full rebuild."""
+    digest = hashlib.sha256()
+    for name in TRANSFORM_MODULES:
+        digest.update(file_sha256(Path(__file__).parent / name).encode("ascii"))
+    if SEGMENTATION_KEEP_PATH.exists():
+        digest.update(file_sha256(SEGMENTATION_KEEP_PATH).encode("ascii"))
+    return digest.hexdigest()
+
+
+def corrections_sha256(corrections: dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(corrections, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_manifest(manifest_path: Path, output_path: Path) -> dict | None:
+    """Returns the stored manifest if it is usable for an incremental run, else None."""
+    if not manifest_path.exists() or not output_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError:
+        logger.warning(f"Unreadable transform manifest, rebuilding: {manifest_path}")
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    if manifest.get("code_sha256") != code_sha256():
+        logger.info("Transform code changed since the last run, rebuilding from scratch.")
+        return None
+    if manifest.get("output_sha256") != file_sha256(output_path):
+        logger.warning("Output changed since the last run, rebuilding from scratch.")
+        return None
+    return manifest
+
+
+def _write_outputs(
+    fact_table: "pd.DataFrame", books: dict, output_path: Path, manifest_path: Path, segmentation: str
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fact_table.to_csv(output_path, sep="\t", index=False, encoding="utf-8")
+    _write_manifest(books, output_path, manifest_path, segmentation)
+
+
+def _write_manifest(books: dict, output_path: Path, manifest_path: Path, segmentation: str) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "code_sha256": code_sha256(),
+        "output_sha256": file_sha256(output_path),
+        "segmentation_sha256": segmentation,
+        "books": books,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def _row_ranges(book_sizes: list[tuple[int, int]], hashes: dict[int, str]) -> dict:
+    """Builds the manifest entries (hash + output row range) from (book_number, rows) in output order."""
+    books = {}
+    start = 0
+    for book_number, size in book_sizes:
+        books[f"book{book_number}_aligned.tsv"] = {
+            "book_number": book_number,
+            "sha256": hashes[book_number],
+            "row_start": start,
+            "row_end": start + size,
+        }
+        start += size
+    return books
+
+
+def run_incremental(
+    input_dir: Path = INPUT_DIR,
+    output_path: Path = OUTPUT_PATH,
+    manifest_path: Path = TRANSFORM_MANIFEST_PATH,
+    full: bool = False,
+    chunk_rows: int = TRANSFORM_CHUNK_ROWS,
+) -> dict:
+    """
+    Brings the fact table at output_path up to date with the aligned files in input_dir.
+
+    Args:
+        input_dir (Path): Folder with the book{n}_aligned.tsv files.
+        output_path (Path): The fact table (TSV) to create or update.
+        manifest_path (Path): Where the content-hash manifest is stored.
+        full (bool): Ignore the manifest and rebuild every book.
+        chunk_rows (int): When > 0, full rebuilds are streamed in chunks of this many
+            rows (bounded memory, same output). Partial updates are always in memory.
+
+    Returns:
+        dict: Report with "mode" ("full", "incremental" or "unchanged"), and the
+            book numbers that were "rebuilt", "skipped" and "removed", plus "rows".
+    """
+    input_dir, output_path, manifest_path = Path(input_dir), Path(output_path), Path(manifest_path)
+    book_numbers = find_book_numbers(input_dir)
+    hashes = {n: file_sha256(input_dir / f"book{n}_aligned.tsv") for n in book_numbers}
+
+    manifest = None if full else _read_manifest(manifest_path, output_path)
+
+    if manifest is not None:
+        previous = {entry["book_number"]: entry for entry in manifest["books"].values()}
+        changed = [n for n in book_numbers if previous.get(n, {}).get("sha256") != hashes[n]]
+        skipped = [n for n in book_numbers if n not in changed]
+        removed = sorted(set(previous) - set(book_numbers))
+
+        if not changed and not removed:
+            rows = max((entry["row_end"] for entry in previous.values()), default=0)
+            logger.info(f"All {len(skipped)} books unchanged, nothing to do.")
+            return {"mode": "unchanged", "rebuilt": [], "skipped": skipped, "removed": [], "rows": rows}
+
+    # Rows have to be rebuilt from here on
+    import pandas as pd
+    from src.transform.clean_kempis import clean_aligned_book
+    from src.transform.enrich_kempis import build_fact_table, enrich_book_to_fact
+    from src.transform.segment import corpus_segmenter
+    from src.transform.streaming import stream_fact_table
+
+    segmenter = corpus_segmenter(input_dir)
+    segmentation = corrections_sha256(segmenter.corrections())
+    if manifest is not None and manifest.get("segmentation_sha256") != segmentation:
+        logger.info("Run-together token corrections changed, rebuilding from scratch.")
+        manifest = None
+
+    if manifest is None:
+        if chunk_rows > 0:
+            sizes = stream_fact_table(input_dir, output_path, chunk_rows, segmenter)
+            _write_manifest(_row_ranges(sizes, hashes), output_path, manifest_path, segmentation)
+        else:
+            fact_table = build_fact_table(input_dir, segmenter)
+            sizes = [(int(n), int(size)) for n, size in fact_table.groupby("book_id", sort=False).size().items()]
+            _write_outputs(fact_table, _row_ranges(sizes, hashes), output_path, manifest_path, segmentation)
+        rows = sum(size for _, size in sizes)
+        report = {"mode": "full", "rebuilt": book_numbers, "skipped": [], "removed": [], "rows": rows}
+        logger.info(f"Full rebuild: {len(book_numbers)} books, {rows} rows.")
+        return report
+
+    # Every column is read back as text so unchanged rows are rewritten byte for byte
+    existing = pd.read_csv(output_path, sep="\t", dtype=str, keep_default_na=False, encoding="utf-8")
+    existing = existing.drop(columns="id")
+
+    rebuilt = {n: enrich_book_to_fact(clean_aligned_book(n, input_dir, segmenter), n) for n in changed}
+    if any(list(df.columns) != list(existing.columns) for df in rebuilt.values()):
+        logger.warning("Fact table columns changed, rebuilding from scratch.")
+        return run_incremental(input_dir, output_path, manifest_path, full=True, chunk_rows=chunk_rows)
+
+    parts = [
+        rebuilt[n] if n in rebuilt else existing.iloc[previous[n]["row_start"]:previous[n]["row_end"]]
+        for n in book_numbers
+    ]
+
+    fact_table = pd.concat(parts, ignore_index=True)
+    fact_table.insert(0, "id", range(1, len(fact_table) + 1))
+    sizes = [(n, len(part)) for n, part in zip(book_numbers, parts)]
+    _write_outputs(fact_table, _row_ranges(sizes, hashes), output_path, manifest_path, segmentation)
+
+    logger.info(
+        f"Incremental update: rebuilt books {changed}, skipped unchanged books {skipped}"
+        + (f", removed books {removed}" if removed else "")
+        + f" ({len(fact_table)} rows)."
+    )
+    return {"mode": "incremental", "rebuilt": changed, "skipped": skipped, "removed": removed, "rows": len(fact_table)}
@@ -0,0 +1,365 @@
+"""
+segment.py
+
+Lexicon-driven word segmentation of run-together Latin tokens.
+
+The Latin pages are extracted with get_text(strip=True), which glues words
+across tags: "tenebrisdicit", "haberetabsconditum", "mannainveniret",
+"Liber PrimusAdmonitiones". Such tokens are split back into words:
+
+0. Case: a lowercase letter followed by a capital never happens inside a
+   Latin word, so "PrimusAdmonitiones" and "esDeus" are split there first.
+1. Lexicon: token frequencies (lowercased) over the whole corpus, every book
+   at once, stored in a trie, with a second trie of the reversed words.
+2. Candidates: tokens seen at most `max_token_count` times and at least
+   `min_token_length` letters long. A glued token is rare by nature; the words
+   it is made of are not.
+3. Viterbi: the most probable split of a candidate into two or more words of
+   the lexicon (unigram log-probabilities, pieces of `min_piece_length`+
+   letters), the words starting at each position found by walking the trie.
+   Results are memoized per token, so each distinct token is segmented once.
+4. A split is rejected when a cut goes through a stem: another word of the
+   lexicon starts (or ends) with the letters around the cut. "spiritu|alium"
+   is kept whole because "spiritualis" starts with "spiritual" and
+   "nobilis|simus" because "sanctissimus" ends with "issimus", while no other
+   word starts with "tenebrisdi". Cuts after a compound prefix (per-,
+   super-, ...) or before a compound suffix (-cumque, -libet, ...) are
+   rejected too, and so are the reviewed words of data/segmentation_keep.json.
+
+Counting the lexicon and finding the rows that hold a run-together token are
+vectorized with pyarrow.compute (RE2); only those rows go through the Python
+replacement, which logs each correction.
+
+Corrections are applied to the cleaned Latin column of the fact table (see
+clean_aligned_book and streaming.iter_book_chunks) and to the alignment
+template. Every correction is logged.
+
+Usage:
+        python -m src.transform.segment                  # corrections over data/aligned/
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.config import INPUT_DIR, SEGMENTATION_KEEP_PATH
+from src.transform.books import find_book_numbers
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+
+# === SEGMENTATION PARAMETERS ===
+MIN_TOKEN_LENGTH = 9           # shorter tokens are never split
+MAX_TOKEN_COUNT = 1            # only tokens this rare are candidates
+MIN_PIECE_LENGTH = 3           # "in", "et", "ne" would split too many real compounds
+MIN_PIECE_COUNT = 1            # a piece must occur on its own at least this often
+STEM_OVERLAP = 2               # letters on each side of a cut checked against the other words
+LEXICON_CHUNK_ROWS = 50_000    # rows read at a time while counting the corpus
+
+# Bound forms that make real compounds out of two words of the lexicon
+COMPOUND_PREFIXES = frozenset({
+    "ante", "bene", "circum", "contra", "extra", "inter", "intro", "male", "per", "post", "præ", "prae",
+    "præter", "praeter", "pro", "satis", "sub", "super", "supra", "trans",
+})
+COMPOUND_SUFFIXES = frozenset({"cumque", "libet", "quoque", "piam", "dam", "nam"})
+
+# Lowercase/uppercase letters of Latin-1 and Latin Extended-A/B (æ, œ, ...); \w has no case classes.
+# Letters only, so the same classes are valid in Python re and in RE2.
+_LOWER = "".join(c for c in map(chr, range(0x250)) if c.islower())
+_UPPER = "".join(c for c in map(chr, range(0x250)) if c.isupper())
+CASE_BOUNDARY_RE = re.compile(f"(?<=[{_LOWER}])(?=[{_UPPER}])")
+CASE_GLUED_RE = re.compile(f"(?<![^\\W\\d_])[^\\W\\d_]*?[{_LOWER}][{_UPPER}][^\\W\\d_]*")
+
+# RE2 (pyarrow.compute) versions; a letter of WORD_RE is \p{L}, \p{Nl} or \p{No} there
+ARROW_CASE_PAIR = f"([{_LOWER}])([{_UPPER}])"
+ARROW_NOT_LETTER = r"[^\p{L}\p{Nl}\p{No}]"
+
+
+def split_case(text: str) -> str:
+    """Puts a space wherever a lowercase letter is followed by a capital: "esDeus" → "es Deus"."""
+    return CASE_BOUNDARY_RE.sub(" ", text)
+
+
+# === TRIE ===
+class _Node:
+    __slots__ = ("children", "count", "words")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.count = 0                 # occurrences of the word ending here
+        self.words = 0                 # distinct words passing through (or ending at) this node
+
+
+class Trie:
+    """Prefix tree of the lexicon with word counts and, per node, the number of words below it."""
+
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, word: str, count: int) -> None:
+        node = self.root
+        node.words += 1
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+            node.words += 1
+        node.count += count
+
+    def find(self, prefix: str) -> _Node | None:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def words_with_prefix(self, prefix: str) -> int:
+        node = self.find(prefix)
+        return node.words if node is not None else 0
+
+    def words_at(self, text: str, start: int) -> Iterator[tuple[int, int]]:
+        """(end, count) of every word of the lexicon that text[start:end] spells."""
+        node = self.root
+        for end in range(start, len(text)):
+            node = node.children.get(text[end])
+            if node is None:
+                return
+            if node.count:
+                yield end + 1, node.count
+
+
+# === LEXICON ===
+def arrow_words(text: pa.Array) -> pa.ListArray:
+    """The lowercased WORD_RE tokens of each row (after split_case), as a list per row ("" included)."""
+    text = pc.utf8_lower(pc.replace_substring_regex(text, ARROW_CASE_PAIR, r"\1 \2"))
+    return pc.split_pattern_regex(text, f"{ARROW_NOT_LETTER}+")
+
+
+def count_words(texts: list[str]) -> dict[str, int]:
+    """Counts of the lowercased WORD_RE tokens of texts, in one vectorized pass."""
+    words = pc.list_flatten(arrow_words(pa.array(texts, type=pa.large_string())))
+    tally = pc.value_counts(words.filter(pc.not_equal(words, "")))
+    return dict(zip(tally.field("values").to_pylist(), tally.field("counts").to_pylist()))
+
+
+
+class Lexicon:
+    """Lowercased token counts of a corpus, in a trie and a trie of the reversed words."""
+
+    def __init__(self, counts: Counter):
+        self.counts = counts
+        self.total = sum(counts.values())
+        self.trie, self.reversed_trie = Trie(), Trie()
+        for word, count in counts.items():
+            self.trie.add(word, count)
+            self.reversed_trie.add(word[::-1], count)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], batch_rows: int = LEXICON_CHUNK_ROWS) -> "Lexicon":
+        counts = Counter()
+        texts = iter(texts)
+        while batch := [str(text) for text in islice(texts, batch_rows)]:
+            counts.update(count_words(batch))
+        return cls(counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+# === SEGMENTER ===
+class Segmenter:
+    """Splits the rare long tokens of a lexicon into its words; split() is memoized per token."""
+
+    def __init__(
+        self,
+        lexicon: Lexicon,
+        keep: frozenset[str] = frozenset(),
+        min_token_length: int = MIN_TOKEN_LENGTH,
+        max_token_count: int = MAX_TOKEN_COUNT,
+        min_piece_length: int = MIN_PIECE_LENGTH,
+        min_piece_count: int = MIN_PIECE_COUNT,
+    ):
+        self.lexicon = lexicon
+        self.keep = frozenset(word.lower() for word in keep)
+        self.min_token_length = min_token_length
+        self.max_token_count = max_token_count
+        self.min_piece_length = min_piece_length
+        self.min_piece_count = min_piece_count
+        self.long_word_re = re.compile(rf"[^\W\d_]{{{min_token_length},}}")
+        self.applied: Counter = Counter()
+        self.split = lru_cache(maxsize=None)(self._split)
+        self._corrections: dict[str, str] | None = None
+
+    def _split(self, word: str) -> tuple[str, ...] | None:
+        """The words a lowercased token is made of, or None to keep it as it is."""
+        lexicon = self.lexicon
+        if (
+            len(word) < self.min_token_length
+            or lexicon.counts.get(word, 0) > self.max_token_count
+            or word in self.keep
+        ):
+            return None
+
+        # best[i] = (log-probability, start of the last piece) of the best split of word[:i]
+        n, log_total = len(word), math.log(lexicon.total)
+        best: list[tuple[float, int]] = [(0.0, -1)] + [(-math.inf, -1)] * n
+        for start in range(n - self.min_piece_length + 1):
+            if best[start][0] == -math.inf:
+                continue
+            for end, count in lexicon.trie.words_at(word, start):
+                if end - start < self.min_piece_length or count < self.min_piece_count or end - start == n:
+                    continue
+                score = best[start][0] + math.log(count) - log_total
+                if score > best[end][0]:
+                    best[end] = (score, start)
+        if best[n][0] == -math.inf:
+            return None
+
+        pieces, end = [], n
+        while end > 0:
+            start = best[end][1]
+            pieces.append(word[start:end])
+            end = start
+        pieces.reverse()
+
+        if pieces[0] in COMPOUND_PREFIXES or pieces[-1] in COMPOUND_SUFFIXES:
+            return None
+        cut = 0
+        for piece in pieces[:-1]:
+            cut += len(piece)
+            if self._inside_stem(word, cut):
+                return None
+        return tuple(pieces)
+
+    def _inside_stem(self, word: str, cut: int) -> bool:
+        """True when another word of the lexicon spans the letters around the cut."""
+        head = word[:cut + STEM_OVERLAP]
+        tail = word[cut - STEM_OVERLAP:][::-1]
+        itself = int(word in self.lexicon.counts)       # the token has both head and tail
+        return (
+            self.lexicon.trie.words_with_prefix(head) > itself
+            or self.lexicon.reversed_trie.words_with_prefix(tail) > itself
+        )
+
+    def corrections(self) -> dict[str, str]:
+        """Every token of the lexicon that would be split, with its replacement."""
+        if self._corrections is None:
+            found = {}
+            for word, count in self.lexicon.counts.items():
+                if len(word) >= self.min_token_length and count <= self.max_token_count:
+                    pieces = self.split(word)
+                    if pieces:
+                        found[word] = " ".join(pieces)
+            self._corrections = dict(sorted(found.items()))
+        return self._corrections
+
+    def rows_to_fix(self, text: pa.Array) -> np.ndarray:
+        """Mask of the rows with a case-glued token or a token of corrections()."""
+        mask = pc.match_substring_regex(text, ARROW_CASE_PAIR).to_numpy(zero_copy_only=False).copy()
+        if self.corrections():
+            words = arrow_words(text)
+            corrected = pc.is_in(pc.list_flatten(words), value_set=pa.array(list(self.corrections()), type=pa.large_string()))
+            mask[pc.filter(pc.list_parent_indices(words), corrected).to_numpy()] = True
+        return mask
+
+    def _log(self, where: str, token: str, fixed: str) -> None:
+        logger.info(f"{where}: {token!r} → {fixed!r}" if where else f"{token!r} → {fixed!r}")
+
+    def fix(self, text: str, where: str = "") -> str:
+        """text with its run-together tokens split (original case kept); logs each correction."""
+        def replace_case(match: re.Match) -> str:
+            token, fixed = match.group(), split_case(match.group())
+            self.applied[token.lower()] += 1
+            self._log(where, token, fixed)
+            return fixed
+
+        def replace(match: re.Match) -> str:
+            token = match.group()
+            key = token.lower()
+            pieces = self.split(key) if len(key) == len(token) else None
+            if not pieces:
+                return token
+            parts, start = [], 0
+            for piece in pieces:
+                parts.append(token[start:start + len(piece)])
+                start += len(piece)
+            fixed = " ".join(parts)
+            self.applied[key] += 1
+            self._log(where, token, fixed)
+            return fixed
+
+        return self.long_word_re.sub(replace, CASE_GLUED_RE.sub(replace_case, text))
+
+
+def read_keep(path: Path | None = SEGMENTATION_KEEP_PATH) -> frozenset[str]:
+    """Words reviewed as real Latin that must never be split; no file means none."""
+    if path is None or not Path(path).exists():
+        return frozenset()
+    return frozenset(entry["word"] for entry in json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def iter_latin_text(input_dir: Path = INPUT_DIR, chunk_rows: int = LEXICON_CHUNK_ROWS) -> Iterator[str]:
+    """The Latin cells of every aligned book, read `chunk_rows` rows at a time."""
+    for book_number in find_book_numbers(input_dir):
+        input_file = Path(input_dir) / f"book{book_number}_aligned.tsv"
+        reader = pd.read_csv(
+            input_file, sep="\t", names=["latin_text", "english_text"], encoding="utf-8",
+            dtype=str, keep_default_na=False, chunksize=chunk_rows,
+        )
+        with reader:
+            for chunk in reader:
+                yield from chunk["latin_text"]
+
+
+def corpus_segmenter(input_dir: Path = INPUT_DIR, keep_path: Path | None = SEGMENTATION_KEEP_PATH) -> Segmenter:
+    """A segmenter whose lexicon is the Latin text of every aligned book in input_dir."""
+    return Segmenter(Lexicon.from_texts(iter_latin_text(input_dir)), read_keep(keep_path))
+
+
+def segment_column(series: pd.Series, segmenter: Segmenter, label: str = "") -> pd.Series:
+    """Splits run-together tokens in every cell; corrections are logged with the cell's line."""
+    text = series.astype(str)
+    rows = segmenter.rows_to_fix(pa.array(text, type=pa.large_string()))
+    if not rows.any():
+        return series
+    values = text.astype(object).to_numpy(copy=True)
+    for position in np.flatnonzero(rows):
+        values[position] = segmenter.fix(values[position], f"{label} line {series.index[position] + 1}".strip())
+    return pd.Series(values, index=series.index, dtype=series.dtype)
+
+
+# === MAIN EXECUTION ===
+def main(argv: list[str] | None = None) -> dict[str, str]:
+    parser = argparse.ArgumentParser(description="List the run-together Latin tokens and how they are split.")
+    parser.add_argument("--input-dir", type=Path, default=INPUT_DIR)
+    parser.add_argument("--keep", type=Path, default=SEGMENTATION_KEEP_PATH)
+    args = parser.parse_args(argv)
+
+    segmenter = corpus_segmenter(args.input_dir, args.keep)
+    corrections = segmenter.corrections()
+    lexicon = segmenter.lexicon
+    print(f"📖 {lexicon.total:,} tokens, {len(lexicon):,} distinct, {len(segmenter.keep)} kept as reviewed")
+    for token, fixed in corrections.items():
+        print(f"   {token} → {fixed}")
+    print(f"✅ {len(corrections)} run-together tokens")
+    return corrections
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
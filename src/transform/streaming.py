@@ -0,0 +1,119 @@
+"""
+streaming.py
+
+Bounded-memory build of the paragraph fact table for large aligned corpora.
+
+The in-memory path (enrich_kempis.build_fact_table) reads every aligned book,
+concatenates them and writes one big TSV, so its peak memory grows with the
+whole corpus. Here each book{n}_aligned.tsv is read in chunks of `chunk_rows`
+rows; every chunk is cleaned, enriched and appended to the output before the
+next one is read. The global `id`, each book's `paragraph_number` and its
+chapter numbering carry on across chunk boundaries, so the file written is byte
+for byte the one the in-memory path writes. Peak memory is set by the chunk size,
+not by the corpus size.
+
+The output is written to a temporary file next to the target and moved into
+place at the end, so a failed run never leaves a half-written fact table.
+
+Usage:
+        python -m src.transform.enrich_kempis --full --chunk-rows 50000
+"""
+
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from src.config import INPUT_DIR, OUTPUT_PATH, TRANSFORM_CHUNK_ROWS
+from src.transform.chapters import find_headings
+from src.transform.clean_kempis import clean_text_column
+from src.transform.books import find_book_numbers
+from src.transform.enrich_kempis import enrich_book_to_fact
+from src.transform.segment import Segmenter, corpus_segmenter, segment_column
+
+logger = logging.getLogger(__name__)
+
+
+def iter_book_chunks(
+    book_number: int,
+    input_dir: Path = INPUT_DIR,
+    chunk_rows: int = TRANSFORM_CHUNK_ROWS,
+    segmenter: Segmenter | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the cleaned rows of one aligned book, `chunk_rows` at a time.
+
+    Cells are read as text (dtype=str) so a chunk that happens to hold only
+    numbers is not parsed differently from the same rows in a whole-file read.
+    Run-together Latin tokens are split by `segmenter` when one is given.
+    """
+    input_file = Path(input_dir) / f"book{book_number}_aligned.tsv"
+    reader = pd.read_csv(
+        input_file, sep="\t", names=["latin_text", "english_text"], encoding="utf-8",
+        dtype=str, chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            chunk["heading"] = find_headings(chunk["latin_text"], chunk["english_text"])
+            chunk["latin_text"] = clean_text_column(chunk["latin_text"])
+            chunk["english_text"] = clean_text_column(chunk["english_text"])
+            if segmenter is not None:
+                chunk["latin_text"] = segment_column(chunk["latin_text"], segmenter, f"Book {book_number}")
+            yield chunk
+
+
+def stream_fact_table(
+    input_dir: Path = INPUT_DIR,
+    output_path: Path = OUTPUT_PATH,
+    chunk_rows: int = TRANSFORM_CHUNK_ROWS,
+    segmenter: Segmenter | None = None,
+) -> list[tuple[int, int]]:
+    """
+    Builds the fact table chunk by chunk and appends each chunk to output_path.
+
+    Args:
+        input_dir (Path): Folder with the book{n}_aligned.tsv files.
+        output_path (Path): The fact table (TSV) to write.
+        chunk_rows (int): Rows held in memory at a time.
+        segmenter (Segmenter): Splits run-together Latin tokens; by default one
+            is built from the Latin text of the whole corpus (a first pass).
+
+    Returns:
+        list[tuple[int, int]]: (book_number, rows written) in output order.
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+
+    if segmenter is None:
+        segmenter = corpus_segmenter(input_dir)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_name = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex[:12]}.tmp")
+
+    sizes = []
+    next_id = 1
+    try:
+        # A plain exclusive open, so the umask sets the mode (as for the in-memory build)
+        with open(temp_name, "x", encoding="utf-8", newline="") as out:
+            for book_number in find_book_numbers(input_dir):
+                written, previous = 0, (0, 0)
+                for chunk in iter_book_chunks(book_number, input_dir, chunk_rows, segmenter):
+                    fact = enrich_book_to_fact(chunk, book_number, first_paragraph=written + 1, previous=previous)
+                    previous = tuple(int(v) for v in fact[["chapter_number", "paragraph_in_chapter"]].iloc[-1])
+                    fact.insert(0, "id", range(next_id, next_id + len(fact)))
+                    fact.to_csv(out, sep="\t", index=False, header=next_id == 1)
+                    written += len(fact)
+                    next_id += len(fact)
+                sizes.append((book_number, written))
+                logger.info(f"Book {book_number}: {written} rows streamed.")
+        os.replace(temp_name, output_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Streamed {next_id - 1} rows in chunks of {chunk_rows} to {output_path}")
+    return sizes
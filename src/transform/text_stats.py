@@ -0,0 +1,146 @@
+"""
+text_stats.py
+
+Text statistics of the paragraph fact table, computed column-wise over the
+whole frame (no per-cell Python functions):
+
+- per paragraph: word and character counts of each side, the Latin/English
+  word ratio, and token/type counts (letters-only words, lowercased)
+- per book and per chapter: precomputed aggregates (paragraphs, word and
+  character totals, ratio, vocabulary size, word count differences), so
+  questions like "where is the English longest compared to the Latin?" read a
+  small summary table instead of scanning the text
+
+Chapters are the fact table's chapter_number column (see chapters.py); rows
+before the first heading of a book (the book title) have chapter 0.
+
+Usage:
+        python -m src.transform.text_stats      # writes the three stats TSVs next to the fact table
+"""
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import OUTPUT_PATH, PARAGRAPH_STATS_PATH, BOOK_STATS_PATH, CHAPTER_STATS_PATH
+
+logger = logging.getLogger(__name__)
+
+SIDES = ("latin", "english")
+WORD_RE = r"\S+"
+TOKEN_RE = r"[^\W\d_]+"          # runs of letters: punctuation and numbering are not tokens
+
+
+# === PER PARAGRAPH ===
+def _tokens(text: pd.Series) -> pd.Series:
+    """Every token of every paragraph, one per row, indexed by the paragraph's index."""
+    return text.astype(str).str.lower().str.findall(TOKEN_RE).explode().dropna()
+
+
+def paragraph_stats(fact_table: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row of statistics per paragraph, aligned on the fact table's index.
+
+    Columns: id, book_id, chapter_number, {side}_word_count, {side}_char_count,
+    {side}_token_count, {side}_type_count for side in latin/english, and length_ratio
+    (Latin words per English word; empty when the English side has no words).
+    """
+    stats = pd.DataFrame({
+        "id": fact_table["id"],
+        "book_id": fact_table["book_id"],
+        "chapter_number": fact_table["chapter_number"].astype("int64"),
+    }, index=fact_table.index)
+
+    for side in SIDES:
+        text = fact_table[f"{side}_text"].astype(str)
+        tokens = _tokens(text)
+        stats[f"{side}_word_count"] = text.str.count(WORD_RE)
+        stats[f"{side}_char_count"] = text.str.len()
+        stats[f"{side}_token_count"] = tokens.groupby(level=0).size().reindex(stats.index, fill_value=0)
+        stats[f"{side}_type_count"] = tokens.groupby(level=0).nunique().reindex(stats.index, fill_value=0)
+
+    english_words = stats["english_word_count"].where(stats["english_word_count"] > 0)
+    stats["length_ratio"] = (stats["latin_word_count"] / english_words).round(4)
+    return stats
+
+
+# === AGGREGATES ===
+def aggregate_stats(fact_table: pd.DataFrame, stats: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """
+    Totals per group of paragraphs (e.g. by=["book_id"] or ["book_id", "chapter_number"]).
+
+    Vocabulary sizes count the distinct tokens of the whole group, not the sum of
+    the per-paragraph type counts.
+    """
+    groups = stats.groupby(by, sort=True)
+    difference = stats["english_word_count"] - stats["latin_word_count"]
+
+    summary = pd.DataFrame({"paragraphs": groups.size()})
+    for side in SIDES:
+        summary[f"{side}_words"] = groups[f"{side}_word_count"].sum()
+        summary[f"{side}_chars"] = groups[f"{side}_char_count"].sum()
+
+        tokens = _tokens(fact_table[f"{side}_text"]).rename("token").to_frame()
+        tokens = tokens.join(stats[by])
+        summary[f"{side}_vocabulary"] = tokens.drop_duplicates().groupby(by).size()
+
+    keys = [stats[col] for col in by]
+    english_words = summary["english_words"].where(summary["english_words"] > 0)
+    summary["length_ratio"] = (summary["latin_words"] / english_words).round(4)
+    summary["mean_word_count_diff"] = difference.groupby(keys).mean().round(2)
+    summary["max_abs_word_count_diff"] = difference.abs().groupby(keys).max()
+
+    vocabulary = [f"{side}_vocabulary" for side in SIDES]
+    summary[vocabulary] = summary[vocabulary].fillna(0).astype("int64")
+    return summary.reset_index()
+
+
+def book_stats(fact_table: pd.DataFrame, stats: pd.DataFrame | None = None) -> pd.DataFrame:
+    stats = paragraph_stats(fact_table) if stats is None else stats
+    return aggregate_stats(fact_table, stats, ["book_id"])
+
+
+def chapter_stats(fact_table: pd.DataFrame, stats: pd.DataFrame | None = None) -> pd.DataFrame:
+    stats = paragraph_stats(fact_table) if stats is None else stats
+    return aggregate_stats(fact_table, stats, ["book_id", "chapter_number"])
+
+
+# === OUTPUT ===
+def write_stats(
+    fact_table: pd.DataFrame,
+    paragraph_path: Path = PARAGRAPH_STATS_PATH,
+    book_path: Path = BOOK_STATS_PATH,
+    chapter_path: Path = CHAPTER_STATS_PATH,
+) -> dict:
+    """Writes the paragraph, book and chapter statistics as TSVs. Returns their row counts."""
+    stats = paragraph_stats(fact_table)
+    tables = {
+        paragraph_path: stats,
+        book_path: book_stats(fact_table, stats),
+        chapter_path: chapter_stats(fact_table, stats),
+    }
+    for path, table in tables.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        table.to_csv(path, sep="\t", index=False, encoding="utf-8")
+
+    report = {"paragraphs": len(stats), "books": len(tables[book_path]), "chapters": len(tables[chapter_path])}
+    logger.info(
+        f"Text statistics written: {report['paragraphs']} paragraphs, "
+        f"{report['books']} books, {report['chapters']} chapters."
+    )
+    return report
+
+
+def main():
+    from src.transform.enrich_kempis import read_fact_table
+
+    report = write_stats(read_fact_table(OUTPUT_PATH))
+    print(f"✅ Statistics of {report['paragraphs']} paragraphs saved to: {PARAGRAPH_STATS_PATH}")
+    print(f"   Per-book ({report['books']}) and per-chapter ({report['chapters']}) summaries: "
+          f"{BOOK_STATS_PATH.name}, {CHAPTER_STATS_PATH.name}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
@@ -12,10 +12,10 @@ from src.config import INPUT_DIR
 
 logger = logging.getLogger(__name__)  # Define logger globally
 
-def load_and_merge() -> DataFrame:
+def load_and_merge(input_dir: Path = INPUT_DIR) -> DataFrame:
     """Loads, validates, and merges all aligned book files into a single DataFrame."""
     
-    folder = Path(INPUT_DIR)
+    folder = Path(input_dir)
     dfs = []
 
     # Collect all matching files
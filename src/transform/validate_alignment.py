@@ -0,0 +1,295 @@
+"""
+validate_alignment.py
+
+Checks the hand-aligned book{n}_aligned.tsv files before they are cleaned.
+
+Every check is a column-wise operation over all rows of all books at once
+(Arrow regex kernels, pandas group statistics, no per-row Python):
+
+- column_count (error): a line without exactly one tab (no English column, or a stray tab)
+- empty_side (error): a row with no Latin or no English text
+- chapter_mismatch (error): "Cap. N." paired with "CHAPTER M", N != M
+- chapter_one_side (error): a chapter heading on one side only
+- number_mismatch (error): a Latin "N." paragraph paired with an English "M." paragraph, N != M
+- number_one_side (warning): a paragraph number on one side only (the translation
+  sometimes merges or leaves paragraphs unnumbered)
+- length_ratio_outlier (warning): log(English chars / Latin chars) far from the
+  book's typical value. The spread is robust: modified z-score
+  0.6745 * (x - median) / MAD, with |z| > RATIO_Z_THRESHOLD, per book.
+
+The report (data/cleaned/alignment_report.json) lists every issue with its book,
+line, numbers and a snippet of both sides. `ok` is false when there is any error
+that is not listed, with a reason, in data/alignment_accepted.json (issues of the
+source texts themselves, e.g. a chapter missing from the translation).
+
+Usage:
+        python -m src.transform.validate_alignment              # exit status 1 on errors
+        python -m src.transform.validate_alignment --strict     # ... or on warnings
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from src.config import INPUT_DIR, ALIGNMENT_REPORT_PATH, ALIGNMENT_ACCEPTED_PATH
+from src.transform.books import ENGLISH_CHAPTER_RE, LATIN_CHAPTER_RE, find_book_numbers, from_roman
+
+logger = logging.getLogger(__name__)
+
+# Leading paragraph numbers ("3."); the chapter headings are books.py's
+# (RE2 syntax, named groups: pyarrow.compute.extract_regex)
+PARAGRAPH_NUMBER_RE = r"(?P<number>\d+)\s*\."
+PREFIX_CHARS = 24                # the numbers are always within the first few characters
+
+RATIO_Z_THRESHOLD = 3.5          # Iglewicz & Hoaglin's cut-off for the modified z-score
+MAD_TO_SIGMA = 0.6745
+SNIPPET_CHARS = 80
+
+ERRORS = ("column_count", "empty_side", "chapter_mismatch", "chapter_one_side", "number_mismatch")
+WARNINGS = ("number_one_side", "length_ratio_outlier")
+
+
+def _read_aligned_file(path: Path) -> pd.DataFrame:
+    """
+    One aligned file as line (1-based), columns, latin_text, english_text.
+
+    A line without exactly two columns is kept, not fatal: its text before the
+    first tab is the Latin side, the rest the English side, and check_alignment
+    reports it as column_count.
+    """
+    invalid = {}
+
+    def keep_invalid(row) -> str:
+        invalid[row.number] = row
+        return "skip"
+
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(column_names=["latin_text", "english_text"], use_threads=False),
+        parse_options=pa_csv.ParseOptions(delimiter="\t", ignore_empty_lines=False, invalid_row_handler=keep_invalid),
+        convert_options=pa_csv.ConvertOptions(column_types={"latin_text": pa.string(), "english_text": pa.string()}),
+    )
+    df = table.to_pandas()
+    # row.number is the file line (known since the file is parsed in one thread); valid rows fill the other lines
+    lines = np.arange(1, len(df) + len(invalid) + 1)
+    df.insert(0, "columns", 2)
+    df.insert(0, "line", lines[~np.isin(lines, list(invalid))])
+    if invalid:
+        split = [row.text.split("\t", 1) + [""] for row in invalid.values()]
+        bad = pd.DataFrame({
+            "line": list(invalid),
+            "columns": [row.actual_columns for row in invalid.values()],
+            "latin_text": [parts[0] for parts in split],
+            "english_text": [parts[1] for parts in split],
+        })
+        df = pd.concat([df, bad], ignore_index=True).sort_values("line", ignore_index=True)
+    return df
+
+
+def read_aligned_books(input_dir: Path = INPUT_DIR) -> pd.DataFrame:
+    """Every row of every aligned book as text: book_number, line (1-based), columns, latin_text, english_text."""
+    books = []
+    for book_number in find_book_numbers(input_dir):
+        df = _read_aligned_file(Path(input_dir) / f"book{book_number}_aligned.tsv")
+        df.insert(0, "book_number", book_number)
+        books.append(df)
+    if not books:
+        return pd.DataFrame(columns=["book_number", "line", "columns", "latin_text", "english_text"])
+    return pd.concat(books, ignore_index=True)
+
+
+def _leading_numbers(text: pd.Series, chapter_pattern: str) -> tuple[pd.Series, pd.Series]:
+    """
+    The chapter number (Roman or Arabic) of a heading and the number of a numbered
+    paragraph, as Int64 (<NA> when absent). One regex pass over the first
+    PREFIX_CHARS characters of each row.
+    """
+    prefix = pc.utf8_slice_codeunits(pa.array(text, type=pa.large_string()), 0, PREFIX_CHARS)
+    found = pc.extract_regex(prefix, rf"^\s*(?:{chapter_pattern}|{PARAGRAPH_NUMBER_RE})")
+    numbers = []
+    for field in (0, 1):                       # chapter, number; "" when the other group matched
+        raw = pc.struct_field(found, [field])
+        arabic = pc.cast(pc.if_else(pc.utf8_is_digit(raw), raw, None), pa.int64())
+        values = pd.Series(raw.to_numpy(zero_copy_only=False), index=text.index)
+        numerals = [value for value in values.dropna().unique() if value and not value.isdigit()]
+        roman = values.map({numeral: from_roman(numeral) for numeral in numerals})   # a few hundred distinct at most
+        numbers.append(pd.Series(arabic.to_numpy(zero_copy_only=False), index=text.index).fillna(roman).astype("Int64"))
+    return numbers[0], numbers[1]
+
+
+def _stripped_length(text: pd.Series) -> pd.Series:
+    stripped = pc.utf8_trim_whitespace(pa.array(text, type=pa.large_string()))
+    return pd.Series(pc.utf8_length(stripped).to_numpy(zero_copy_only=False), index=text.index)
+
+
+def _robust_z(values: pd.Series, groups: pd.Series) -> pd.Series:
+    """Modified z-score of each value within its group (0 where the group has no spread)."""
+    median = values.groupby(groups).transform("median")
+    mad = (values - median).abs().groupby(groups).transform("median")
+    return (MAD_TO_SIGMA * (values - median) / mad.where(mad > 0)).fillna(0.0)
+
+
+def check_alignment(rows: pd.DataFrame, ratio_threshold: float = RATIO_Z_THRESHOLD) -> pd.DataFrame:
+    """
+    Runs every check over the rows of read_aligned_books.
+
+    Returns:
+        pd.DataFrame: One row per aligned row with the extracted numbers, log_length_ratio,
+            ratio_z and one boolean column per check (ERRORS + WARNINGS).
+    """
+    latin, english = rows["latin_text"].astype(str), rows["english_text"].astype(str)
+    checks = rows[["book_number", "line"]].copy()
+
+    checks["latin_chapter"], checks["latin_number"] = _leading_numbers(latin, LATIN_CHAPTER_RE)
+    checks["english_chapter"], checks["english_number"] = _leading_numbers(english, ENGLISH_CHAPTER_RE)
+
+    latin_chars, english_chars = _stripped_length(latin), _stripped_length(english)
+    checks["empty_side"] = (latin_chars == 0) | (english_chars == 0)
+
+    la_chapter, en_chapter = checks["latin_chapter"].notna(), checks["english_chapter"].notna()
+    checks["chapter_mismatch"] = (la_chapter & en_chapter & (checks["latin_chapter"] != checks["english_chapter"])).astype(bool)
+    checks["chapter_one_side"] = la_chapter ^ en_chapter
+
+    la_number, en_number = checks["latin_number"].notna(), checks["english_number"].notna()
+    checks["number_mismatch"] = (la_number & en_number & (checks["latin_number"] != checks["english_number"])).astype(bool)
+    checks["number_one_side"] = (la_number ^ en_number) & ~(la_chapter | en_chapter)
+
+    # Length ratios of paragraph rows only: headings are short on both sides and would widen the spread
+    paragraph_rows = ~(checks["empty_side"] | la_chapter | en_chapter)
+    log_ratio = np.log(english_chars.where(paragraph_rows) / latin_chars.where(paragraph_rows))
+    checks["log_length_ratio"] = log_ratio.round(4)
+    checks["ratio_z"] = _robust_z(log_ratio, checks["book_number"]).round(2)
+    checks["length_ratio_outlier"] = paragraph_rows & (checks["ratio_z"].abs() > ratio_threshold)
+
+    # A line that did not split into two columns has no sides to compare: it is only a column_count error
+    column_count = (rows["columns"] != 2).to_numpy()
+    for code in (*ERRORS, *WARNINGS):
+        if code != "column_count":
+            checks[code] = checks[code] & ~column_count
+    checks["column_count"] = column_count
+    return checks
+
+
+def read_accepted(path: Path | None = ALIGNMENT_ACCEPTED_PATH) -> set[tuple[int, int, str]]:
+    """(book_number, line, code) of the issues accepted as they are; no file means none."""
+    if path is None or not Path(path).exists():
+        return set()
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {(int(entry["book_number"]), int(entry["line"]), entry["code"]) for entry in entries}
+
+
+def build_report(rows: pd.DataFrame, checks: pd.DataFrame, accepted: set[tuple[int, int, str]] = frozenset()) -> dict:
+    """The machine-readable report: counts per check and book, and one record per flagged row."""
+    codes = [*ERRORS, *WARNINGS]
+    flagged = checks[codes].any(axis=1)
+
+    parts = []
+    for order, code in enumerate(codes):
+        hit = checks[code].to_numpy(dtype=bool)
+        side = "number" if code.startswith("number") else "chapter"
+        parts.append(pd.DataFrame({
+            "code": code,
+            "severity": "error" if code in ERRORS else "warning",
+            "book_number": checks["book_number"][hit],
+            "line": checks["line"][hit],
+            "latin_number": checks[f"latin_{side}"][hit],
+            "english_number": checks[f"english_{side}"][hit],
+            "ratio_z": checks["ratio_z"][hit],
+            "latin": rows["latin_text"][hit].str.slice(0, SNIPPET_CHARS),
+            "english": rows["english_text"][hit].str.slice(0, SNIPPET_CHARS),
+            "order": order,
+        }))
+    found = pd.concat(parts).sort_values(["book_number", "line", "order"], kind="stable").drop(columns="order")
+    keys = pd.MultiIndex.from_arrays([found["book_number"], found["line"], found["code"]])
+    found["accepted"] = keys.isin(list(accepted)) if accepted else False
+    issues = [
+        {key: _json_value(value) for key, value in issue.items()}
+        for issue in found.astype(object).to_dict("records")
+    ]
+
+    per_book = checks.groupby("book_number").agg(
+        rows=("line", "size"),
+        median_log_ratio=("log_length_ratio", "median"),
+    )
+    per_book["flagged_rows"] = flagged.groupby(checks["book_number"]).sum()
+
+    counts = {code: int(checks[code].sum()) for code in codes}
+    open_severity = found.loc[~found["accepted"], "severity"]
+    errors = int((open_severity == "error").sum())
+    return {
+        "ok": errors == 0,
+        "rows": len(checks),
+        "errors": errors,
+        "warnings": int((open_severity == "warning").sum()),
+        "accepted": int(found["accepted"].sum()),
+        "counts": counts,
+        "books": {
+            str(book): {key: _json_value(value) for key, value in stats.items()}
+            for book, stats in per_book.round(4).to_dict("index").items()
+        },
+        "issues": issues,
+    }
+
+
+def _json_value(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def write_report(report: dict, path: Path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def validate_alignment(
+    input_dir: Path = INPUT_DIR,
+    report_path: Path | None = ALIGNMENT_REPORT_PATH,
+    ratio_threshold: float = RATIO_Z_THRESHOLD,
+    accepted_path: Path | None = ALIGNMENT_ACCEPTED_PATH,
+) -> dict:
+    """Checks every aligned book in input_dir and writes the JSON report (unless report_path is None)."""
+    rows = read_aligned_books(input_dir)
+    report = build_report(rows, check_alignment(rows, ratio_threshold), read_accepted(accepted_path))
+
+    if report_path is not None:
+        write_report(report, report_path)
+    logger.info(
+        f"Alignment check: {report['rows']} rows, {report['errors']} errors, "
+        f"{report['warnings']} warnings, {report['accepted']} accepted."
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Validate the aligned book files.")
+    parser.add_argument("--input-dir", type=Path, default=INPUT_DIR)
+    parser.add_argument("--report", type=Path, default=ALIGNMENT_REPORT_PATH)
+    parser.add_argument("--ratio-threshold", type=float, default=RATIO_Z_THRESHOLD)
+    parser.add_argument("--accepted", type=Path, default=ALIGNMENT_ACCEPTED_PATH, help="Issues accepted as they are")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    args = parser.parse_args(argv)
+
+    report = validate_alignment(args.input_dir, args.report, args.ratio_threshold, args.accepted)
+    for issue in [issue for issue in report["issues"] if not issue["accepted"]][:20]:
+        print(f"  {issue['severity']:<7} book {issue['book_number']} line {issue['line']:>4}  {issue['code']}: "
+              f"{issue['latin'][:40]!r} | {issue['english'][:40]!r}")
+    failed = not report["ok"] or (args.strict and report["warnings"])
+    print(f"{'❌' if failed else '✅'} {report['rows']} rows: {report['errors']} errors, "
+          f"{report['warnings']} warnings. Report: {args.report}")
+    if failed:
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
+    main()
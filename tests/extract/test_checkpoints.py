@@ -0,0 +1,83 @@
+"""
+Tests the per-page checkpoints of extract_latin.extract_all_paragraphs
+
+A book page fails on the first run; the rerun must fetch only that page and
+the raw file must not be written until every page is present.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.artifacts import ArtifactStore
+from src.extract.checkpoints import IncompleteExtractionError, PageCheckpoints
+from extract import extract_english
+from extract.extract_latin import extract_all_paragraphs, save_to_file
+
+INDEX_HTML = """
+<html><body>
+  <a href="kempis/kempis1.shtml">Book 1</a>
+  <a href="kempis/kempis2.shtml">Book 2</a>
+  <a href="kempis/kempis3.shtml">Book 3</a>
+</body></html>
+"""
+BASE_URL = "https://example.com"
+
+
+def book_html(book):
+    return f"<html><body><p>Book {book} paragraph 1</p><p>Book {book} paragraph 2</p></body></html>"
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_rerun_fetches_only_missing_pages(tmp_path, max_workers):
+    checkpoints = PageCheckpoints(tmp_path / "checkpoints")
+    fetched = []
+
+    def flaky_fetch(base_url, relative_path, session=None, cache=None):
+        fetched.append(relative_path)
+        book = int(relative_path[len("kempis/kempis"):-len(".shtml")])
+        # Book 2 fails the first time, like fetch_book_html after a network error
+        if book == 2 and fetched.count(relative_path) == 1:
+            return ""
+        return book_html(book)
+
+    with patch("extract.extract_latin.fetch_book_html", side_effect=flaky_fetch):
+        with pytest.raises(IncompleteExtractionError) as error:
+            extract_all_paragraphs(INDEX_HTML, BASE_URL, max_workers=max_workers, checkpoints=checkpoints)
+        assert error.value.missing == [f"{BASE_URL}/kempis/kempis2.shtml"]
+
+        paragraphs = extract_all_paragraphs(INDEX_HTML, BASE_URL, max_workers=max_workers, checkpoints=checkpoints)
+
+    assert sorted(fetched) == [
+        "kempis/kempis1.shtml", "kempis/kempis2.shtml", "kempis/kempis2.shtml", "kempis/kempis3.shtml",
+    ]
+    assert paragraphs == [f"Book {book} paragraph {n}" for book in (1, 2, 3) for n in (1, 2)]
+
+    checkpoints.clear()
+    assert checkpoints.load(f"{BASE_URL}/kempis/kempis1.shtml") is None
+
+
+def test_corrupt_checkpoint_is_refetched(tmp_path):
+    checkpoints = PageCheckpoints(tmp_path)
+    checkpoints.save(f"{BASE_URL}/kempis/kempis1.shtml", ["stored"])
+    checkpoints._path(f"{BASE_URL}/kempis/kempis1.shtml").write_text("{not json", encoding="utf-8")
+
+    assert checkpoints.load(f"{BASE_URL}/kempis/kempis1.shtml") is None
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+@pytest.mark.parametrize("save, separator", [(save_to_file, "\n\n"), (extract_english.save_to_file, "\n")])
+def test_save_to_file_keeps_previous_file_on_failure(tmp_path, save, separator):
+    store = ArtifactStore(tmp_path / "artifacts")
+    output = tmp_path / "raw.txt"
+    save(["old"], output, store)
+
+    class Unwritable(str):
+        def __add__(self, other):
+            raise OSError("disk full")
+
+    with pytest.raises(OSError):                     # the extract stage must fail, not keep the old ref
+        save(["new", Unwritable("boom")], output, store)
+
+    assert store.read_text(output) == "old" + separator
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["artifacts", "raw.txt.ref"]
+    assert list((tmp_path / "artifacts").rglob("*.tmp")) == []
@@ -0,0 +1,46 @@
+"""
+Tests the concurrent fetch mode of extract_latin.extract_all_paragraphs
+
+Book pages are returned out of order (later links finish first) to check
+that the output keeps the order of the index page.
+"""
+
+import time
+from unittest.mock import patch
+
+from extract.extract_latin import extract_all_paragraphs
+
+INDEX_HTML = """
+<html>
+  <body>
+    <a href="kempis/kempis1.shtml">Book 1</a>
+    <a href="kempis/kempis2.shtml">Book 2</a>
+    <a href="kempis/kempis3.shtml">Book 3</a>
+    <a href="kempis/kempis4.shtml">Book 4</a>
+  </body>
+</html>
+"""
+
+
+def fake_fetch_book_html(base_url, relative_path, session=None, cache=None):
+    book = int(relative_path[len("kempis/kempis"):-len(".shtml")])
+    time.sleep(0.05 * (5 - book))  # Book 1 is the slowest to arrive
+    return f"<html><body><p>Book {book} paragraph 1</p><p>Book {book} paragraph 2</p></body></html>"
+
+
+@patch("extract.extract_latin.fetch_book_html", side_effect=fake_fetch_book_html)
+def test_concurrent_fetch_keeps_book_order(mock_fetch_book_html):
+    paragraphs = extract_all_paragraphs(INDEX_HTML, base_url="https://example.com", max_workers=4)
+
+    assert paragraphs == [
+        f"Book {book} paragraph {n}" for book in range(1, 5) for n in (1, 2)
+    ]
+    assert mock_fetch_book_html.call_count == 4
+
+
+@patch("extract.extract_latin.fetch_book_html", side_effect=fake_fetch_book_html)
+def test_concurrent_fetch_matches_sequential(mock_fetch_book_html):
+    sequential = extract_all_paragraphs(INDEX_HTML, base_url="https://example.com", max_workers=1)
+    concurrent = extract_all_paragraphs(INDEX_HTML, base_url="https://example.com", max_workers=3)
+
+    assert concurrent == sequential
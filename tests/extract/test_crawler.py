@@ -0,0 +1,135 @@
+"""
+Tests the resumable crawler against a small stand-in site served from a temp folder
+"""
+
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from artifacts import ArtifactStore, find_artifacts
+from extract.crawler import AdaptiveRateLimiter, CrawlRules, Frontier, crawl, extract_links
+
+PAGES = {
+    "auctor.html": """
+        <html><body>
+          <a href="auctor/liber1.shtml">Liber I</a>
+          <a href="auctor/liber2.shtml#top">Liber II</a>
+          <a href="auctor/liber3.shtml">Liber III</a>
+          <a href="auctor/copy.shtml">Liber I (copy)</a>
+          <a href="index.html">The Latin Library</a>
+          <a href="https://elsewhere.example/auctor/liber9.shtml">Mirror</a>
+        </body></html>""",
+    "auctor/liber1.shtml": "<p>Liber primus.</p><p>Caput unum.</p><p>THE LATIN LIBRARY</p>",
+    "auctor/liber2.shtml": '<p>Liber secundus.</p><a href="liber3.shtml">next</a>',
+    "auctor/liber3.shtml": "<p>Liber tertius.</p>",
+    "auctor/copy.shtml": "<html><p>Liber primus.</p><p>Caput unum.</p></html>",
+    "index.html": "<p>Not part of the section.</p>",
+}
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "site"
+    for name, html in PAGES.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(html, encoding="utf-8")
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        requested = []
+
+        def do_GET(self):
+            self.requested.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", QuietHandler.requested
+    server.shutdown()
+    server.server_close()
+
+
+def fast_limiter():
+    return AdaptiveRateLimiter(initial_rate=1000, max_rate=1000)
+
+
+def test_crawl_follows_section_links_and_dedupes(site, tmp_path):
+    base_url, requested = site
+    rules = CrawlRules.for_section("auctor", base_url=base_url)
+    output_dir = tmp_path / "crawl"
+    store = ArtifactStore(tmp_path / "artifacts")
+
+    report = crawl(rules, tmp_path / "frontier.sqlite", output_dir, workers=3, limiter=fast_limiter(), store=store)
+
+    assert report["fetched"] == 5
+    assert report["status"] == {"done": 4, "duplicate": 1}
+    assert sorted(requested) == [
+        "/auctor.html", "/auctor/copy.shtml", "/auctor/liber1.shtml", "/auctor/liber2.shtml", "/auctor/liber3.shtml",
+    ]
+
+    host_dir = output_dir / base_url.split("://")[1]
+    saved = sorted(p.relative_to(host_dir).as_posix() for p in find_artifacts(host_dir, "**/*.txt"))
+    assert len(saved) == 3 and "auctor/liber2.shtml.txt" in saved
+    assert store.read_text(host_dir / "auctor/liber2.shtml.txt") == "Liber secundus.\n\n"
+
+
+def test_crawl_resumes_from_frontier(site, tmp_path):
+    base_url, requested = site
+    rules = CrawlRules.for_section("auctor", base_url=base_url)
+    db = tmp_path / "frontier.sqlite"
+    store = ArtifactStore(tmp_path / "artifacts")
+
+    first = crawl(rules, db, tmp_path / "crawl", workers=1, limiter=fast_limiter(), max_pages=2, store=store)
+    assert first["fetched"] == 2
+    assert first["status"]["pending"] == 3
+
+    second = crawl(rules, db, tmp_path / "crawl", workers=2, limiter=fast_limiter(), store=store)
+    assert second["fetched"] == 3
+    assert second["status"] == {"done": 4, "duplicate": 1}
+    assert len(requested) == len(set(requested)) == 5      # nothing fetched twice
+
+    assert crawl(rules, db, tmp_path / "crawl", limiter=fast_limiter(), store=store)["fetched"] == 0
+
+
+def test_interrupted_pages_go_back_to_the_frontier(tmp_path):
+    frontier = Frontier(tmp_path / "frontier.sqlite")
+    frontier.add(["https://a.example/1", "https://a.example/2"], 0)
+    assert len(frontier.claim(5)) == 2
+    frontier.close()
+
+    frontier = Frontier(tmp_path / "frontier.sqlite")
+    assert frontier.counts() == {"pending": 2}
+    url, _ = frontier.claim(1)[0]
+    assert frontier.fail(url, "boom", max_attempts=2) is False
+    assert sorted(url for url, _ in frontier.claim(5)) == ["https://a.example/1", "https://a.example/2"]
+    assert frontier.fail(url, "boom", max_attempts=2) is True
+    assert frontier.counts() == {"failed": 1, "fetching": 1}
+    frontier.close()
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    limiter = AdaptiveRateLimiter(initial_rate=4, min_rate=1, max_rate=5, increase=0.5, decrease=0.5)
+
+    limiter.throttled("a.example")
+    assert limiter.rate("a.example") == 2
+    limiter.throttled("a.example")
+    limiter.throttled("a.example")
+    assert limiter.rate("a.example") == 1          # never below min_rate
+    assert limiter.rate("b.example") == 4          # limits are per host
+
+    for _ in range(20):
+        limiter.success("a.example")
+    assert limiter.rate("a.example") == 5          # never above max_rate
+
+
+def test_extract_links_resolves_and_drops_fragments():
+    html = '<a href="b/c.shtml#x">1</a><a href="mailto:x@y">2</a><a href="/d.html">3</a><a href="b/c.shtml">4</a>'
+    assert extract_links(html, "https://site.example/a/index.html") == [
+        "https://site.example/a/b/c.shtml",
+        "https://site.example/d.html",
+    ]
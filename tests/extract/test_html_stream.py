@@ -0,0 +1,50 @@
+"""
+Tests the single-pass html.parser extractor against the BeautifulSoup backend
+
+Both backends of extract_text_from_html and parse_book_html must return
+exactly the same paragraphs.
+"""
+
+import pytest
+
+from extract.extract_english import extract_text_from_html
+from extract.extract_latin import parse_book_html
+from extract.html_stream import iter_paragraphs
+
+TRICKY_HTML = """
+<html>
+  <head><title>Ignored</title><style>p { color: red; }</style></head>
+  <body>
+    <h1>Book&nbsp;I</h1>
+    <p>First <i>italic</i>words<br>after a break.</p>
+    <p>Nested <p>inner</p> tail</p>
+    <p>&amp; entity <!-- comment --> split<script>var x = 1;</script></p>
+    <h2>CHAPTER II</h2>
+    <p>*** END OF THE PROJECT GUTENBERG EBOOK ***</p>
+    <p>   </p>
+    <h3>Unclosed heading
+    <p>THE LATIN LIBRARY</p>
+    <p>Last paragraph</p>
+  </body>
+</html>
+"""
+
+
+@pytest.mark.parametrize("html", [
+    TRICKY_HTML,
+    "<html><body><p>Only one</p></body></html>",
+    "<html><body><p>Unclosed<p>paragraphs</body></html>",
+])
+def test_backends_return_identical_paragraphs(html):
+    assert extract_text_from_html(html, backend="stream") == extract_text_from_html(html, backend="bs4")
+    assert parse_book_html(html, backend="stream") == parse_book_html(html, backend="bs4")
+
+
+def test_chunked_input_matches_whole_document():
+    chunks = [TRICKY_HTML[i:i + 7] for i in range(0, len(TRICKY_HTML), 7)]
+    assert list(iter_paragraphs(chunks)) == list(iter_paragraphs(TRICKY_HTML))
+
+
+def test_stream_backend_requires_body():
+    with pytest.raises(Exception, match="Body tag not found"):
+        extract_text_from_html("<p>No body here</p>", backend="stream")
@@ -0,0 +1,70 @@
+"""
+Tests the on-disk HTTP cache used by fetch_html
+
+A fake getter stands in for requests, recording the headers of every call.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from extract.http_cache import HttpCache
+
+
+class FakeGetter:
+    def __init__(self, status_code=200, text="<html>v1</html>", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        self.calls = []
+
+    def __call__(self, headers):
+        self.calls.append(headers)
+        return SimpleNamespace(status_code=self.status_code, text=self.text, headers=self.headers)
+
+
+def test_fresh_entry_is_served_without_network(tmp_path):
+    cache = HttpCache(tmp_path, ttl_seconds=3600, max_bytes=10_000)
+    getter = FakeGetter()
+
+    assert cache.fetch("https://example.com/a", getter) == "<html>v1</html>"
+    assert cache.fetch("https://example.com/a", getter) == "<html>v1</html>"
+    assert len(getter.calls) == 1
+
+
+def test_stale_entry_sends_conditional_request_and_serves_304_from_disk(tmp_path):
+    cache = HttpCache(tmp_path, ttl_seconds=0, max_bytes=10_000)
+    cache.fetch("https://example.com/a", FakeGetter())
+
+    not_modified = FakeGetter(status_code=304, text="")
+    assert cache.fetch("https://example.com/a", not_modified) == "<html>v1</html>"
+    assert not_modified.calls == [{
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }]
+
+
+def test_offline_mode_never_calls_the_network(tmp_path):
+    HttpCache(tmp_path, ttl_seconds=0, max_bytes=10_000).fetch("https://example.com/a", FakeGetter())
+    offline = HttpCache(tmp_path, ttl_seconds=0, max_bytes=10_000, offline=True)
+    getter = FakeGetter()
+
+    assert offline.fetch("https://example.com/a", getter) == "<html>v1</html>"
+    with pytest.raises(Exception, match="Offline mode"):
+        offline.fetch("https://example.com/missing", getter)
+    assert getter.calls == []
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path, ttl_seconds=3600, max_bytes=25)
+    cache.fetch("https://example.com/old", FakeGetter(text="x" * 10))
+    old_body = next(tmp_path.glob("*.body"))
+    os.utime(old_body, (time.time() - 100, time.time() - 100))
+
+    cache.fetch("https://example.com/new1", FakeGetter(text="y" * 10))
+    cache.fetch("https://example.com/new2", FakeGetter(text="z" * 10))
+
+    assert not old_body.exists()
+    assert len(list(tmp_path.glob("*.body"))) == 2
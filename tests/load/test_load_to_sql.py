@@ -0,0 +1,77 @@
+"""
+Tests the bulk SQL load stage against SQLite
+"""
+
+import pytest
+
+from load.load_to_sql import SQLiteBackend, load_fact_table
+from transform.enrich_kempis import read_fact_table
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(tmp_path / "imitation.sqlite")
+    yield backend
+    backend.close()
+
+
+def test_load_is_idempotent(backend):
+    df = read_fact_table()
+
+    first = load_fact_table(df, backend, batch_size=100)
+    second = load_fact_table(df, backend, batch_size=100)
+
+    assert first["rows"] == second["rows"] == len(df)
+    count, max_id, words = backend.connection.execute(
+        "SELECT COUNT(*), MAX(id), SUM(english_word_count) FROM imitation"
+    ).fetchone()
+    assert (count, max_id) == (len(df), len(df))
+    assert words == sum(len(text.split()) for text in df["english_text"])
+
+
+def test_failed_load_keeps_previous_rows(backend):
+    df = read_fact_table()
+    load_fact_table(df, backend)
+
+    broken = df.copy()
+    broken.loc[1, "id"] = broken.loc[0, "id"]  # duplicate primary key
+    with pytest.raises(Exception):
+        load_fact_table(broken, backend)
+
+    assert backend.connection.execute("SELECT COUNT(*) FROM imitation").fetchone()[0] == len(df)
+
+
+@pytest.mark.parametrize("query, index", [
+    ("SELECT book, COUNT(*) FROM imitation GROUP BY book ORDER BY book", "idx_imitation_book"),
+    (
+        "SELECT id FROM imitation ORDER BY ABS(english_word_count - latin_word_count) DESC LIMIT 10",
+        "idx_imitation_word_count_diff",
+    ),
+    (
+        "SELECT id FROM imitation WHERE book_number = 2 ORDER BY chapter_number, id",
+        "idx_imitation_book_chapter",
+    ),
+])
+def test_sample_queries_use_indexes(backend, query, index):
+    load_fact_table(read_fact_table(), backend)
+
+    plan = " ".join(row[-1] for row in backend.connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+    assert index in plan
+
+
+def test_summary_tables_match_the_paragraph_table(backend):
+    report = load_fact_table(read_fact_table(), backend)
+    assert report["summary_tables"] == {
+        "imitation_book_stats": 4, "imitation_chapter_stats": 118, "imitation_chapters": 118,
+    }
+
+    db = backend.connection
+    by_chapter = db.execute(
+        "SELECT book_id, chapter_number, english_words - latin_words FROM imitation_chapter_stats"
+    ).fetchall()
+    from_paragraphs = db.execute(
+        "SELECT book_number, chapter_number, SUM(english_word_count - latin_word_count) "
+        "FROM imitation GROUP BY book_number, chapter_number"
+    ).fetchall()
+    assert sorted(by_chapter) == sorted(from_paragraphs)
+    assert db.execute("SELECT MAX(chapter_number) FROM imitation WHERE book_number = 3").fetchone()[0] == 59
@@ -0,0 +1,70 @@
+"""
+Tests the content-addressed artifact store
+
+Identical content is stored once and leaves the ref untouched; paragraphs are
+streamed the same way from compressed objects and from plain (memory-mapped)
+files, whatever the chunk size.
+"""
+
+import gzip
+import os
+
+import pytest
+
+from artifacts import ArtifactStore, find_artifacts, ref_path, split_paragraphs
+
+LATIN = ["Liber primus.", "Qui sequitur me non ambulat in tenebris.", "Hæc sunt verba Christi."]
+ENGLISH = ["THE FIRST BOOK", "He that followeth me\r\nshall not walk in darkness.", "These are the words."]
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    first = store.write_paragraphs(tmp_path / "run1" / "raw_latin.txt", LATIN)
+    ref = ref_path(tmp_path / "run1" / "raw_latin.txt")
+    os.utime(ref, (1, 1))
+
+    again = store.write_paragraphs(tmp_path / "run1" / "raw_latin.txt", LATIN)
+    other = store.write_paragraphs(tmp_path / "run2" / "raw_latin.txt", LATIN)
+
+    objects = [p for p in (tmp_path / "artifacts").rglob("*") if p.is_file()]
+    assert first == again == other
+    assert objects == [tmp_path / "artifacts" / "objects" / first.digest[:2] / f"{first.digest}.gz"]
+    assert ref.stat().st_mtime == 1                      # unchanged content: ref not rewritten
+    assert gzip.decompress(objects[0].read_bytes()).decode("utf-8") == "".join(p + "\n\n" for p in LATIN)
+    assert (first.paragraphs, first.separator) == (3, "\n\n")
+    assert objects[0].stat().st_mode == ref.stat().st_mode   # readable by whoever can read the ref
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 1 << 20])
+def test_stored_and_plain_files_stream_the_same_paragraphs(tmp_path, chunk_bytes):
+    store = ArtifactStore(tmp_path / "artifacts")
+    stored_latin, stored_english = tmp_path / "stored" / "raw_latin.txt", tmp_path / "stored" / "raw_english.txt"
+    store.write_paragraphs(stored_latin, LATIN, "\n\n")
+    store.write_paragraphs(stored_english, ENGLISH, "\n")
+
+    plain_latin, plain_english = tmp_path / "plain" / "raw_latin.txt", tmp_path / "plain" / "raw_english.txt"
+    plain_latin.parent.mkdir()
+    plain_latin.write_bytes(store.read_text(stored_latin).encode("utf-8"))
+    plain_english.write_bytes(store.read_text(stored_english).encode("utf-8"))
+
+    for stored, plain, expected in ((stored_latin, plain_latin, LATIN), (stored_english, plain_english, ENGLISH)):
+        assert list(store.iter_paragraphs(stored, chunk_bytes)) == expected
+        assert list(store.iter_paragraphs(plain, chunk_bytes)) == expected
+        assert store.separator(stored) == store.separator(plain)
+
+    assert find_artifacts(tmp_path / "stored", "raw_*.txt") == [stored_english, stored_latin]
+
+
+def test_newer_plain_file_wins_and_missing_files_raise(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    path = tmp_path / "raw_latin.txt"
+    store.write_paragraphs(path, LATIN)
+    assert list(store.iter_paragraphs(path)) == LATIN
+
+    path.write_text("Edited by hand.\n\n", encoding="utf-8")
+    os.utime(ref_path(path), (1, 1))
+    assert list(store.iter_paragraphs(path)) == ["Edited by hand."]
+
+    with pytest.raises(FileNotFoundError):
+        list(store.iter_paragraphs(tmp_path / "missing.txt"))
+    assert list(split_paragraphs([b"a\n", b"\nb\r", b"\nc\n\n"], "\n\n")) == ["a", "b\r\nc"]
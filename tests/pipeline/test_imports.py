@@ -0,0 +1,38 @@
+"""
+Tests that the pipeline entry point imports nothing heavy and has no import-time side effects
+
+Each check runs in a fresh interpreter, since this test process has already
+imported pandas and requests.
+"""
+
+import os
+import subprocess
+import sys
+
+from config import PROJECT_ROOT
+
+
+def run_python(code, **env):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT), **env},
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def test_run_pipeline_import_is_light():
+    loaded = run_python(
+        "import sys, src.run_pipeline, src.transform.incremental\n"
+        "print(' '.join(m for m in ('pandas', 'numpy', 'pyarrow', 'requests', 'bs4') if m in sys.modules))"
+    )
+    assert loaded.strip() == ""
+
+
+def test_imports_create_no_folders_and_configure_no_logging(tmp_path):
+    handlers = run_python(
+        "import logging, src.config, src.run_pipeline, src.extract.extract_english, src.extract.extract_latin\n"
+        "print(len(logging.getLogger().handlers))",
+        PROJECT_ROOT=str(tmp_path),
+    )
+    assert handlers.strip() == "0"
+    assert list(tmp_path.iterdir()) == []
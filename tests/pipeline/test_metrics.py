@@ -0,0 +1,85 @@
+"""
+Tests the run metrics recorded by run_pipeline and the extract fetches
+"""
+
+import json
+import time
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+from src import metrics      # the instance run_pipeline records into
+from extract.extract_english import fetch_html
+from run_pipeline import Stage, run_stages
+
+
+def fake_response(body: bytes):
+    response = MagicMock(status_code=200, content=body, text=body.decode("utf-8"), headers={})
+    response.raise_for_status.return_value = None
+    return response
+
+
+@patch("extract.extract_english.requests.get")
+def test_fetches_are_attributed_to_their_stage(mock_get, tmp_path):
+    mock_get.return_value = fake_response(b"<html>" + b"x" * 100 + b"</html>")
+
+    def download():
+        (tmp_path / "page.html").write_text(fetch_html("https://example.org/page"), encoding="utf-8")
+        return 1
+
+    stages = [
+        Stage("download", download, outputs=(tmp_path / "page.html",)),
+        Stage("count", lambda: 42, ("download",), outputs=(tmp_path / "page.html",)),
+    ]
+    run_stages(stages, force=True, trace_memory=True)
+    report = metrics.collect()
+
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    assert stages["download"]["fetches"] == 1
+    assert stages["download"]["bytes_downloaded"] == 113
+    assert stages["download"]["rows"] == 1
+    assert stages["count"]["rows"] == 42 and stages["count"]["fetches"] == 0
+    assert all(stage["traced_peak_mb"] >= 0 for stage in stages.values())
+    assert not tracemalloc.is_tracing()                  # stopped again once the stages are done
+
+    [fetch] = report["fetches"]
+    assert fetch["url"] == "https://example.org/page" and fetch["network"] and fetch["status"] == "ok"
+    assert report["totals"]["bytes_downloaded"] == 113
+
+
+def test_failed_stage_is_recorded_and_profiles_are_written(tmp_path):
+    def broken():
+        raise ValueError("boom")
+
+    stages = [
+        Stage("fine", lambda: (tmp_path / "fine").write_text("ok"), outputs=(tmp_path / "fine",)),
+        Stage("broken", broken, outputs=(tmp_path / "never",)),
+    ]
+    run_stages(stages, force=True, profile_dir=tmp_path / "profiles")
+    path = metrics.write_metrics(metrics.collect(run_id="test"), tmp_path / "run.json")
+    report = json.loads(path.read_text(encoding="utf-8"))
+
+    statuses = {stage["stage"]: stage["status"] for stage in report["stages"]}
+    assert statuses == {"fine": "ok", "broken": "failed"}
+    assert report["run"]["run_id"] == "test"
+    assert (tmp_path / "profiles" / "fine.prof").exists()
+    assert "cumulative" in (tmp_path / "profiles" / "broken.txt").read_text(encoding="utf-8")
+
+
+def test_profiled_stages_never_run_concurrently(tmp_path):
+    # Only one profiler may be active per process (Python 3.12+ raises otherwise)
+    spans = {}
+
+    def stage(name):
+        def run():
+            start = time.perf_counter()
+            time.sleep(0.2)
+            spans[name] = (start, time.perf_counter())
+            (tmp_path / name).write_text("ok")
+        return run
+
+    stages = [Stage(name, stage(name), outputs=(tmp_path / name,)) for name in ("a", "b")]
+    summary = run_stages(stages, force=True, max_workers=4, profile_dir=tmp_path / "profiles")
+
+    assert [result.status for result in summary["stages"].values()] == ["ok", "ok"]
+    (first_start, first_end), (second_start, second_end) = sorted(spans.values())
+    assert second_start >= first_end
@@ -0,0 +1,82 @@
+"""
+Tests the source registry and the multi-work corpus runner
+
+One work points at a closed local port (its extraction fails), the other only
+has aligned files, so it goes straight to cleaning.
+"""
+
+import json
+
+import pytest
+
+from registry import load_manifest
+from run_corpus import main, run_corpus
+
+ALIGNED_ROWS = (
+    "Liber Primus\tTHE FIRST BOOK\n"
+    "Cap. I.  De imitatione Christi.\tCHAPTER I Of the imitation of Christ\n"
+    "1.Qui sequitur me non ambulat in tenebris.\t1. He that followeth me shall not walk in darkness.\n"
+)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    aligned_dir = tmp_path / "aligned"
+    aligned_dir.mkdir()
+    (aligned_dir / "book1_aligned.tsv").write_text(ALIGNED_ROWS, encoding="utf-8")
+
+    path = tmp_path / "works.json"
+    path.write_text(json.dumps({"works": [
+        {
+            "id": "unreachable",
+            "english": {"url": "http://127.0.0.1:9/missing.html"},
+            "output_dir": str(tmp_path / "out" / "unreachable"),
+        },
+        {
+            "id": "aligned_only",
+            "title": "Aligned only",
+            "aligned_dir": str(aligned_dir),
+            "output_dir": str(tmp_path / "out" / "aligned_only"),
+        },
+    ]}), encoding="utf-8")
+    return path
+
+
+def test_load_manifest_parses_sources_and_defaults(manifest):
+    unreachable, aligned_only = load_manifest(manifest)
+
+    assert unreachable.title == "unreachable"
+    assert unreachable.english.tags == ("p", "h1", "h2", "h3")
+    assert unreachable.latin is None
+    assert aligned_only.cleaned_file.name == "cleaned.tsv"
+
+
+def test_load_manifest_rejects_duplicate_ids(tmp_path):
+    path = tmp_path / "works.json"
+    path.write_text(json.dumps({"works": [{"id": "a"}, {"id": "a"}]}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_manifest(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_corpus_isolates_failures(manifest, workers):
+    works = load_manifest(manifest)
+    summary = run_corpus(works, max_workers=workers)
+
+    assert summary["works"] == 2
+    assert summary["failed"] == 1
+    assert summary["works_per_minute"] > 0
+
+    unreachable, aligned_only = summary["results"]
+    assert unreachable["status"] == "failed"
+    assert aligned_only["status"] == "ok"
+    assert aligned_only["cleaned_rows"] == 3
+    assert works[1].cleaned_file.exists()
+
+
+def test_only_with_unknown_work_id_fails(manifest, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--manifest", str(manifest), "--only", "aligned_only", "alignd_only"])
+    assert exit_info.value.code == 2
+    assert "alignd_only" in capsys.readouterr().err
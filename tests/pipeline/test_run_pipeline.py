@@ -0,0 +1,137 @@
+"""
+Tests the stage graph runner of run_pipeline
+"""
+
+import os
+import shutil
+import time
+
+import pytest
+
+import run_pipeline
+import src.extract.extract_latin as extract_latin     # the module the extract_latin stage runs
+from config import INPUT_DIR
+from src.extract.checkpoints import IncompleteExtractionError
+from run_pipeline import STAGES, Stage, _clean, _extract_latin, run_stages, with_upstream
+
+
+def writer(path, delay=0.0, calls=None):
+    def run():
+        time.sleep(delay)
+        if calls is not None:
+            calls.append(path.name)
+        path.write_text("done", encoding="utf-8")
+    return run
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    stages = [
+        Stage("a", writer(tmp_path / "a", 0.3), outputs=(tmp_path / "a",)),
+        Stage("b", writer(tmp_path / "b", 0.3), outputs=(tmp_path / "b",)),
+        Stage("c", writer(tmp_path / "c", 0.3), ("a",), inputs=(tmp_path / "a",), outputs=(tmp_path / "c",)),
+    ]
+    summary = run_stages(stages)
+
+    assert [r.status for r in summary["stages"].values()] == ["ok", "ok", "ok"]
+    assert summary["sum_seconds"] >= 0.9
+    assert summary["wall_seconds"] < 0.8          # a and b overlap: a → c is the longest path
+    assert summary["critical_path_seconds"] == pytest.approx(0.6, abs=0.15)
+
+
+def test_up_to_date_stages_are_skipped(tmp_path):
+    source, output, calls = tmp_path / "source.txt", tmp_path / "output.txt", []
+    source.write_text("v1", encoding="utf-8")
+    stages = [Stage("build", writer(output, calls=calls), inputs=(source,), outputs=(output,))]
+
+    run_stages(stages)
+    assert run_stages(stages)["stages"]["build"].status == "skipped"
+
+    os.utime(source, (time.time() + 10, time.time() + 10))   # input newer than output
+    assert run_stages(stages)["stages"]["build"].status == "ok"
+    assert run_stages(stages, force=True)["stages"]["build"].status == "ok"
+    assert len(calls) == 3
+
+
+def test_touched_but_unchanged_aligned_files_do_not_rerun_downstream(tmp_path, monkeypatch):
+    aligned, output, chapters = tmp_path / "aligned", tmp_path / "cleaned.tsv", tmp_path / "chapters.tsv"
+    shutil.copytree(INPUT_DIR, aligned)
+    monkeypatch.setattr(run_pipeline, "INPUT_DIR", aligned)
+    monkeypatch.setattr(run_pipeline, "OUTPUT_PATH", output)
+    monkeypatch.setattr(run_pipeline, "CHAPTERS_PATH", chapters)
+    monkeypatch.setattr(run_pipeline, "TRANSFORM_MANIFEST_PATH", tmp_path / "manifest.json")
+    calls = []
+    stages = [
+        Stage("clean", _clean, inputs=(aligned,), outputs=(output, chapters)),
+        Stage("load", writer(tmp_path / "loaded", calls=calls), ("clean",), inputs=(output,),
+              outputs=(tmp_path / "loaded",)),
+    ]
+    run_stages(stages)
+
+    later = time.time() + 10
+    os.utime(aligned / "book1_aligned.tsv", (later, later))    # a checkout or copy: same content, newer mtime
+    for _ in range(2):
+        statuses = {name: result.status for name, result in run_stages(stages)["stages"].items()}
+        assert statuses == {"clean": "skipped", "load": "skipped"}
+    assert calls == ["loaded"]
+
+
+def test_target_runs_with_upstream_only(tmp_path):
+    calls = []
+    stages = [
+        Stage("a", writer(tmp_path / "a", calls=calls), outputs=(tmp_path / "a",)),
+        Stage("b", writer(tmp_path / "b", calls=calls), outputs=(tmp_path / "b",)),
+        Stage("c", writer(tmp_path / "c", calls=calls), ("a",), inputs=(tmp_path / "a",), outputs=(tmp_path / "c",)),
+    ]
+    summary = run_stages(stages, targets=["c"])
+
+    assert list(summary["stages"]) == ["a", "c"]
+    assert sorted(calls) == ["a", "c"]
+
+
+def test_failure_blocks_only_downstream(tmp_path):
+    def broken():
+        raise RuntimeError("no network")
+
+    stages = [
+        Stage("a", broken, outputs=(tmp_path / "a",)),
+        Stage("b", writer(tmp_path / "b"), outputs=(tmp_path / "b",)),
+        Stage("c", writer(tmp_path / "c"), ("a",), outputs=(tmp_path / "c",)),
+    ]
+    summary = run_stages(stages)
+
+    statuses = {name: result.status for name, result in summary["stages"].items()}
+    assert statuses == {"a": "failed", "b": "ok", "c": "blocked"}
+    assert summary["failed"] == ["a", "c"]
+
+
+def test_failed_extraction_blocks_template_despite_previous_output(tmp_path, monkeypatch):
+    def incomplete(*args, **kwargs):
+        raise IncompleteExtractionError(["https://example.org/kempis1.html"])
+
+    raw, template = tmp_path / "raw_latin.txt", tmp_path / "template.csv"
+    raw.write_text("Liber primus.\n\n", encoding="utf-8")           # left by an earlier run
+    monkeypatch.setattr(extract_latin, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(extract_latin, "fetch_html", incomplete)
+    stages = [
+        Stage("extract_latin", _extract_latin, outputs=(raw,)),
+        Stage("template", writer(template), ("extract_latin",), inputs=(raw,), outputs=(template,)),
+    ]
+    summary = run_stages(stages, force=True)            # a re-extraction, e.g. --force
+
+    statuses = {name: result.status for name, result in summary["stages"].items()}
+    assert statuses == {"extract_latin": "failed", "template": "blocked"}
+    assert "IncompleteExtractionError" in summary["stages"]["extract_latin"].error
+    assert not template.exists()
+
+
+def test_invalid_graphs_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="listed before"):
+        run_stages([Stage("a", print, ("b",)), Stage("b", print, ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        run_stages([Stage("a", print, ("missing",))])
+
+
+def test_pipeline_graph_upstream_of_load():
+    graph = {stage.name: stage for stage in STAGES}
+    assert with_upstream(graph, ["load"]) == ["validate", "clean", "load"]
+    assert with_upstream(graph, ["template"]) == ["extract_english", "extract_latin", "dedupe", "template"]
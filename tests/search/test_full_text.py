@@ -0,0 +1,65 @@
+"""
+Tests the Latin-aware full-text index
+"""
+
+import pandas as pd
+import pytest
+
+from search.full_text import FullTextIndex, build_index, decode_varints, encode_varints, normalize_latin
+from transform.enrich_kempis import read_fact_table
+
+
+@pytest.fixture
+def small_index(tmp_path):
+    df = pd.DataFrame({
+        "id": [1, 2, 3],
+        "book_id": [1, 1, 2],
+        "chapter_id": ["I.1", "I.2", "II.1"],
+        "latin_text": [
+            "Qui sequitur me, non ambulat in tenebris, dicit Dominus.",
+            "Hæc sunt verba Christi, quibus admonemur. Regnum Dei intra vos est.",
+            "Jesum Christum imitari debemus; regnum cælorum, non regnum Dei mundi.",
+        ],
+        "english_text": ["He that followeth me", "These are the words of Christ", "We ought to imitate Jesus Christ"],
+    })
+    build_index(df, tmp_path / "index.idx")
+    return FullTextIndex(tmp_path / "index.idx")
+
+
+def test_normalize_latin_orthography():
+    assert normalize_latin("Hæc Cœli JESUM vivit") == "haec coeli iesum uiuit"
+    assert normalize_latin("ǽternam") == "aeternam"
+
+
+def test_varints_round_trip():
+    values = [0, 1, 127, 128, 300, 2 ** 31]
+    out = bytearray()
+    encode_varints(values, out)
+    assert decode_varints(bytes(out)) == values
+
+
+def test_spelling_variants_match(small_index):
+    assert [hit.id for hit in small_index.search("haec uerba")] == [2]
+    assert [hit.id for hit in small_index.search("iesum")] == [3]
+    assert [hit.id for hit in small_index.search("caelorum")] == [3]
+
+
+def test_phrase_prefix_and_ranking(small_index):
+    assert {hit.id for hit in small_index.search('"regnum dei"')} == {2, 3}
+    assert small_index.search('"dei regnum"') == []
+
+    hits = small_index.search("christ*")
+    assert [hit.id for hit in hits] == [3, 2]  # shorter paragraph ranks first
+    assert hits[0].english_text == "We ought to imitate Jesus Christ"
+
+    assert [hit.id for hit in small_index.search('"regnum dei" christ* imitari')] == [3]
+    assert [hit.id for hit in small_index.search("christ", field="english")] == [2, 3]
+
+
+def test_matches_substring_scan_on_fact_table(tmp_path):
+    df = read_fact_table()
+    build_index(df, tmp_path / "index.idx")
+    index = FullTextIndex(tmp_path / "index.idx")
+
+    expected = df.loc[df["latin_text"].str.contains(r"\bChristum\b", regex=True), "id"].tolist()
+    assert sorted(hit.id for hit in index.search("christum", limit=None)) == expected
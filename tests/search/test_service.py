@@ -0,0 +1,90 @@
+"""
+Tests the HTTP/JSON query service on a free local port
+"""
+
+import asyncio
+import json
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from search.full_text import FullTextIndex, build_index
+from search.service import CorpusStore, route, start_service
+
+FACT_TABLE = pd.DataFrame({
+    "id": [1, 2, 3, 4, 5],
+    "book_id": [1, 1, 1, 1, 2],
+    "chapter_id": ["I.1", "I.1", "I.2", "I.2", "II.1"],
+    "latin_text": ["De imitatione Christi.", "Qui sequitur me.", "De humili.", "Regnum Dei intra vos est.", "Christum."],
+    "english_text": ["Of the imitation of Christ", "He that followeth me", "Of humility", "The kingdom of God", "Christ"],
+})
+
+
+def store(tmp_path):
+    build_index(FACT_TABLE, tmp_path / "index.idx")
+    return CorpusStore(FACT_TABLE, FullTextIndex(tmp_path / "index.idx"))
+
+
+def body(response):
+    status, payload = response
+    return status, json.loads(payload)
+
+
+def test_routes(tmp_path):
+    corpus = store(tmp_path)
+
+    assert body(route(corpus, "/paragraphs/4")) == (200, {**FACT_TABLE.iloc[3].to_dict()})
+    assert body(route(corpus, "/paragraphs/9"))[0] == 404
+    assert body(route(corpus, "/paragraphs/x"))[0] == 400
+
+    assert [row["id"] for row in body(route(corpus, "/chapters/I.2"))[1]] == [3, 4]
+    assert [row["id"] for row in body(route(corpus, "/chapters?from=I.2&to=II.1"))[1]] == [3, 4, 5]
+    assert body(route(corpus, "/chapters?from=II.1&to=I.1"))[0] == 400
+    assert body(route(corpus, "/chapters/IX.1"))[0] == 404
+
+    status, found = body(route(corpus, "/search?q=christ*&limit=5"))
+    assert status == 200 and found["count"] == 2
+    assert [result["paragraph"]["id"] for result in found["results"]] == [5, 1]
+    assert body(route(corpus, "/search?q=kingdom&field=english"))[1]["results"][0]["paragraph"]["id"] == 4
+    assert body(route(corpus, "/search?q=deus&field=greek"))[0] == 400
+
+
+def test_http_keep_alive_and_cache(tmp_path):
+    corpus = store(tmp_path)
+
+    async def scenario():
+        server = await start_service(corpus, "127.0.0.1", 0, cache_size=16)
+        port = server.sockets[0].getsockname()[1]
+
+        def get(path):
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}") as response:
+                    return response.status, json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                return e.code, json.loads(e.read())
+
+        async with server:
+            first = await asyncio.to_thread(get, "/search?q=%22regnum%20dei%22")
+            again = await asyncio.to_thread(get, "/search?q=%22regnum%20dei%22")
+            missing = await asyncio.to_thread(get, "/nowhere")
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /paragraphs/1 HTTP/1.1\r\nHost: x\r\n\r\nGET /paragraphs/2 HTTP/1.1\r\nHost: x\r\n\r\n")
+            await writer.drain()
+            replies = []
+            for _ in range(2):                      # two responses on one connection
+                headers = (await reader.readuntil(b"\r\n\r\n")).decode()
+                length = int(headers.lower().split("content-length:")[1].split("\r\n")[0])
+                replies.append(json.loads(await reader.readexactly(length))["id"])
+            writer.close()
+
+            health = await asyncio.to_thread(get, "/health")
+        return first, again, missing, replies, health
+
+    first, again, missing, replies, health = asyncio.run(scenario())
+    assert first == again and first[0] == 200 and first[1]["results"][0]["paragraph"]["id"] == 4
+    assert missing[0] == 404
+    assert replies == [1, 2]
+    assert health[1]["paragraphs"] == 5 and health[1]["chapters"] == 3
+    assert health[1]["cache"]["hits"] == 1 and health[1]["cache"]["misses"] == 4
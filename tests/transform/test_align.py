@@ -0,0 +1,103 @@
+"""
+Tests the automatic Latin–English aligner
+"""
+
+import numpy as np
+import pytest
+
+from artifacts import read_text
+from config import ENGLISH_RAW_FILE, INPUT_DIR, LATIN_RAW_FILE
+import transform.align as align
+from transform.align import (
+    align_lengths,
+    align_texts,
+    compare_with_reference,
+    read_aligned_file,
+    segment_english,
+    write_alignment,
+)
+
+ENGLISH = """Front matter that is not part of the work.
+THE FIRST BOOK ADMONITIONS PROFITABLE FOR THE SPIRITUAL LIFE
+CHAPTER I
+Of the imitation of Christ, and of contempt of the world and all its
+vanities
+He that followeth me shall not walk in darkness,(1) saith the Lord.
+These are the words of Christ.
+2. His teaching surpasseth all teaching of holy men.
+(1) John viii. 12. (2) Revelations
+ii. 17.
+CHAPTER II
+Of thinking humbly of oneself
+1. There is naturally in every man a desire to know.
+THE FULL PROJECT GUTENBERG LICENSE
+"""
+
+
+def test_segment_english_structure():
+    (book,) = segment_english(ENGLISH)
+
+    assert book.number == 1
+    assert [(unit.kind, unit.number) for unit in book.units] == [
+        ("book", 1), ("chapter", 1), ("paragraph", None), ("paragraph", 2), ("chapter", 2), ("paragraph", 1),
+    ]
+    assert book.units[1].text.endswith("all its vanities")   # wrapped title joined to the heading
+    assert book.units[2].text == "He that followeth me shall not walk in darkness, saith the Lord. These are the words of Christ."
+    assert "John" not in " ".join(unit.text for unit in book.units)   # footnotes dropped
+
+
+def test_align_lengths_recovers_runs():
+    rng = np.random.default_rng(0)
+    runs = rng.integers(1, 5, size=40)
+    english = rng.integers(40, 200, size=runs.sum())
+    bounds = np.concatenate([[0], np.cumsum(runs)])
+    latin = np.array([english[a:b].sum() / 1.2 for a, b in zip(bounds[:-1], bounds[1:])])
+
+    pairs, confidence = align_lengths(latin, english)
+
+    assert pairs == list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    assert confidence.min() > 0.9
+
+
+def test_align_lengths_handles_missing_english():
+    pairs, confidence = align_lengths(np.array([100, 100]), np.array([], dtype=float))
+    assert pairs == [(0, 0), (0, 0)]
+    assert confidence.tolist() == [0.0, 0.0]
+
+
+def test_summary_of_a_book_without_paragraphs_or_matched_rows(tmp_path, monkeypatch, capsys):
+    latin, english, reference = tmp_path / "latin.txt", tmp_path / "english.txt", tmp_path / "reference"
+    latin.write_text("Liber Primus.", encoding="utf-8")
+    english.write_text("THE FIRST BOOK", encoding="utf-8")
+    reference.mkdir()
+    (reference / "book1_aligned.tsv").write_text("1. Qui sequitur me.\t1. He that followeth me.\n", encoding="utf-8")
+    monkeypatch.setattr(align, "align_texts", lambda latin_text, english_text: {1: []})
+
+    align.main(["--latin", str(latin), "--english", str(english), "--output-dir", str(tmp_path / "out"),
+                "--reference-dir", str(reference)])
+    out = capsys.readouterr().out
+    assert "median confidence n/a (no paragraphs)" in out and "0/0 rows agree" in out and "(n/a)" in out
+
+
+@pytest.fixture(scope="module")
+def aligned_books():
+    return align_texts(read_text(LATIN_RAW_FILE), read_text(ENGLISH_RAW_FILE))
+
+
+@pytest.mark.parametrize("book_number", [1, 2, 3, 4])
+def test_agrees_with_hand_alignment(aligned_books, book_number):
+    reference = read_aligned_file(INPUT_DIR / f"book{book_number}_aligned.tsv")
+    report = compare_with_reference(aligned_books[book_number], reference)
+
+    assert report["matched_rows"] >= 0.95 * report["reference_rows"]
+    assert report["agreement"] >= 0.9
+
+
+def test_output_feeds_the_transform(aligned_books, tmp_path):
+    from transform.enrich_kempis import build_fact_table
+
+    write_alignment(aligned_books, tmp_path)
+    fact_table = build_fact_table(tmp_path)
+
+    assert len(fact_table) == sum(len(rows) for rows in aligned_books.values())
+    assert (tmp_path / "book1_alignment.tsv").read_text(encoding="utf-8").startswith("row\tkind\tconfidence")
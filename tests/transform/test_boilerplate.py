@@ -0,0 +1,74 @@
+"""
+Tests the MinHash/LSH boilerplate detection
+
+Three "books" share a licence block (worded slightly differently in each) and a
+running header; their own text and short chapter headings must survive.
+"""
+
+import random
+
+from artifacts import ArtifactStore
+from config import DEDUPED_ENGLISH_FILE, DEDUPED_LATIN_FILE, ENGLISH_RAW_FILE, LATIN_RAW_FILE
+from transform.boilerplate import dedupe_files, output_path_for, read_paragraphs, remove_boilerplate
+
+LICENCE = (
+    "This eBook is for the use of anyone anywhere in the United States and most other parts "
+    "of the world at no cost and with almost no restrictions whatsoever. You may copy it, give it "
+    "away or re-use it under the terms of the Project Gutenberg License included with this eBook "
+    "or online at www.gutenberg.org. If you are not located in the United States, you will have "
+    "to check the laws of the country where you are located before using {title}."
+)
+
+
+def book(title, seed, paragraphs=40):
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice('bcdfglmnprstv')}{rng.choice('aeiou')}{rng.choice('lmnrst')}{i}" for i in range(500)]
+    text = [
+        f"The Project Gutenberg eBook of {title}. This edition was produced by volunteers from page images "
+        "generously made available by the Internet Archive and proofread by the Distributed Proofreaders team."
+    ]
+    for n in range(paragraphs):
+        if n % 10 == 0:
+            text.append(f"CHAPTER {n // 10 + 1}")
+        text.append(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(20, 60))))
+    text.append(LICENCE.format(title=f"this eBook, {title}"))
+    return text
+
+
+def test_recurring_paragraphs_are_removed_and_reported():
+    documents = {name: book(name, seed) for seed, name in enumerate(["Liber A", "Liber B", "Liber C"])}
+    filtered, report = remove_boilerplate(documents)
+
+    for name, paragraphs in documents.items():
+        assert filtered[name] == paragraphs[1:-1]           # header and licence gone, everything else kept
+        assert report.per_source[name] == {"paragraphs": len(paragraphs), "removed": 2}
+    assert report.removed == 6
+    assert sorted(len(c["sources"]) for c in report.clusters) == [3, 3]
+    assert any(c["text"].startswith("This eBook is for the use") for c in report.clusters)
+
+
+def test_min_sources_and_single_document():
+    documents = {name: book(name, seed) for seed, name in enumerate(["Liber A", "Liber B"])}
+    assert remove_boilerplate(documents, min_sources=3)[1].removed == 0
+    assert remove_boilerplate({"only": book("only", 7)})[1].removed == 0
+
+
+def test_files_keep_their_layout(tmp_path):
+    latin = tmp_path / "raw_latin.txt"
+    english = tmp_path / "raw_english.txt"
+    shared = LICENCE.format(title="this eBook")
+    latin.write_text(f"Liber primus.\n\n{shared}\n\n", encoding="utf-8")
+    with english.open("w", encoding="utf-8", newline="") as f:
+        f.write(f"First line of a paragraph\r\nwrapped here.\n{shared}\nLast one.\n")
+
+    store = ArtifactStore(tmp_path / "artifacts")
+    report = dedupe_files([latin, english], tmp_path / "out", tmp_path / "out" / "report.json", store)
+
+    assert report.removed == 2
+    assert read_paragraphs(tmp_path / "out" / latin.name, store) == (["Liber primus."], "\n\n")
+    assert store.read_text(tmp_path / "out" / english.name) == "First line of a paragraph\r\nwrapped here.\nLast one.\n"
+
+
+def test_pipeline_reads_the_copies_dedupe_writes():
+    assert output_path_for(LATIN_RAW_FILE) == DEDUPED_LATIN_FILE
+    assert output_path_for(ENGLISH_RAW_FILE) == DEDUPED_ENGLISH_FILE
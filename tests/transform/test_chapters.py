@@ -0,0 +1,53 @@
+"""
+Tests the chapter segmentation of the aligned books
+"""
+
+import pandas as pd
+
+from transform.books import from_roman, to_roman
+from transform.chapters import chapter_table, find_headings, number_chapters
+from transform.enrich_kempis import read_fact_table
+
+LATIN = ["Liber Primus: De vita.", "Praefatio.", "Cap. I.  De pace.", "1. Pax.", "2. Bellum.",
+         "Chap. 2. De bello.", "1.Arma.", "Cap. 3. De silentio.", "1. Tace."]
+ENGLISH = ["THE FIRST BOOK: OF LIFE", "Preface.", "CHAPTER I Of peace", "1. Peace.", "2. War.",
+           "HAPTER II Of war", "1. Arms.", "", "1. Be silent."]
+
+
+def test_headings_and_numbers():
+    headings = find_headings(pd.Series(LATIN), pd.Series(ENGLISH))
+    assert headings.tolist() == ["book", "", "chapter", "", "", "chapter", "", "chapter", ""]
+
+    numbers = number_chapters(headings)
+    assert numbers["chapter_number"].tolist() == [0, 0, 1, 1, 1, 2, 2, 3, 3]
+    assert numbers["paragraph_in_chapter"].tolist() == [0, 1, 0, 1, 2, 0, 1, 0, 1]
+
+
+def test_chunks_continue_the_numbering():
+    headings = find_headings(pd.Series(LATIN), pd.Series(ENGLISH))
+    whole = number_chapters(headings)
+
+    parts, previous = [], (0, 0)
+    for start in range(0, len(headings), 2):
+        part = number_chapters(headings.iloc[start:start + 2], previous)
+        previous = tuple(part.iloc[-1])
+        parts.append(part)
+    pd.testing.assert_frame_equal(pd.concat(parts), whole)
+
+
+def test_chapter_table_of_the_real_fact_table():
+    fact_table = read_fact_table()
+    chapters = chapter_table(fact_table)
+
+    assert chapters.groupby("book_id")["chapter_number"].max().tolist() == [25, 12, 59, 18]
+    assert chapters["chapter_id"].is_unique and set(fact_table["chapter_id"]) == set(chapters["chapter_id"])
+    assert chapters["paragraphs"].sum() == (fact_table["paragraph_in_chapter"] > 0).sum()
+
+    chapter_13 = chapters.set_index("chapter_id").loc["III.13"]
+    assert chapter_13["chapter_title_latin"] == "De obedientia humili subditi, ad exemplum Jesu Christi."
+    assert chapters.set_index("chapter_id").loc["I.1", "chapter_title_english"].startswith("Of the imitation of Christ")
+
+
+def test_roman_numerals_round_trip():
+    assert [from_roman(to_roman(n)) for n in (1, 4, 9, 14, 40, 90, 400, 1999)] == [1, 4, 9, 14, 40, 90, 400, 1999]
+    assert from_roman("xiv") == 14
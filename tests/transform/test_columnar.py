@@ -0,0 +1,53 @@
+"""
+Tests the partitioned Parquet output of the fact table
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from transform.columnar import read_parquet, write_parquet
+from transform.enrich_kempis import read_fact_table
+
+
+def test_round_trip_matches_tsv(tmp_path):
+    df = read_fact_table()
+    write_parquet(df, tmp_path / "parquet")
+
+    result = read_parquet(tmp_path / "parquet")
+    pd.testing.assert_frame_equal(result.astype(df.dtypes.to_dict()), df)
+
+
+def test_column_and_partition_pruning(tmp_path):
+    df = read_fact_table()
+    files = write_parquet(df, tmp_path / "parquet")
+
+    assert sorted(f.parent.name for f in files) == ["book_id=1", "book_id=2", "book_id=3", "book_id=4"]
+    assert "book_id" not in pq.read_schema(files[0]).names  # stored in the path only
+
+    result = read_parquet(tmp_path / "parquet", columns=["id", "chapter_id", "english_text"], book_ids=[2])
+    expected = df.loc[df["book_id"] == 2, ["id", "chapter_id", "english_text"]].reset_index(drop=True)
+
+    assert list(result.columns) == ["id", "chapter_id", "english_text"]
+    pd.testing.assert_frame_equal(result.astype(expected.dtypes.to_dict()), expected)
+
+
+def test_rewrite_replaces_previous_dataset(tmp_path):
+    df = read_fact_table()
+    for book_ids in ([1, 2, 3, 4], [2], [1]):
+        write_parquet(df[df["book_id"].isin(book_ids)], tmp_path / "parquet")
+
+    assert read_parquet(tmp_path / "parquet", columns=["book_id"])["book_id"].unique().tolist() == [1]
+    # root is swapped as a symlink; only the current and the previous version are kept
+    assert (tmp_path / "parquet").is_symlink()
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith(".parquet-")]) == 2
+    # Version folders are made with a plain mkdir, so they get the umask mode
+    (tmp_path / "probe").mkdir()
+    assert (tmp_path / "parquet").stat().st_mode == (tmp_path / "probe").stat().st_mode
+
+
+def test_dataset_written_before_versions_is_replaced(tmp_path):
+    df = read_fact_table()
+    (tmp_path / "parquet" / "book_id=9").mkdir(parents=True)
+
+    write_parquet(df, tmp_path / "parquet")
+    assert sorted(read_parquet(tmp_path / "parquet", columns=["book_id"])["book_id"].unique()) == [1, 2, 3, 4]
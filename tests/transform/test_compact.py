@@ -0,0 +1,38 @@
+"""
+Tests the compact fact table representation
+"""
+
+import io
+
+import pandas as pd
+
+from transform.compact import compact_fact_table, memory_report
+from transform.enrich_kempis import read_fact_table
+
+
+def tsv(df: pd.DataFrame) -> str:
+    buffer = io.StringIO()
+    df.to_csv(buffer, sep="\t", index=False)
+    return buffer.getvalue()
+
+
+def test_compact_keeps_values_and_saves_memory():
+    df = read_fact_table().astype({"chapter_id": object, "latin_text": object, "english_text": object})
+    compact = compact_fact_table(df)
+
+    assert tsv(compact) == tsv(df)
+    assert compact["book_id"].dtype == "int8" and compact["id"].dtype == "int16"
+    assert isinstance(compact["chapter_id"].dtype, pd.CategoricalDtype)
+    assert compact["latin_text"].dtype == pd.StringDtype("pyarrow")
+
+    report = memory_report(df, compact)
+    assert (report["bytes_after"] < report["bytes_before"]).all()
+    assert report.loc["total", "bytes_after"] < 0.6 * report.loc["total", "bytes_before"]
+
+
+def test_integer_columns_grow_with_their_values():
+    df = pd.DataFrame({"id": [1, 70_000], "book": ["Book I", "Book I"], "latin_text": ["a", "b"]})
+    compact = compact_fact_table(df)
+
+    assert compact["id"].dtype == "int32"
+    assert compact["book"].cat.categories.tolist() == ["Book I"]
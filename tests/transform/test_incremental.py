@@ -0,0 +1,79 @@
+"""
+Tests the incremental fact table build
+
+After editing one book, only that book is reprocessed and the output is
+identical to a full rebuild, including the global id column.
+"""
+
+import shutil
+
+import pytest
+
+from config import INPUT_DIR
+from transform.enrich_kempis import build_fact_table
+from transform.incremental import run_incremental
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    aligned = tmp_path / "aligned"
+    aligned.mkdir()
+    for file in INPUT_DIR.glob("book*_aligned.tsv"):
+        shutil.copy(file, aligned / file.name)
+    return aligned, tmp_path / "cleaned.tsv", tmp_path / "manifest.json"
+
+
+def full_rebuild_text(aligned, tmp_path):
+    expected = tmp_path / "expected.tsv"
+    build_fact_table(aligned).to_csv(expected, sep="\t", index=False, encoding="utf-8")
+    return expected.read_text(encoding="utf-8")
+
+
+def test_first_run_is_full_then_unchanged(workdir):
+    aligned, output, manifest = workdir
+
+    assert run_incremental(aligned, output, manifest)["mode"] == "full"
+    mtime = output.stat().st_mtime_ns
+
+    report = run_incremental(aligned, output, manifest)
+    assert report["mode"] == "unchanged"
+    assert report["skipped"] == [1, 2, 3, 4]
+    assert output.stat().st_mtime_ns == mtime
+
+
+def test_one_line_edit_rebuilds_only_that_book(workdir, tmp_path):
+    aligned, output, manifest = workdir
+    run_incremental(aligned, output, manifest)
+
+    book3 = aligned / "book3_aligned.tsv"
+    lines = book3.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[5] = lines[5].replace("\t", "\tEDITED ", 1)
+    book3.write_text("".join(lines), encoding="utf-8")
+
+    report = run_incremental(aligned, output, manifest)
+    assert report["rebuilt"] == [3]
+    assert report["skipped"] == [1, 2, 4]
+    assert output.read_text(encoding="utf-8") == full_rebuild_text(aligned, tmp_path)
+
+
+def test_added_row_keeps_ids_continuous(workdir, tmp_path):
+    aligned, output, manifest = workdir
+    run_incremental(aligned, output, manifest)
+
+    book2 = aligned / "book2_aligned.tsv"
+    text = book2.read_text(encoding="utf-8").rstrip("\n")
+    book2.write_text(text + "\n7. Nova sententia.\t7. A new sentence.\n", encoding="utf-8")
+
+    report = run_incremental(aligned, output, manifest)
+    assert report["rebuilt"] == [2]
+    assert output.read_text(encoding="utf-8") == full_rebuild_text(aligned, tmp_path)
+
+
+def test_edited_output_forces_full_rebuild(workdir):
+    aligned, output, manifest = workdir
+    run_incremental(aligned, output, manifest)
+
+    with output.open("a", encoding="utf-8") as f:
+        f.write("tampered\n")
+
+    assert run_incremental(aligned, output, manifest)["mode"] == "full"
@@ -0,0 +1,76 @@
+"""
+Tests the run-together Latin token segmentation
+
+Glued words are split with the case of the source kept, cuts through a stem,
+after a compound prefix or before a compound suffix are refused, reviewed words
+are left whole, and an incremental build stays identical to a full rebuild when
+an edit to one book changes the corrections of another.
+"""
+
+import logging
+import shutil
+
+from config import INPUT_DIR
+from transform.enrich_kempis import build_fact_table
+from transform.incremental import run_incremental
+from transform.segment import Lexicon, Segmenter, corpus_segmenter, read_keep
+
+CORPUS = [
+    "Qui sequitur me non ambulat in tenebris, dicit Dominus.",
+    "Dicit enim: qui haberet absconditum manna inveniret.",
+    "Tenebris et dicit, manna et inveniret, haberet et absconditum.",
+    "Quacumque via, qua cumque.",
+    "Liber Primus: Admonitiones ad spiritualem vitam utiles.",
+]
+
+
+def test_glued_tokens_are_split_with_their_case(caplog):
+    segmenter = Segmenter(Lexicon.from_texts(CORPUS))
+    text = "In TenebrisDicit Dominus: haberetabsconditum mannainveniret."
+
+    with caplog.at_level(logging.INFO, logger="transform.segment"):
+        fixed = segmenter.fix(text, "Book 1 line 3")
+
+    assert fixed == "In Tenebris Dicit Dominus: haberet absconditum manna inveniret."
+    assert segmenter.fix("Liber PrimusAdmonitiones") == "Liber Primus Admonitiones"
+    assert len([r for r in caplog.records if r.message.startswith("Book 1 line 3: ")]) == 3
+    assert segmenter.split("haberetabsconditum") == ("haberet", "absconditum")
+
+
+def test_real_words_are_left_whole():
+    extra = ["Spiritu et alium, spiritualis et spiritualium.", "Servierunt et servi erunt."]
+    segmenter = Segmenter(Lexicon.from_texts(CORPUS + extra), keep=frozenset({"Servierunt"}))
+
+    assert segmenter.split("spiritualium") is None        # "spiritual" is the stem of spiritualis
+    assert segmenter.split("quacumque") is None           # -cumque compound
+    assert segmenter.split("servierunt") is None          # reviewed keep-list
+    assert segmenter.split("tenebris") is None            # too short to be a candidate
+    assert segmenter.corrections() == {}
+
+
+def test_corpus_corrections_reach_the_fact_table():
+    latin = " ".join(build_fact_table(INPUT_DIR)["latin_text"])
+    for glued in ("tenebrisdicit", "haberetabsconditum", "mannainveniret"):
+        assert glued not in latin.lower()
+    assert "tenebris dicit" in latin and "manna inveniret" in latin
+    corrections = corpus_segmenter().corrections()
+    for word in read_keep():
+        assert word not in corrections
+
+
+def test_incremental_rebuilds_everything_when_corrections_change(tmp_path):
+    aligned = tmp_path / "aligned"
+    shutil.copytree(INPUT_DIR, aligned)
+    output, manifest = tmp_path / "cleaned.tsv", tmp_path / "manifest.json"
+    run_incremental(aligned, output, manifest)
+
+    # A second "amantiverbumnon" in book 1 makes the book 3 one frequent enough to be kept
+    with (aligned / "book1_aligned.tsv").open("a", encoding="utf-8") as f:
+        f.write("\nAmantiverbumnon\tA loving word")
+    report = run_incremental(aligned, output, manifest)
+
+    expected = tmp_path / "expected.tsv"
+    build_fact_table(aligned).to_csv(expected, sep="\t", index=False, encoding="utf-8")
+    assert report["mode"] == "full"
+    assert output.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+    assert "amantiverbumnon" in output.read_text(encoding="utf-8")
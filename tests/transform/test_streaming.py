@@ -0,0 +1,59 @@
+"""
+Tests the chunked (streaming) fact table build
+
+Whatever the chunk size, the file written must be byte for byte the one the
+in-memory path writes, ids and paragraph numbers included.
+"""
+
+import shutil
+
+import pytest
+
+from config import INPUT_DIR
+from transform.enrich_kempis import build_fact_table
+from transform.incremental import run_incremental
+from transform.streaming import stream_fact_table
+
+
+@pytest.fixture(scope="module")
+def expected(tmp_path_factory):
+    path = tmp_path_factory.mktemp("in_memory") / "expected.tsv"
+    build_fact_table(INPUT_DIR).to_csv(path, sep="\t", index=False, encoding="utf-8")
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("chunk_rows", [13, 250, 100_000])
+def test_streamed_output_matches_in_memory(tmp_path, expected, chunk_rows):
+    output = tmp_path / "streamed.tsv"
+    sizes = stream_fact_table(INPUT_DIR, output, chunk_rows)
+
+    assert output.read_bytes() == expected
+    assert [n for n, _ in sizes] == [1, 2, 3, 4]
+    assert sum(size for _, size in sizes) == expected.count(b"\n") - 1
+    assert list(tmp_path.iterdir()) == [output]          # no temporary file left behind
+    probe = tmp_path / "probe"
+    probe.write_text("", encoding="utf-8")
+    assert output.stat().st_mode == probe.stat().st_mode    # as a plain write, not mkstemp's 0600
+
+
+def test_incremental_full_rebuild_can_stream(tmp_path, expected):
+    aligned = tmp_path / "aligned"
+    shutil.copytree(INPUT_DIR, aligned)
+    output, manifest = tmp_path / "cleaned.tsv", tmp_path / "manifest.json"
+
+    assert run_incremental(aligned, output, manifest, chunk_rows=50)["mode"] == "full"
+    assert output.read_bytes() == expected
+    assert run_incremental(aligned, output, manifest, chunk_rows=50)["mode"] == "unchanged"
+
+
+def test_failed_stream_keeps_previous_output(tmp_path):
+    aligned = tmp_path / "aligned"
+    shutil.copytree(INPUT_DIR, aligned)
+    (aligned / "book2_aligned.tsv").write_bytes(b"\xff\xfe not utf-8")
+    output = tmp_path / "cleaned.tsv"
+    output.write_text("previous", encoding="utf-8")
+
+    with pytest.raises(UnicodeDecodeError):
+        stream_fact_table(aligned, output, 10)
+    assert output.read_text(encoding="utf-8") == "previous"
+    assert set(tmp_path.iterdir()) == {aligned, output}
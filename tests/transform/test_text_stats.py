@@ -0,0 +1,56 @@
+"""
+Tests the vectorized text statistics and their aggregates
+"""
+
+import pandas as pd
+
+from transform.text_stats import book_stats, chapter_stats, paragraph_stats
+
+
+def fact_table():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6],
+        "book_id": [1, 1, 1, 1, 2, 2],
+        "chapter_number": [0, 1, 1, 2, 0, 0],
+        "latin_text": [
+            "Liber Primus: Admonitiones.",
+            "I. De imitatione Christi.",
+            "Qui sequitur me, sequitur Christum.",
+            "De humili scire sui ipsius.",
+            "Liber Secundus.",
+            "Regnum Dei intra vos est.",
+        ],
+        "english_text": [
+            "THE FIRST BOOK: ADMONITIONS",
+            "I Of the imitation of Christ",
+            "He that followeth me, followeth Christ.",
+            "II Of thinking humbly of oneself",
+            "THE SECOND BOOK",
+            "",
+        ],
+    })
+
+
+def test_paragraph_stats():
+    stats = paragraph_stats(fact_table())
+    row = stats.iloc[2]
+
+    assert (row["latin_word_count"], row["english_word_count"]) == (5, 6)
+    assert row["latin_char_count"] == len("Qui sequitur me, sequitur Christum.")
+    assert (row["latin_token_count"], row["latin_type_count"]) == (5, 4)      # "sequitur" twice
+    assert row["length_ratio"] == round(5 / 6, 4)
+    assert pd.isna(stats.iloc[5]["length_ratio"])                            # no English words
+    assert stats["english_token_count"].tolist()[5] == 0
+
+
+def test_aggregates_add_up():
+    df = fact_table()
+    stats = paragraph_stats(df)
+    books, chapters = book_stats(df, stats), chapter_stats(df, stats)
+
+    assert books["paragraphs"].tolist() == [4, 2]
+    assert books["latin_words"].sum() == chapters["latin_words"].sum() == stats["latin_word_count"].sum()
+    # Vocabulary is counted over the whole group: "sequitur" and "christi"/"christum" are not double counted
+    book_one = df[df["book_id"] == 1]["latin_text"].str.lower().str.findall(r"[^\W\d_]+").explode()
+    assert books.loc[0, "latin_vocabulary"] == book_one.nunique()
+    assert chapters[["book_id", "chapter_number"]].values.tolist() == [[1, 0], [1, 1], [1, 2], [2, 0]]
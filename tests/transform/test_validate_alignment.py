@@ -0,0 +1,79 @@
+"""
+Tests the alignment validation stage
+
+A small corpus with one planted problem per check; the real aligned files must
+pass once their known source issues are accepted.
+"""
+
+import json
+
+from transform.validate_alignment import check_alignment, read_aligned_books, validate_alignment
+
+LATIN = "Verba sancta et pia ad meditandum in corde humili semper legenda sunt"
+ENGLISH = "Holy and devout words to be read with a humble heart and always meditated"
+
+
+def write_book(directory, number, rows):
+    lines = ["\t".join(row) for row in rows]
+    (directory / f"book{number}_aligned.tsv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_planted_problems_are_flagged(tmp_path):
+    rows = [("Cap. I. De imitatione.", "CHAPTER I Of the imitation")]
+    rows += [(f"{n}. " + " ".join(LATIN.split()[:n + 2]), f"{n}. " + " ".join(ENGLISH.split()[:n + 2 + n % 3]))
+             for n in range(1, 12)]
+    rows += [
+        ("3. " + LATIN, "4. " + ENGLISH),                              # line 13: numbers disagree
+        ("Cap. 2. De humili.", "CHAPTER III Of humility"),             # line 14: chapters disagree
+        ("5. " + LATIN, ""),                                           # line 15: empty side
+        ("6. Fili.", "6. " + " ".join([ENGLISH] * 6)),                 # line 16: length ratio
+        ("Chap. 4. De pace.", "7. " + ENGLISH),                        # line 17: heading on one side
+    ]
+    write_book(tmp_path, 1, rows)
+
+    checks = check_alignment(read_aligned_books(tmp_path))
+    flagged = {code: checks.loc[checks[code], "line"].tolist() for code in
+               ("number_mismatch", "chapter_mismatch", "empty_side", "length_ratio_outlier", "chapter_one_side")}
+
+    assert flagged == {
+        "number_mismatch": [13],
+        "chapter_mismatch": [14],
+        "empty_side": [15],
+        "length_ratio_outlier": [16],
+        "chapter_one_side": [17],
+    }
+    assert checks.loc[checks["line"] == 14, ["latin_chapter", "english_chapter"]].values.tolist() == [[2, 3]]
+
+
+def test_lines_without_two_columns_are_reported(tmp_path):
+    rows = [("Cap. I. De imitatione.", "CHAPTER I Of the imitation"), ("1. " + LATIN, "1. " + ENGLISH)]
+    write_book(tmp_path, 1, rows + [("Cap. XXVI. only latin no tab",), ("2. " + LATIN, "2. " + ENGLISH, "stray")]
+               + [("3. " + LATIN, "3. " + ENGLISH)])
+    report_path = tmp_path / "report.json"
+
+    report = validate_alignment(tmp_path, report_path, accepted_path=None)
+    assert report["rows"] == 5 and report["errors"] == 2
+    assert [(issue["line"], issue["code"]) for issue in report["issues"]] == [(3, "column_count"), (4, "column_count")]
+    assert report["issues"][0]["latin"] == "Cap. XXVI. only latin no tab"
+    assert json.loads(report_path.read_text(encoding="utf-8"))["counts"]["column_count"] == 2
+
+
+def test_report_and_accepted_issues(tmp_path):
+    rows = [("Cap. I. De imitatione.", "CHAPTER I Of the imitation"), ("1. " + LATIN, "2. " + ENGLISH)]
+    write_book(tmp_path, 1, rows)
+    report_path = tmp_path / "report.json"
+
+    report = validate_alignment(tmp_path, report_path, accepted_path=None)
+    assert not report["ok"] and report["errors"] == 1
+    assert json.loads(report_path.read_text(encoding="utf-8"))["issues"][0]["code"] == "number_mismatch"
+
+    accepted = tmp_path / "accepted.json"
+    accepted.write_text(json.dumps([{"book_number": 1, "line": 2, "code": "number_mismatch", "reason": "x"}]))
+    report = validate_alignment(tmp_path, None, accepted_path=accepted)
+    assert report["ok"] and report["accepted"] == 1 and report["issues"][0]["accepted"]
+
+
+def test_real_aligned_files_pass():
+    report = validate_alignment(report_path=None)
+    assert report["ok"], [issue for issue in report["issues"] if issue["severity"] == "error" and not issue["accepted"]]
+    assert report["rows"] == 666